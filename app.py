@@ -1,6 +1,6 @@
 # app.py
 import streamlit as st
-from sidebar.menu import render_sidebar
+from sidebar.menu import render_sidebar, render_diagnostics
 from state_utils import get_nodes        # stellt sicher, dass State existiert
 
 st.set_page_config(page_title="Project Goals App", layout="wide")
@@ -10,6 +10,15 @@ if "ingested_texts" not in st.session_state:
 
 from project_assessment.gui import render_assessment
 
+@st.cache_resource
+def preload():
+    """Fragenkatalog und Regeln einmal pro Prozess laden – nicht pro Session."""
+    from project_assessment.helper.tree_builder import load_question_template
+    from project_assessment.helper.recommendations import load_ruleset
+    return load_question_template(), load_ruleset()
+
+preload()
+
 # ── Session-State sicherstellen (erzeugt leeres [] bei erstem Aufruf)
 get_nodes()
 
@@ -22,4 +31,6 @@ if mode == "Project Assessment":
     render_assessment()
 else:
     st.info("Unknown mode.")
+
+render_diagnostics()
     
\ No newline at end of file
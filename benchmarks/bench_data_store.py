@@ -0,0 +1,78 @@
+"""
+bench_data_store.py
+-------------------
+Speicherspitze und Durchsatz der Streaming-Pfade in ``data_store`` im
+Vergleich zu den früheren ``json.load``/``json.dump(indent=2)``-Funktionen.
+
+    python -m benchmarks.bench_data_store [Anzahl Blätter]
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+from benchmarks.common import print_table, wide_tree
+from project_assessment.helper.data_model import Node
+from project_assessment.helper import data_store
+
+
+def legacy_save_tree(nodes: List[Node], path: Path) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        json.dump([n.to_dict() for n in nodes], f, indent=2)
+
+
+def legacy_load_tree(path: Path) -> List[Node]:
+    with path.open("r", encoding="utf-8") as f:
+        return [Node.from_dict(n) for n in json.load(f)]
+
+
+def measure(fn: Callable[[], object]) -> tuple:
+    """(seconds, peak traced bytes); timed without tracemalloc, which slows everything down."""
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    leaves = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    nodes = wide_tree(leaves=leaves)
+    tmp = Path(tempfile.mkdtemp())
+    legacy_path, stream_path, nd_path = tmp / "legacy.json", tmp / "stream.json", tmp / "stream.ndjson"
+
+    rows = []
+
+    def row(label: str, fn: Callable[[], object], path: Path) -> None:
+        secs, peak = measure(fn)
+        mb = os.path.getsize(path) / 1e6
+        rows.append((label, f"{mb:.1f}", f"{secs:.2f}", f"{mb / secs:.1f}", f"{peak / 1e6:.1f}"))
+
+    row("save legacy (indent=2)", lambda: legacy_save_tree(nodes, legacy_path), legacy_path)
+    row("save streaming", lambda: data_store.save_tree(nodes, stream_path), stream_path)
+    row("save ndjson", lambda: data_store.save_tree_ndjson(nodes, nd_path), nd_path)
+    # Beim Laden zählt nur der Parser, nicht die entstehenden Nodes
+    row("load legacy", lambda: sum(1 for _ in legacy_load_tree(legacy_path)), legacy_path)
+    row("stream (iter_tree)", lambda: sum(1 for _ in data_store.iter_tree(stream_path)), stream_path)
+    row("stream ndjson", lambda: sum(1 for _ in data_store.iter_tree_ndjson(nd_path)), nd_path)
+    row("load_tree (list)", lambda: data_store.load_tree(stream_path), stream_path)
+
+    print(f"{len(nodes)} nodes")
+    print_table(rows, ("operation", "file MB", "seconds", "MB/s", "peak MB"))
+    for p in (legacy_path, stream_path, nd_path):
+        p.unlink()
+    tmp.rmdir()
+
+
+if __name__ == "__main__":
+    main()
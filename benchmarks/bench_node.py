@@ -0,0 +1,83 @@
+"""
+bench_node.py
+-------------
+Speicherbedarf und Konstruktionszeit der Knoten-Darstellungen:
+früherer ``@dataclass``-Node (mit ``__dict__``), geslotteter ``Node`` und
+spaltenorientierter ``NodeStore``.
+
+    python -m benchmarks.bench_node [Anzahl Knoten]
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+from uuid import uuid4
+
+from benchmarks.common import print_table
+from project_assessment.helper.data_model import STATUS_CHOICES, Node, NodeStore
+
+
+@dataclass
+class LegacyNode:
+    """Previous Node definition, kept here for comparison."""
+    id: str = field(default_factory=lambda: str(uuid4()))
+    name: str = ""
+    parent: Optional[str] = None
+    status: str = "yellow"
+    comment: str = ""
+
+    def __post_init__(self):
+        if self.status not in STATUS_CHOICES:
+            raise ValueError(f"Status must be one of {STATUS_CHOICES}, got {self.status}")
+
+
+def rows(count: int) -> List[dict]:
+    """Input rows as they come out of a JSON export (fresh strings per row)."""
+    ids = [str(uuid4()) for _ in range(count)]
+    return [
+        {"id": ids[i], "name": f"Question {i}", "parent": ids[i // 50] if i >= 50 else None,
+         "status": "".join(list(STATUS_CHOICES[i % 3])), "comment": ""}
+        for i in range(count)
+    ]
+
+
+def measure(build: Callable[[], object]) -> tuple:
+    """(seconds, retained bytes) for building the structure."""
+    gc.collect()
+    t0 = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - t0
+    del result
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, retained
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    data = rows(count)
+    cases = [
+        ("legacy dataclass", lambda: [LegacyNode(**d) for d in data]),
+        ("slotted Node", lambda: [Node(**d) for d in data]),
+        ("slotted Node.from_dict", lambda: [Node.from_dict(d) for d in data]),
+        ("NodeStore", lambda: NodeStore(data)),
+    ]
+    table = []
+    for label, build in cases:
+        secs, retained = measure(build)
+        table.append((label, f"{secs:.2f}", f"{retained / 1e6:.1f}", f"{retained / count:.0f}"))
+    print(f"{count} nodes (id/name strings of the input rows are shared and not counted)")
+    print_table(table, ("representation", "build s", "retained MB", "bytes/node"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+bench_rollup.py
+---------------
+Vergleicht den Single-Pass-Roll-up (``aggregate_status``) und den
+inkrementellen Modus (``update_status``) mit der früheren Fixpunkt-Schleife.
+
+    python -m benchmarks.bench_rollup
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+from benchmarks.common import best_of, deep_tree, print_table, wide_tree
+from project_assessment.helper.analysis import STATUS_RANK, aggregate_status, update_status
+from project_assessment.helper.data_model import GoalTree, Node
+
+
+def aggregate_status_fixpoint(nodes: List[Node]) -> None:
+    """Previous implementation: repeat full passes until nothing changes."""
+    lookup = {n.id: n for n in nodes}
+    changed = True
+    while changed:
+        changed = False
+        for n in nodes:
+            if n.parent:
+                parent = lookup[n.parent]
+                if STATUS_RANK[n.status] > STATUS_RANK[parent.status]:
+                    parent.status = n.status
+                    changed = True
+
+
+def run_case(label: str, nodes: List[Node]) -> list:
+    original = [n.status for n in nodes]
+
+    def reset():
+        for n, s in zip(nodes, original):
+            n.status = s
+
+    tree = GoalTree(nodes)
+    t_fix = best_of(lambda: aggregate_status_fixpoint(nodes), setup=reset)
+    fix_result = [n.status for n in nodes]
+    t_single = best_of(lambda: aggregate_status(tree), setup=reset)
+    assert [n.status for n in nodes] == fix_result, "roll-up results differ"
+
+    # Inkrementell: ein Blatt wird rot, nur die Vorfahrenkette wird angefasst
+    leaf = next(n for n in reversed(nodes) if not tree.has_children(n.id))
+    t_incr = best_of(lambda: update_status(tree, leaf.id, "red"),
+                     setup=lambda: (reset(), aggregate_status(tree), setattr(leaf, "status", "green")))
+    return [label, len(nodes), f"{t_fix * 1e3:.1f}", f"{t_single * 1e3:.1f}",
+            f"{t_fix / t_single:.1f}x", f"{t_incr * 1e6:.1f}"]
+
+
+def main() -> None:
+    rows = [
+        run_case("deep (depth 50)", deep_tree(depth=50, chains=200)),
+        run_case("wide (100k leaves)", wide_tree(leaves=100_000, fanout=100)),
+    ]
+    print_table(rows, ("tree", "nodes", "fixpoint ms", "single-pass ms", "speedup", "incremental µs"))
+
+
+if __name__ == "__main__":
+    main()
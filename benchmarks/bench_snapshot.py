@@ -0,0 +1,48 @@
+"""
+bench_snapshot.py
+-----------------
+Größe sowie Lade-/Speicherzeit des Binär-Snapshots im Vergleich zum
+JSON-Pfad von ``data_store``.
+
+    python -m benchmarks.bench_snapshot [Anzahl Blätter]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import best_of, print_table, wide_tree
+from project_assessment.helper import data_store
+
+
+def main() -> None:
+    leaves = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    nodes = wide_tree(leaves=leaves)
+    tmp = Path(tempfile.mkdtemp())
+    json_path, snap_path = tmp / "tree.json", tmp / "tree.pgsnap"
+
+    def open_only():
+        with data_store.open_snapshot(snap_path) as snap:
+            return snap.statuses[len(snap) - 1]
+
+    rows = []
+    for label, save, load, path in (
+        ("json", data_store.save_tree, data_store.load_tree, json_path),
+        ("snapshot", data_store.save_snapshot, data_store.load_snapshot, snap_path),
+    ):
+        t_save = best_of(lambda: save(nodes, path), repeat=2)
+        t_load = best_of(lambda: load(path), repeat=2)
+        assert [n.to_dict() for n in load(path)] == [n.to_dict() for n in nodes]
+        rows.append((label, f"{os.path.getsize(path) / 1e6:.1f}", f"{t_save:.2f}", f"{t_load:.2f}", "-"))
+    rows[-1] = rows[-1][:-1] + (f"{best_of(open_only) * 1e3:.2f} ms",)
+
+    print(f"{len(nodes)} nodes")
+    print_table(rows, ("format", "MB", "save s", "load s", "mmap open + 1 lookup"))
+    json_path.unlink(); snap_path.unlink(); tmp.rmdir()
+
+
+if __name__ == "__main__":
+    main()
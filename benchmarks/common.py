@@ -0,0 +1,62 @@
+"""
+common.py
+---------
+Kleine Hilfsfunktionen für die Benchmark-Skripte (Zeitmessung, Testbäume).
+
+Alle Skripte werden aus dem Repo-Wurzelverzeichnis gestartet, z. B.
+``python -m benchmarks.bench_rollup``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable, List
+
+from project_assessment.helper.data_model import Node, STATUS_CHOICES
+
+
+def best_of(fn: Callable[[], object], repeat: int = 3, setup: Callable[[], object] | None = None) -> float:
+    """Best wall-clock time of ``repeat`` runs in seconds (``setup`` is not timed)."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def deep_tree(depth: int = 50, chains: int = 200, seed: int = 0) -> List[Node]:
+    """``chains`` paths of length ``depth`` below one main goal, red leaf at the bottom."""
+    rnd = random.Random(seed)
+    root = Node(name="Goal", status="green")
+    nodes = [root]
+    for c in range(chains):
+        parent = root
+        for d in range(depth - 1):
+            n = Node(name=f"c{c}-d{d}", parent=parent.id, status="green")
+            nodes.append(n)
+            parent = n
+        nodes[-1].status = rnd.choice(STATUS_CHOICES)
+    return nodes
+
+
+def wide_tree(leaves: int = 100_000, fanout: int = 100, seed: int = 0) -> List[Node]:
+    """One main goal, ``leaves // fanout`` axes with ``fanout`` questions each."""
+    rnd = random.Random(seed)
+    root = Node(name="Goal", status="green")
+    nodes = [root]
+    for a in range(max(1, leaves // fanout)):
+        axis = Node(name=f"Axis {a}", parent=root.id, status="green")
+        nodes.append(axis)
+        for q in range(fanout):
+            nodes.append(Node(name=f"Question {a}.{q}", parent=axis.id, status=rnd.choice(STATUS_CHOICES)))
+    return nodes
+
+
+def print_table(rows: List[tuple], header: tuple) -> None:
+    widths = [max(len(str(r[i])) for r in [header, *rows]) for i in range(len(header))]
+    for r in [header, *rows]:
+        print("  ".join(str(c).ljust(w) for c, w in zip(r, widths)))
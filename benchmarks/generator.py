@@ -0,0 +1,132 @@
+"""
+generator.py
+------------
+Seeded generator for realistic synthetic goal trees and rule sets.
+
+Trees look like the ones ``build_tree`` produces: a number of main goals,
+each with axes and (nested) questions below, names drawn from a project
+vocabulary that includes the keywords of the generated rules.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from project_assessment.helper.data_model import Node, STATUS_CHOICES
+
+VOCABULARY = (
+    "Risiko Stakeholder Tools Zeitplan Budget Migration Reporting Security Compliance "
+    "Tenant Configuration Adoption Change Management Prozess System Mensch Schulung "
+    "Infrastruktur Netzwerk Server Clients Governance Sponsor Lieferant Qualität Test "
+    "Rollout Pilot Datenqualität Schnittstelle Architektur Kommunikation Ressourcen Ziel"
+).split()
+
+
+@dataclass
+class TreeSpec:
+    """Shape of a synthetic tree."""
+    nodes: int = 10_000
+    main_goals: int = 20
+    depth: int = 4
+    status_mix: Tuple[float, float, float] = (0.1, 0.3, 0.6)  # red, yellow, green
+    name_words: Tuple[int, int] = (2, 8)
+    comment_ratio: float = 0.2
+    seed: int = 42
+
+
+def generate_tree(spec: TreeSpec = TreeSpec()) -> List[Node]:
+    """
+    Builds ``spec.nodes`` nodes breadth-first (parents before children).
+
+    The fan-out per level is chosen so that the requested node count is
+    reached at about ``spec.depth`` levels below the main goals.
+    """
+    rnd = random.Random(spec.seed)
+    per_goal = max(1, spec.nodes // max(1, spec.main_goals))
+    fanout = max(2, math.ceil(per_goal ** (1 / max(1, spec.depth))))
+
+    def name() -> str:
+        return " ".join(rnd.choices(VOCABULARY, k=rnd.randint(*spec.name_words)))
+
+    def status() -> str:
+        return rnd.choices(STATUS_CHOICES, weights=spec.status_mix)[0]
+
+    def comment() -> str:
+        return name() if rnd.random() < spec.comment_ratio else ""
+
+    nodes: List[Node] = []
+    frontier: List[Node] = []
+    for _ in range(min(spec.main_goals, spec.nodes)):
+        n = Node(name=name(), status=status(), comment=comment())
+        nodes.append(n)
+        frontier.append(n)
+
+    while len(nodes) < spec.nodes and frontier:
+        next_frontier: List[Node] = []
+        for parent in frontier:
+            for _ in range(rnd.randint(1, 2 * fanout - 1)):
+                if len(nodes) >= spec.nodes:
+                    break
+                child = Node(name=name(), parent=parent.id, status=status(), comment=comment())
+                nodes.append(child)
+                next_frontier.append(child)
+        frontier = next_frontier
+    return nodes
+
+
+def generate_rules(count: int = 50, regex_ratio: float = 0.1, seed: int = 42) -> List[Dict[str, str]]:
+    """Rules in the ``rules.yaml`` format; mostly literals, some real regexes."""
+    rnd = random.Random(seed)
+    rules = []
+    for i in range(count):
+        words = rnd.sample(VOCABULARY, k=rnd.randint(1, 2))
+        if rnd.random() < regex_ratio:
+            match = r"\b" + r"\s+\w*\s*".join(re.escape(w) for w in words)
+        else:
+            match = " ".join(words)
+        rules.append({"match": match, "action": f"Empfehlung {i}: {' '.join(words)} prüfen."})
+    return rules
+
+
+# Zusätzliche Wörter für Dokumente, damit Katalogfragen echte Treffer haben
+DOCUMENT_WORDS = (
+    "project sponsor executive senior user supplier manager roles responsibilities strategy "
+    "portfolio program scope funding stage gate budget costs effort benefits risks problem "
+    "opportunity processes systems infrastructure network server clients tools timeline "
+    "milestones rollout the a of and to in is for with on we will be this that"
+).split()
+
+
+def generate_documents(count: int = 500, words: Tuple[int, int] = (500, 5000),
+                       seed: int = 42) -> List[Tuple[str, str]]:
+    """``count`` (name, text) pairs of plain-text project documents with paragraphs."""
+    rnd = random.Random(seed)
+    pool = VOCABULARY + DOCUMENT_WORDS
+    docs = []
+    for i in range(count):
+        paragraphs, left = [], rnd.randint(*words)
+        while left > 0:
+            n = min(left, rnd.randint(30, 200))
+            # Jedes dritte Wort aus einem langen, Zipf-verteilten Fachvokabular
+            paragraphs.append(" ".join(
+                rnd.choice(pool) if rnd.random() < 0.67 else f"term{int(rnd.paretovariate(1.0)) % 20_000}"
+                for _ in range(n)) + ".")
+            left -= n
+        docs.append((f"doc_{i:04d}.txt", "\n\n".join(paragraphs)))
+    return docs
+
+
+def goals_for(nodes: int, seed: int = 42) -> List[str]:
+    """Goal list for ``build_tree`` that yields roughly ``nodes`` nodes."""
+    from project_assessment.helper.tree_builder import load_question_template
+
+    def size(templates) -> int:
+        return sum(1 + size(t.children) for t in templates)
+
+    per_goal = 1 + size(load_question_template())
+    rnd = random.Random(seed)
+    return [" ".join(rnd.choices(VOCABULARY, k=3)) for _ in range(max(1, nodes // per_goal))]
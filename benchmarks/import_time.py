@@ -0,0 +1,132 @@
+"""
+import_time.py
+--------------
+Cold-start harness: import time and resident memory per module.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --repeat 5 --out import_times.json
+    python -m benchmarks.import_time --compare import_times.json
+
+Every module is imported in a fresh interpreter, so nothing is cached
+between measurements. ``app`` runs the whole Streamlit script in bare mode
+(first paint without a browser). Reported are the median import time, the
+RSS growth over an empty interpreter and which heavy dependencies ended up
+loaded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.common import print_table
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = (
+    "app",
+    "project_assessment.gui",
+    "project_assessment.batch",
+    "project_assessment.helper.data_model",
+    "project_assessment.helper.tree_builder",
+    "project_assessment.helper.analysis",
+    "project_assessment.helper.summarizer",
+    "project_assessment.helper.recommendations",
+    "project_assessment.helper.data_store",
+    "project_assessment.helper.pipeline",
+    "project_assessment.helper.search",
+    "project_assessment.helper.diff",
+    "project_assessment.helper.ingest",
+    "project_assessment.helper.history",
+    "project_assessment.helper.sqlite_store",
+    "visualization.layout",
+    "visualization.lod",
+    "visualization.visualizer",
+    "visualization.visualizer3d",
+)
+HEAVY = ("streamlit", "pandas", "numpy", "yaml", "networkx", "pyvis", "plotly")
+
+# Läuft im frischen Interpreter; misst RSS vor und nach dem Import
+_PROBE = r"""
+import json, sys, time
+def rss_kb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+before = rss_kb()
+t0 = time.perf_counter()
+if sys.argv[1] == "app":
+    import logging, runpy
+    logging.disable(logging.WARNING)
+    runpy.run_path("app.py", run_name="__main__")
+else:
+    __import__(sys.argv[1])
+seconds = time.perf_counter() - t0
+heavy = [m for m in sys.argv[2].split(",") if m in sys.modules]
+print(json.dumps({"seconds": seconds, "rss_kb": rss_kb() - before, "loaded": heavy}))
+"""
+
+
+def probe(module: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE, module, ",".join(HEAVY)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure(modules, repeat: int) -> List[dict]:
+    results = []
+    for module in modules:
+        runs = [probe(module) for _ in range(repeat)]
+        results.append({
+            "module": module,
+            "seconds": statistics.median(r["seconds"] for r in runs),
+            "rss_mb": statistics.median(r["rss_kb"] for r in runs) / 1024,
+            "loaded": runs[-1]["loaded"],
+        })
+        print(f"{module:<45} {results[-1]['seconds'] * 1e3:8.1f} ms", file=sys.stderr)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=list(MODULES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="previous JSON to compare against")
+    args = parser.parse_args(argv)
+
+    results = measure(args.modules, args.repeat)
+    if args.out:
+        args.out.write_text(json.dumps({"python": sys.version.split()[0], "results": results}, indent=2),
+                            encoding="utf-8")
+
+    base: Dict[str, dict] = {}
+    if args.compare:
+        base = {r["module"]: r for r in json.loads(args.compare.read_text(encoding="utf-8"))["results"]}
+    rows = []
+    for r in results:
+        row = [r["module"], f"{r['seconds'] * 1e3:.1f}", f"{r['rss_mb']:.1f}", ",".join(r["loaded"]) or "-"]
+        if base:
+            b = base.get(r["module"])
+            row.append(f"{r['seconds'] / b['seconds']:.2f}x" if b and b["seconds"] else "-")
+        rows.append(row)
+    header = ["module", "ms", "RSS MB", "heavy deps loaded"] + (["vs baseline"] if base else [])
+    print_table(rows, header)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
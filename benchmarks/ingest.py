@@ -0,0 +1,84 @@
+"""
+ingest.py
+---------
+Durchsatz der Dokumenten-Pipeline (helper/ingest.py) auf einem
+synthetischen Korpus.
+
+    python -m benchmarks.ingest                       # 500 Dokumente
+    python -m benchmarks.ingest --docs 2000 --out ingest.json
+
+Gemessen werden: Einlesen aller Dokumente (Streaming über BytesIO,
+Chunking, BM25-Index), Hinzufügen und Ersetzen eines einzelnen Dokuments
+im vollen Index (inkrementell) und die Zuordnung aller Katalogfragen.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks.common import print_table
+from benchmarks.generator import generate_documents
+from project_assessment.helper.data_model import GoalTree
+from project_assessment.helper.ingest import Corpus, match_categories, match_questions, load_categories, question_nodes
+from project_assessment.helper.tree_builder import build_tree
+
+
+def run(docs: int, goals: int, seed: int) -> dict:
+    corpus_docs = [(name, text.encode("utf-8")) for name, text in generate_documents(docs, seed=seed)]
+    total_mb = sum(len(raw) for _, raw in corpus_docs) / 1e6
+
+    corpus = Corpus()
+    t0 = time.perf_counter()
+    for name, raw in corpus_docs:
+        corpus.add_document(name, io.BytesIO(raw))
+    ingest_s = time.perf_counter() - t0
+
+    # Ein Dokument mehr bzw. ein ersetztes – nur dessen Passagen werden angefasst
+    extra_name, extra = corpus_docs[0][0].replace("doc_", "extra_"), corpus_docs[0][1]
+    t0 = time.perf_counter()
+    corpus.add_document(extra_name, io.BytesIO(extra))
+    add_one_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    corpus.add_document(corpus_docs[1][0], io.BytesIO(corpus_docs[1][1]))
+    replace_one_s = time.perf_counter() - t0
+
+    tree = GoalTree(build_tree([f"Goal {i}" for i in range(goals)]))
+    questions = len(question_nodes(tree))
+    t0 = time.perf_counter()
+    match_questions(tree, corpus)
+    match_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    match_categories(corpus, load_categories())
+    categories_s = time.perf_counter() - t0
+
+    return {
+        "documents": docs, "megabytes": total_mb, "passages": len(corpus), "terms": corpus.vocabulary_size,
+        "ingest_seconds": ingest_s, "docs_per_second": docs / ingest_s, "mb_per_second": total_mb / ingest_s,
+        "add_one_ms": add_one_s * 1e3, "replace_one_ms": replace_one_s * 1e3,
+        "questions": questions, "match_questions_ms": match_s * 1e3, "match_categories_ms": categories_s * 1e3,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--goals", type=int, default=10, help="goals in the tree whose questions are matched")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    result = run(args.docs, args.goals, args.seed)
+    if args.out:
+        args.out.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print_table([(k, f"{v:,.2f}" if isinstance(v, float) else v) for k, v in result.items()], ("metric", "value"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+run.py
+------
+Benchmark-Suite für alle Helper auf synthetischen Bäumen.
+
+    python -m benchmarks.run                          # 1k/10k/100k
+    python -m benchmarks.run --sizes 1000 1000000 --out results.json
+    python -m benchmarks.run --compare baseline.json  # Regressionen melden
+
+Gemessen werden beste Laufzeit (ohne tracemalloc) und Speicherspitze
+(eigener Lauf mit tracemalloc). Die Ergebnisse sind JSON und lassen sich
+zwischen Läufen vergleichen; ``--compare`` endet mit Exit-Code 1, wenn ein
+Ziel um mehr als ``--threshold`` langsamer geworden ist.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.common import print_table
+from benchmarks.generator import TreeSpec, generate_rules, generate_tree, goals_for
+from project_assessment.helper import data_store, tree_builder
+from project_assessment.helper.analysis import aggregate_status, compute_metrics, critical_paths
+from project_assessment.helper.data_model import GoalTree, Node
+from project_assessment.helper.diff import diff
+from project_assessment.helper.recommendations import RuleSet, get_recommendations
+from project_assessment.helper.summarizer import generate_summary
+from project_assessment.helper.tree_builder import build_tree, load_questions
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+# (setup(nodes) -> Argumente, ungemessen; run(*Argumente))
+Target = Tuple[Callable[[List[Node]], tuple], Callable[..., object]]
+
+
+def _fresh_tree(nodes: List[Node]) -> tuple:
+    # Roll-up verändert Status – jede Wiederholung startet vom Original
+    return (GoalTree(Node(**n.to_dict()) for n in nodes),)
+
+
+def _tmp_json(nodes: List[Node]) -> tuple:
+    path = Path(tempfile.gettempdir()) / "pg_bench_tree.json"
+    data_store.save_tree(nodes, path)
+    return (path,)
+
+
+def _cold_questions(nodes: List[Node]) -> tuple:
+    # Ohne geleerten Cache würde nur der Treffer gemessen, nicht Lesen und Parsen
+    tree_builder._TEMPLATE_CACHE.clear()
+    return ()
+
+
+def _network(nodes: List[Node]) -> tuple:
+    return (GoalTree(nodes),)
+
+
+def _edited_pair(nodes: List[Node]) -> tuple:
+    # Zweiter Stand mit Änderungen an rund 1 % der Knoten
+    a, b = GoalTree(nodes), GoalTree(Node(**n.to_dict()) for n in nodes)
+    for n in list(b)[::100]:
+        b.update(n.id, status="red" if n.status != "red" else "green")
+    return a, b
+
+
+def _plotly(nodes: List[Node]) -> tuple:
+    from visualization.layout import tree_layout
+    from visualization.visualizer import build_network
+
+    tree = GoalTree(nodes)
+    return build_network(tree), tree.parent_ids(), tree_layout(tree, dim=3)
+
+
+def targets(rule_count: int) -> Dict[str, Target]:
+    ruleset = RuleSet(generate_rules(rule_count))
+    out: Dict[str, Target] = {
+        "build_tree": (lambda nodes: (goals_for(len(nodes)),), build_tree),
+        "load_questions": (_cold_questions, load_questions),
+        "aggregate_status": (_fresh_tree, aggregate_status),
+        "compute_metrics": (_network, compute_metrics),
+        "critical_paths": (_network, critical_paths),
+        "generate_summary": (_network, generate_summary),
+        "get_recommendations": (lambda nodes: (nodes, ruleset), get_recommendations),
+        "save_tree": (lambda nodes: (nodes, Path(tempfile.gettempdir()) / "pg_bench_save.json"),
+                      data_store.save_tree),
+        "load_tree": (_tmp_json, data_store.load_tree),
+        "diff": (_edited_pair, diff),
+    }
+    try:
+        from visualization.visualizer import build_network
+        from visualization.visualizer3d import build_plotly_3d
+    except ImportError as err:  # Visualisierung optional (networkx/pyvis/plotly)
+        print(f"[INFO] visual targets skipped: {err}", file=sys.stderr)
+    else:
+        out["build_network"] = (_network, build_network)
+        out["build_plotly_3d"] = (_plotly, build_plotly_3d)
+    return out
+
+
+def measure(setup: Callable[[], tuple], run: Callable[..., object], repeat: int,
+            memory: bool) -> Tuple[float, Optional[int]]:
+    best = float("inf")
+    for _ in range(repeat):
+        args = setup()
+        t0 = time.perf_counter()
+        run(*args)
+        best = min(best, time.perf_counter() - t0)
+    peak = None
+    if memory:
+        args = setup()
+        tracemalloc.start()
+        run(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_suite(sizes, only: Optional[List[str]], rule_count: int, memory: bool,
+              visual_limit: int, seed: int) -> dict:
+    all_targets = targets(rule_count)
+    results = []
+    for size in sizes:
+        nodes = generate_tree(TreeSpec(nodes=size, seed=seed))
+        repeat = 3 if size <= 10_000 else 1
+        for name, (setup, run) in all_targets.items():
+            if only and name not in only:
+                continue
+            if name.startswith("build_") and name != "build_tree" and size > visual_limit:
+                continue
+            seconds, peak = measure(lambda: setup(nodes), run, repeat, memory)
+            results.append({"target": name, "size": size, "seconds": seconds, "peak_bytes": peak})
+            print(f"{name:<20} {size:>9}  {seconds * 1e3:10.2f} ms", file=sys.stderr)
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "rules": rule_count,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    """Prints a comparison table; returns True if any target regressed."""
+    base = {(r["target"], r["size"]): r for r in baseline["results"]}
+    rows, regressed = [], False
+    for r in current["results"]:
+        b = base.get((r["target"], r["size"]))
+        if b is None:
+            continue
+        ratio = r["seconds"] / b["seconds"] if b["seconds"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag, regressed = "REGRESSION", True
+        rows.append((r["target"], r["size"], f"{b['seconds'] * 1e3:.2f}", f"{r['seconds'] * 1e3:.2f}",
+                     f"{ratio:.2f}x", flag))
+    print_table(rows, ("target", "size", "baseline ms", "current ms", "ratio", ""))
+    return regressed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--only", nargs="+", help="run only these targets")
+    parser.add_argument("--rules", type=int, default=200, help="number of generated rules")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--visual-limit", type=int, default=100_000,
+                        help="largest tree for build_network/build_plotly_3d")
+    parser.add_argument("--out", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    result = run_suite(args.sizes, args.only, args.rules, not args.no_memory, args.visual_limit, args.seed)
+    if args.out:
+        args.out.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    else:
+        rows = [(r["target"], r["size"], f"{r['seconds'] * 1e3:.2f}",
+                 "-" if r["peak_bytes"] is None else f"{r['peak_bytes'] / 1e6:.1f}")
+                for r in result["results"]]
+        print_table(rows, ("target", "size", "ms", "peak MB"))
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        return 1 if compare(result, baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
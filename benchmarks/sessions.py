@@ -0,0 +1,74 @@
+"""
+sessions.py
+-----------
+Speicher je Session: eigener Baum pro Session gegenüber Copy-on-write-Forks
+eines geteilten Baums (``data_model.share``), wie beim Öffnen desselben
+gespeicherten Projekts mit ``ProjectStore.load(shared=True)``, sowie neue
+Projekte als Fork des Fragenkatalogs (``tree_builder.project_tree``).
+
+    python -m benchmarks.sessions
+    python -m benchmarks.sessions --sessions 100 --goals 20 --edits 10
+
+Jede simulierte Session lädt dasselbe Projekt (frische Node-Kopien), ändert
+``--edits`` zufällige Status (inkrementeller Roll-up) und bleibt am Leben;
+gemessen wird der mit tracemalloc belegte Speicher nach allen Sessions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+from typing import Callable, List, Optional
+
+from benchmarks.common import print_table
+from project_assessment.helper.analysis import update_status
+from project_assessment.helper.data_model import STATUS_CHOICES, GoalTree, Node, share
+from project_assessment.helper.tree_builder import build_tree, project_tree
+
+
+def measure(make: Callable[[], GoalTree], sessions: int, edits: int, seed: int) -> float:
+    """Bytes per live session."""
+    rnd = random.Random(seed)
+    gc.collect()
+    tracemalloc.start()
+    alive: List[GoalTree] = []
+    for _ in range(sessions):
+        tree = make()
+        ids = [n.id for n in tree]
+        for nid in rnd.sample(ids, min(edits, len(ids))):
+            update_status(tree, nid, rnd.choice(STATUS_CHOICES))
+        alive.append(tree)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / sessions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--goals", type=int, default=20)
+    parser.add_argument("--edits", type=int, default=10, help="status changes per session")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    project = build_tree([f"Goal {i}" for i in range(args.goals)])
+    nodes = len(project)
+    # Wie aus der Datenbank gelesen: jede Session bekommt neue Node-Objekte
+    rows = lambda: [Node(**n.to_dict()) for n in project]
+    own = measure(lambda: GoalTree(rows()), args.sessions, args.edits, args.seed)
+    shared = measure(lambda: share(rows()), args.sessions, args.edits, args.seed)
+    goals = [f"Goal {i}" for i in range(args.goals)]
+    created = measure(lambda: project_tree(goals), args.sessions, args.edits, args.seed)
+    print_table([
+        ("own tree per session", nodes, f"{own / 1024:,.1f}", f"{own * args.sessions / 2**20:,.1f}"),
+        ("copy-on-write fork", nodes, f"{shared / 1024:,.1f}", f"{shared * args.sessions / 2**20:,.1f}"),
+        ("new project (catalogue fork)", nodes, f"{created / 1024:,.1f}", f"{created * args.sessions / 2**20:,.1f}"),
+    ], ("variant", "nodes", "KiB/session", f"MiB for {args.sessions}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,51 @@
 # sections/analysis.py
+from html import escape
+
 import streamlit as st
 
 from state_utils import get_nodes, analysis_done
-from project_assessment.helper.analysis import (
-    aggregate_status,
-    compute_metrics,
-    critical_paths,
-)
-from project_assessment.helper.summarizer import generate_summary
-from project_assessment.helper.recommendations import load_rules, get_recommendations
+from project_assessment.helper.analysis import path_names, top_critical
+from project_assessment.helper.pipeline import cached_analysis
+from project_assessment.helper.subtree_index import subtree_index
+
+def _breakdown_rows(goals, index):
+    """One table row per goal with the status counts of its subtree (O(1) per row)"""
+    rows = []
+    for g in goals:
+        m = index.metrics(g.id)
+        rows.append({
+            "Goal": g.name, "Status": g.status, "Total": m["total"],
+            "Red": m["red"], "Yellow": m["yellow"], "Green": m["green"],
+            "Red %": m["red_pct"] * 100,
+        })
+    return rows
+
+def _forest_html(forest, open_levels=1):
+    """
+    Nested, foldable <details> for the critical-path forest. Chains of
+    non-red nodes with a single red branch are folded into "A → B → C".
+    """
+    def label(pn):
+        name = escape(pn.name)
+        name = f'<span style="color:#d62728">{name}</span>' if pn.status == "red" else name
+        return f"{name} <small>({pn.red}/{pn.size} red)</small>"
+
+    def render_node(pn, level):
+        parts = [label(pn)]
+        while pn.status != "red" and len(pn.children) == 1:
+            pn = pn.children[0]
+            parts.append(label(pn))
+        head = " → ".join(parts)
+        if not pn.children:
+            return f'<div style="margin-left:1.1em">{head}</div>'
+        body = "".join(render_node(c, level + 1) for c in pn.children)
+        state = " open" if level < open_levels else ""
+        return (f'<details{state} style="margin-left:0.6em"><summary>{head}</summary>'
+                f"{body}</details>")
+
+    return "".join(render_node(pn, 0) for pn in forest)
+
+_BREAKDOWN_COLUMNS = {"Red %": st.column_config.ProgressColumn(min_value=0, max_value=100, format="%.0f%%")}
 
 def render():
     # Prüfen, ob der Nutzer die Analyse überhaupt aktiviert hat
@@ -21,35 +58,60 @@ def render():
         st.warning("No goal tree available.")
         return
 
-    # ── 1) Status zusammen­fassen (Sicherheitshalber)
-    aggregate_status(nodes)
+    # ── 1) Status zusammen­fassen + komplette Auswertung (gecacht je Baum-Revision)
+    result = cached_analysis(nodes, forest=True)
 
     # ── 2) KPI-Dashboard
     st.subheader("📊 Key Metrics")
-    m = compute_metrics(nodes)
+    m = result.metric
     c1, c2, c3, c4 = st.columns(4)
     c1.metric("Red",  f'{m["red"]}/{m["total"]}',  f'{m["red_pct"]*100:.0f}%')
     c2.metric("Yellow", f'{m["yellow"]}/{m["total"]}', f'{m["yellow_pct"]*100:.0f}%')
     c3.metric("Green", f'{m["green"]}/{m["total"]}', f'{m["green_pct"]*100:.0f}%')
     c4.metric("Total", m["total"])
 
+    # ── 2b) Kennzahlen je Hauptziel und Achse (Euler-Tour-Index statt Teilbaum-Durchläufen)
+    st.subheader("🧭 Breakdown by Goal")
+    index = subtree_index(nodes)
+    goals = nodes.roots()
+    st.dataframe(_breakdown_rows(goals, index), hide_index=True, use_container_width=True,
+                 column_config=_BREAKDOWN_COLUMNS)
+    goal_id = st.selectbox("Axes of", [g.id for g in goals], key="analysis_breakdown_goal",
+                           format_func=lambda nid: nodes[nid].name if nid in nodes else nid)
+    if goal_id in nodes and nodes.has_children(goal_id):
+        st.dataframe(_breakdown_rows(nodes.children(goal_id), index), hide_index=True,
+                     use_container_width=True, column_config=_BREAKDOWN_COLUMNS)
+
     # ── 3) Kritische Pfade
     st.subheader("🔥 Critical Paths")
-    for p in critical_paths(nodes):
-        # Alle bis auf das letzte Element fett
-        formatted = [f"**{name}**" for name in p[:-1]] + [p[-1]]
-        st.markdown(" → ".join(formatted))
+    view = st.radio("View", ["Tree", "Top-k", "List"], horizontal=True, key="analysis_paths_view")
+    if not result.critical_paths:
+        st.success("No red goals.")
+    elif view == "Tree":
+        # Gemeinsame Präfixe nur einmal, Zweige einklappbar
+        st.markdown(_forest_html(result.critical_forest), unsafe_allow_html=True)
+    elif view == "Top-k":
+        k = st.select_slider("Show", [5, 10, 20, 50], value=10, key="analysis_paths_k")
+        rows = [{
+            "Path": " → ".join(path_names(nodes, pn.id)), "Status": pn.status,
+            "Red": pn.red, "Nodes": pn.size, "Red %": pn.density * 100,
+        } for pn in top_critical(nodes, k)]
+        st.caption("Subtrees ranked by share of red goals.")
+        st.dataframe(rows, hide_index=True, use_container_width=True, column_config=_BREAKDOWN_COLUMNS)
+    else:
+        for line in result.critical_path_lines:
+            # Alle bis auf das letzte Element fett
+            st.markdown(line)
 
     # ── 4) Zusammenfassung
     st.subheader("✍️ Summary")
-    st.markdown(generate_summary(nodes))
+    st.markdown(result.summary)
 
     # ── 5) Empfehlungen
     st.subheader("💡 Recommendations")
-    recs = get_recommendations(nodes, load_rules())
+    recs = result.recommendations
     if recs:
         for r in recs:
             st.markdown(f"- {r}")
     else:
         st.info("No recommendations based on current rules.")
-        
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+batch.py
+--------
+Headless assessment of many exported projects (no Streamlit, pyvis or Plotly).
+
+    python -m project_assessment.batch exports/ --out results.ndjson
+    python -m project_assessment.batch exports/ --out results.csv --workers 8
+
+Every file (``.json``, ``.ndjson`` or ``.pgsnap``) is loaded and analysed by
+``pipeline.analyze`` in a process pool. At most ``--max-in-flight`` projects
+are queued or in progress, so memory stays bounded by the largest trees and
+not by the size of the directory. Results are written as they complete; a
+throughput report goes to stderr.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from project_assessment.helper.data_store import load_snapshot, load_tree, load_tree_ndjson
+from project_assessment.helper.pipeline import analyze
+from project_assessment.helper.recommendations import load_ruleset
+
+SUFFIXES = (".json", ".ndjson", ".pgsnap")
+DEFAULT_RULES = "config/rules.yaml"
+# Kritische Pfade pro Projekt in der Ausgabe (die Anzahl wird immer geschrieben)
+DEFAULT_MAX_PATHS = 50
+
+CSV_FIELDS = (
+    "project", "path", "nodes", "total", "red", "yellow", "green",
+    "red_pct", "yellow_pct", "green_pct", "critical_paths", "recommendations",
+    "summary", "seconds", "error",
+)
+
+
+def find_projects(inputs: Iterable[str | Path]) -> Iterator[Path]:
+    """Files given directly plus all supported files below given directories (sorted)."""
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*") if p.suffix in SUFFIXES and p.is_file())
+        else:
+            yield path
+
+
+def _load(path: Path):
+    if path.suffix == ".pgsnap":
+        return load_snapshot(path)
+    if path.suffix == ".ndjson":
+        return load_tree_ndjson(path)
+    return load_tree(path)
+
+
+def assess(path: str | Path, rules: str = DEFAULT_RULES, max_paths: int = DEFAULT_MAX_PATHS) -> dict:
+    """
+    Analyses one exported project. Runs in the worker processes; the rule
+    set is compiled once per process (see ``load_ruleset``).
+    """
+    path = Path(path)
+    t0 = time.perf_counter()
+    record: dict = {"project": path.stem, "path": str(path)}
+    try:
+        nodes = _load(path)
+        result = analyze(nodes, load_ruleset(rules))
+    except Exception as e:  # ein defektes Projekt darf den Lauf nicht abbrechen
+        record.update(nodes=0, error=f"{type(e).__name__}: {e}", seconds=time.perf_counter() - t0)
+        return record
+    record.update(
+        nodes=len(nodes),
+        metrics=result.metric,
+        critical_path_count=len(result.critical_paths),
+        critical_paths=[list(p) for p in result.critical_paths[:max_paths]],
+        summary=result.summary,
+        recommendations=list(result.recommendations),
+        seconds=time.perf_counter() - t0,
+        error=None,
+    )
+    return record
+
+
+class ResultWriter:
+    """Streams records as NDJSON (default) or CSV, one line per project."""
+
+    def __init__(self, fp: TextIO, fmt: str = "ndjson"):
+        self.fp = fp
+        self.fmt = fmt
+        self._csv = csv.DictWriter(fp, CSV_FIELDS, extrasaction="ignore") if fmt == "csv" else None
+        if self._csv is not None:
+            self._csv.writeheader()
+
+    def write(self, record: dict) -> None:
+        if self._csv is None:
+            self.fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            row = {**record, **record.get("metrics", {})}
+            row["critical_paths"] = record.get("critical_path_count", 0)
+            row["recommendations"] = len(record.get("recommendations", ()))
+            self._csv.writerow(row)
+        self.fp.flush()
+
+
+def run(paths: List[Path], writer: ResultWriter, workers: int, max_in_flight: int,
+        rules: str = DEFAULT_RULES, max_paths: int = DEFAULT_MAX_PATHS) -> Dict[str, float]:
+    """Processes ``paths`` and returns the throughput statistics."""
+    stats = {"projects": 0, "failed": 0, "nodes": 0, "cpu_seconds": 0.0}
+
+    def collect(record: dict) -> None:
+        writer.write(record)
+        stats["projects"] += 1
+        stats["failed"] += record["error"] is not None
+        stats["nodes"] += record["nodes"]
+        stats["cpu_seconds"] += record["seconds"]
+
+    t0 = time.perf_counter()
+    if workers <= 1:
+        for path in paths:
+            collect(assess(path, rules, max_paths))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: set[Future] = set()
+            for path in paths:
+                # Nur begrenzt viele Projekte gleichzeitig unterwegs
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for f in done:
+                        collect(f.result())
+                pending.add(pool.submit(assess, path, rules, max_paths))
+            for f in wait(pending).done:
+                collect(f.result())
+    stats["wall_seconds"] = time.perf_counter() - t0
+    return stats
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    usage = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux: KiB, macOS: Bytes
+    return usage / (1 << 20) if sys.platform == "darwin" else usage / 1024
+
+
+def report(stats: Dict[str, float], workers: int, fp: TextIO = sys.stderr) -> None:
+    wall = stats["wall_seconds"] or 1e-9
+    lines = [
+        f"projects      {stats['projects']} ({stats['failed']} failed)",
+        f"nodes         {stats['nodes']}",
+        f"workers       {workers}",
+        f"wall time     {stats['wall_seconds']:.2f} s (worker time {stats['cpu_seconds']:.2f} s)",
+        f"throughput    {stats['projects'] / wall:.1f} projects/s, {stats['nodes'] / wall:,.0f} nodes/s",
+    ]
+    rss = _peak_rss_mb()
+    if rss is not None:
+        lines.append(f"peak RSS      {rss:.0f} MB (largest process)")
+    print("\n".join(lines), file=fp)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m project_assessment.batch", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="project files or directories")
+    parser.add_argument("--out", "-o", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=("ndjson", "csv"),
+                        help="output format (default: from --out suffix, else ndjson)")
+    parser.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (1 = run in this process)")
+    parser.add_argument("--max-in-flight", type=int, help="projects queued at once (default: 2 × workers)")
+    parser.add_argument("--rules", default=DEFAULT_RULES, help="rules.yaml for the recommendations")
+    parser.add_argument("--max-paths", type=int, default=DEFAULT_MAX_PATHS,
+                        help="critical paths written per project")
+    args = parser.parse_args(argv)
+
+    paths = list(find_projects(args.inputs))
+    if not paths:
+        print("No project files found.", file=sys.stderr)
+        return 1
+    fmt = args.format or ("csv" if args.out and args.out.endswith(".csv") else "ndjson")
+    workers = max(1, min(args.workers, len(paths)))
+    max_in_flight = args.max_in_flight or 2 * workers
+
+    out = open(args.out, "w", encoding="utf-8", newline="") if args.out else sys.stdout
+    try:
+        stats = run(paths, ResultWriter(out, fmt), workers, max_in_flight, args.rules, args.max_paths)
+    finally:
+        if args.out:
+            out.close()
+    report(stats, workers)
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
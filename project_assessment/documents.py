@@ -0,0 +1,91 @@
+# project_assessment/documents.py
+import streamlit as st
+
+from project_assessment.helper.ingest import (
+    Corpus, load_categories, match_categories, match_questions, question_nodes,
+)
+from state_utils import get_nodes
+
+DOCUMENT_TYPES = ["txt", "md", "csv"]
+SNIPPET_CHARS = 240
+
+def get_corpus() -> Corpus:
+    """BM25 index of the documents of this session (created on first use)"""
+    if not isinstance(st.session_state.get("ingest_corpus"), Corpus):
+        st.session_state["ingest_corpus"] = Corpus()
+    return st.session_state["ingest_corpus"]
+
+def _snippet(text):
+    return text if len(text) <= SNIPPET_CHARS else text[:SNIPPET_CHARS - 1] + "…"
+
+def _evidence_row(corpus, evidence):
+    passage = corpus.passages[evidence.passage_id]
+    return {"Document": passage.doc, "Passage": passage.ordinal + 1,
+            "Score": round(evidence.score, 2), "Text": _snippet(passage.text)}
+
+# ── Haupt-Render-Funktion
+def render():
+    corpus = get_corpus()
+    # ingested_texts: Dokumentname → DocumentInfo (der Text selbst steckt nur in den Passagen)
+    ingested = st.session_state.setdefault("ingested_texts", {})
+    # Schon verarbeitete Uploads (Name, Größe) – auch nach „Remove“ nicht erneut einlesen
+    seen = st.session_state.setdefault("ingest_seen", set())
+
+    st.subheader("📄 Project Documents")
+    uploads = st.file_uploader("Add project documents", type=DOCUMENT_TYPES,
+                               accept_multiple_files=True, key="ingest_uploader")
+    new = [f for f in uploads or () if (f.name, f.size) not in seen]
+    if new:
+        # Nur die neuen Dateien werden gelesen und indiziert
+        with st.spinner(f"Indexing {len(new)} document(s) …"):
+            for f in new:
+                seen.add((f.name, f.size))
+                try:
+                    ingested[f.name] = corpus.add_document(f.name, f)
+                except UnicodeDecodeError as e:
+                    # Index bleibt unverändert; die übrigen Dateien werden trotzdem gelesen
+                    st.error(f"{f.name}: not a UTF-8 text file ({e.reason}).")
+
+    if not corpus.documents():
+        st.info("No documents yet – upload text files to find evidence for the catalogue questions.")
+        return
+
+    docs = corpus.documents()
+    st.caption(f"{len(docs)} documents · {len(corpus)} passages · {corpus.vocabulary_size} terms")
+    with st.expander("Documents", expanded=False):
+        for info in docs:
+            col_name, col_remove = st.columns([6, 1])
+            col_name.markdown(f"**{info.name}** · {len(info.passages)} passages · {info.chars:,} characters")
+            if col_remove.button("🗑️", key=f"ingest_remove_{info.name}"):
+                corpus.remove_document(info.name)
+                ingested.pop(info.name, None)
+                st.rerun()
+
+    k = st.selectbox("Passages per question", [1, 3, 5], index=1, key="ingest_k")
+
+    # ── Belege je Katalogfrage
+    tree = get_nodes()
+    if tree:
+        st.markdown("##### 🔎 Evidence for questions")
+        goals = tree.roots()
+        goal_id = st.selectbox("Goal", [g.id for g in goals], key="ingest_goal",
+                               format_func=lambda nid: tree[nid].name if nid in tree else nid)
+        if goal_id in tree:
+            matches = match_questions(tree, corpus, k, root=goal_id)
+            rows = []
+            for q in question_nodes(tree, goal_id):
+                for e in matches.get(q.id, ()):
+                    rows.append({"Axis": tree[q.parent].name, "Question": q.name, **_evidence_row(corpus, e)})
+            if rows:
+                st.dataframe(rows, hide_index=True, use_container_width=True)
+            else:
+                st.info("No passage matches the questions of this goal.")
+
+    # ── Belege je Kategorie (config/categories.yaml.old)
+    categories = load_categories()
+    if categories:
+        with st.expander("🗂️ Evidence by category", expanded=False):
+            matches = match_categories(corpus, categories, k)
+            rows = [{"Category": c.label, "Type": c.prompt_type, **_evidence_row(corpus, e)}
+                    for c in categories for e in matches.get(c.id, ())]
+            st.dataframe(rows, hide_index=True, use_container_width=True)
@@ -1,45 +1,35 @@
 # sections/editor.py
-import json, streamlit as st
-import pandas as pd
+import weakref
+
+import streamlit as st
 from uuid import uuid4
 from pathlib import Path
-import yaml
 
 from project_assessment.helper.data_model import STATUS_CHOICES, Node
+from project_assessment.helper.analysis import update_status
+from project_assessment.helper.data_store import export_json, snapshot_bytes
+from project_assessment.helper.history import history_for
+from project_assessment.helper.search import index_for
+from project_assessment.helper.sqlite_store import get_store
 from state_utils import get_nodes, set_nodes
 
-def dict_to_node(node_dict):
-    """Convert dictionary to Node object"""
-    return Node(
-        id=node_dict["id"],
-        name=node_dict["name"],
-        parent=node_dict.get("parent"),
-        status=node_dict.get("status", "yellow"),  # Default status is "yellow"
-        comment=node_dict.get("comment", "")
-    )
-
-def node_to_dict(node):
-    """Convert Node object to dictionary"""
-    return {
-        "id": node.id,
-        "name": node.name,
-        "parent": node.parent,
-        "status": node.status,
-        "comment": node.comment
-    }
-
-def get_children(parent_id, nodes_dict):
+def get_children(parent_id, tree):
     """Get all children of a parent node"""
-    return [n for n in nodes_dict if n.get("parent") == parent_id]
+    return tree.children(parent_id)
 
-def get_node_by_id(node_id, nodes_dict):
+def get_node_by_id(node_id, tree):
     """Get node by ID"""
-    return next((n for n in nodes_dict if n["id"] == node_id), None)
+    return tree.get(node_id)
+
+def _commit(tree):
+    """The tree was changed in place; only the session revision is bumped"""
+    set_nodes(tree)
 
 def load_questions():
     """Load questions from YAML file"""
     questions_path = Path("config/questions.yaml")
     if questions_path.exists():
+        import yaml  # erst bei Bedarf laden
         try:
             with questions_path.open("r", encoding="utf-8") as f:
                 return yaml.safe_load(f) or {}
@@ -47,59 +37,170 @@ def load_questions():
             st.error(f"Error loading questions: {e}")
     return {}
 
+PAGE_SIZES = (25, 50, 100)
+STATUS_DOT = {"red": "red", "yellow": "orange", "green": "green"}
+# Breadcrumb: Hauptziel plus die letzten Ebenen, dazwischen „…“
+BREADCRUMB_TAIL = 3
+
+def _node_row(node, tree, key):
+    """One row with status, name and the Edit/Delete buttons"""
+    col1, col2, col3 = st.columns([5, 1, 1])
+    with col1:
+        farbe = STATUS_DOT.get(node.status, "gray")
+        st.markdown(f'<span style="color:{farbe}">●</span> **{node.name}**  \n_Status: {node.status}_', unsafe_allow_html=True)
+    with col2:
+        if st.button("Edit", key=f"edit_{key}_{node.id}"):
+            st.session_state.active_node_id = node.id
+            st.rerun()
+    with col3:
+        if st.button("🗑️", key=f"delete_{key}_{node.id}"):
+            with history_for(tree).step(f"Delete “{node.name}”"):
+                tree.remove(node.id)
+            if st.session_state.get("active_node_id") not in tree:
+                st.session_state.active_node_id = None
+            _commit(tree)
+            st.rerun()
+
+def _paged_rows(nodes, tree, key):
+    """Widgets only for the current page; the pager shows up once there is more than one page"""
+    page_size = st.session_state.get("editor_page_size", PAGE_SIZES[0])
+    pages = max(1, -(-len(nodes) // page_size))
+    page = min(st.session_state.get(f"page_{key}", 1), pages)
+    start = (page - 1) * page_size
+    for node in nodes[start:start + page_size]:
+        _node_row(node, tree, key)
+    if pages > 1:
+        col_prev, col_info, col_next = st.columns([1, 3, 1])
+        if col_prev.button("‹ Prev", key=f"prev_{key}", disabled=page <= 1):
+            st.session_state[f"page_{key}"] = page - 1
+            st.rerun()
+        col_info.caption(f"Page {page} of {pages} · {start + 1}–{min(start + page_size, len(nodes))} of {len(nodes)}")
+        if col_next.button("Next ›", key=f"next_{key}", disabled=page >= pages):
+            st.session_state[f"page_{key}"] = page + 1
+            st.rerun()
+
+def _breadcrumb(node_id, tree):
+    """Overview › main goal › … › current node; every element jumps there"""
+    trail = tree.path(node_id)
+    if len(trail) > BREADCRUMB_TAIL + 2:
+        # Tiefe Pfade kürzen – sonst eine Spalte pro Ebene
+        trail = [trail[0], None, *trail[-BREADCRUMB_TAIL:]]
+    cols = st.columns(len(trail) + 1)
+    if cols[0].button("🏠 Overview", key="crumb_root"):
+        st.session_state.active_node_id = None
+        st.rerun()
+    for col, node in zip(cols[1:], trail):
+        if node is None:
+            col.markdown("…")
+            continue
+        label = node.name if len(node.name) <= 24 else node.name[:23] + "…"
+        if col.button(label, key=f"crumb_{node.id}", disabled=node.id == node_id):
+            st.session_state.active_node_id = node.id
+            st.rerun()
+
+def _merge_report(report, tree):
+    """Applied changes and conflicts of the last merge; conflicts jump to the goal"""
+    applied, conflicts = report.applied, report.conflicts
+    with st.expander(f"🔀 Last merge: {len(applied)} changes applied, {len(conflicts)} conflicts",
+                     expanded=bool(conflicts)):
+        if conflicts:
+            st.caption("Conflicts kept the current value – edit the goal to pick the other one.")
+            for i, c in enumerate(conflicts[:PAGE_SIZES[-1]]):
+                node = tree.get(c.node_id)
+                col_text, col_edit = st.columns([6, 1])
+                col_text.markdown(f"**{node.name if node else c.node_id}** · {c.kind}: "
+                                  f"current `{c.ours}` / uploaded `{c.theirs}`")
+                if node is not None and col_edit.button("Edit", key=f"conflict_{i}_{c.node_id}"):
+                    st.session_state.active_node_id = c.node_id
+                    st.rerun()
+        counts = {}
+        for e in applied:
+            counts[e.kind] = counts.get(e.kind, 0) + 1
+        if counts:
+            st.caption("Applied: " + " · ".join(f"{k}: {n}" for k, n in counts.items()))
+        if st.button("Dismiss", key="merge_report_dismiss"):
+            del st.session_state["merge_report"]
+            st.rerun()
+
+def _history_bar(tree):
+    """Undo/Redo of the editor actions and a jump to any earlier state"""
+    hist = history_for(tree)
+    col_undo, col_redo, col_info = st.columns([1, 1, 5])
+    if col_undo.button("↶ Undo", key="history_undo", disabled=not hist.can_undo()):
+        hist.undo()
+        _after_history(tree)
+    if col_redo.button("↷ Redo", key="history_redo", disabled=not hist.can_redo()):
+        hist.redo()
+        _after_history(tree)
+    entries = hist.entries()
+    if len(entries) > 1:
+        col_info.caption(f"Version {hist.version} · {len(entries) - 1} steps in the history")
+        with st.expander("🕘 History", expanded=False):
+            labels = dict(entries)
+            versions = [v for v, _ in reversed(entries)]
+            target = st.selectbox("Go to", versions, index=versions.index(hist.version), key="history_goto",
+                                  format_func=lambda v: f"{v} · {labels[v]}" + (" (current)" if v == hist.version else ""))
+            if st.button("Go", key="history_goto_apply", disabled=target == hist.version):
+                hist.goto(target)
+                _after_history(tree)
+
+def _after_history(tree):
+    # Der bearbeitete Knoten kann durch Undo/Redo verschwunden sein
+    if st.session_state.get("active_node_id") not in tree:
+        st.session_state.active_node_id = None
+    _commit(tree)
+    st.rerun()
+
 # ── Haupt-Render-Funktion
 def render():
-    # Get nodes from session state if available, otherwise from state_utils
-    if "editor_nodes" in st.session_state:
-        nodes_dict = st.session_state["editor_nodes"]
-    else:
-        nodes = get_nodes()
-        nodes_dict = [node_to_dict(n) for n in nodes]
+    # Der indizierte Baum aus dem Session-State ist die Quelle für alle Lookups
+    tree = get_nodes()
 
     # 1) Hinweis, falls noch kein Baum existiert
-    if not nodes_dict:
+    if not tree:
         st.info("No goal tree yet – please enter goals first.")
         return
 
     st.subheader("📝 Goal Editor")
+    _history_bar(tree)
 
-    # 2) Hauptziele (Nodes ohne Parent)
-    st.subheader("Main Goals:")
-    root_nodes = [n for n in nodes_dict if n.get("parent") is None]
-    
-    for node in root_nodes:
-        col1, col2, col3 = st.columns([5, 1, 1])
-        with col1:
-            status = node.get("status", "yellow")
-            farbe = {"red": "red", "yellow": "orange", "green": "green"}.get(status, "gray")
-            st.markdown(f'<span style="color:{farbe}">●</span> **{node["name"]}**  \n_Status: {status}_', unsafe_allow_html=True)
-        with col2:
-            if st.button("Edit", key=f"edit_{node['id']}"):
-                st.session_state.active_node_id = node["id"]
-                st.rerun()
-        with col3:
-            if st.button("🗑️", key=f"delete_{node['id']}"):
-                nodes_dict = [n for n in nodes_dict if n["id"] != node["id"]]
-                st.session_state["editor_nodes"] = nodes_dict
-                updated_nodes = [dict_to_node(n) for n in nodes_dict]
-                set_nodes(updated_nodes)
-                st.rerun()
+    # Ergebnis des letzten Merges (siehe goals_input.render_pending_upload)
+    if "merge_report" in st.session_state:
+        _merge_report(st.session_state["merge_report"], tree)
+
+    # 2) Suche (Volltext-Index) und Filter (Status, Tiefe) über die Indizes des Baums
+    col_text, col_status, col_depth, col_size = st.columns([3, 2, 1, 1])
+    text = col_text.text_input("Search goals", key="editor_filter",
+                               placeholder="Words in title or comment – prefixes and typos work")
+    statuses = col_status.multiselect("Status", STATUS_CHOICES, key="editor_filter_status")
+    depth = col_depth.selectbox("Depth", ["any", *range(tree.max_depth() + 1)], key="editor_filter_depth")
+    col_size.selectbox("Per page", PAGE_SIZES, key="editor_page_size")
+    active_id = st.session_state.get("active_node_id")
+    scoped = active_id in tree and st.checkbox("Only below the goal being edited", key="editor_search_scoped")
+    filtering = bool(text.strip() or statuses or depth != "any")
+
+    if filtering:
+        depth = None if depth == "any" else depth
+        if text.strip():
+            hits = index_for(tree).search(text, statuses or None, within=active_id if scoped else None,
+                                          depth=depth, limit=None)
+            matches = [tree[h.node_id] for h in hits]
+        else:
+            matches = tree.find("", statuses or None, depth)
+        st.subheader(f"Matches ({len(matches)}):")
+        _paged_rows(matches, tree, "filter")
+    else:
+        # Hauptziele (Nodes ohne Parent)
+        st.subheader("Main Goals:")
+        _paged_rows(tree.roots(), tree, "roots")
 
     # 3) Neues Hauptziel hinzufügen
     with st.form("add_root_goal"):
         new_name = st.text_input("Enter new main goal:")
         if st.form_submit_button("Add") and new_name:
-            new_node = {
-                "id": str(uuid4()),
-                "parent": None,
-                "name": new_name,
-                "status": "yellow",
-                "comment": ""
-            }
-            nodes_dict.append(new_node)
-            st.session_state["editor_nodes"] = nodes_dict
-            updated_nodes = [dict_to_node(n) for n in nodes_dict]
-            set_nodes(updated_nodes)
+            with history_for(tree).step(f"Add “{new_name}”"):
+                tree.add(Node(id=str(uuid4()), parent=None, name=new_name, status="yellow", comment=""))
+            _commit(tree)
             st.rerun()
 
     # 4) Aktiver Knoten bearbeiten
@@ -107,65 +208,43 @@ def render():
         st.session_state.active_node_id = None
 
     if st.session_state.active_node_id:
-        current_node = get_node_by_id(st.session_state.active_node_id, nodes_dict)
+        # Lazy geöffnetes Projekt: Unterziele erst jetzt aus der Datenbank holen
+        name = st.session_state.get("project_name")
+        if name and get_store().is_partial(tree) and st.session_state.active_node_id in tree:
+            get_store().expand(name, tree, st.session_state.active_node_id, depth=1)
+        current_node = get_node_by_id(st.session_state.active_node_id, tree)
         if current_node:
             st.markdown("---")
-            st.markdown(f"**Editing:** {current_node['name']}")
+            _breadcrumb(current_node.id, tree)
+            st.markdown(f"**Editing:** {current_node.name}")
 
             with st.form("edit_node"):
-                name = st.text_input("Title", value=current_node.get("name", ""))
-                comment = st.text_area("Comment", value=current_node.get("comment", ""))
+                name = st.text_input("Title", value=current_node.name)
+                comment = st.text_area("Comment", value=current_node.comment)
                 status = st.selectbox("Status", 
                                     ["red", "yellow", "green"],
-                                    index=["red", "yellow", "green"].index(current_node.get("status", "yellow")))
+                                    index=["red", "yellow", "green"].index(current_node.status))
                 
                 if st.form_submit_button("Save"):
-                    current_node["name"] = name
-                    current_node["comment"] = comment
-                    current_node["status"] = status
-                    st.session_state["editor_nodes"] = nodes_dict
-                    updated_nodes = [dict_to_node(n) for n in nodes_dict]
-                    set_nodes(updated_nodes)
+                    with history_for(tree).step(f"Edit “{current_node.name}”"):
+                        tree.update(current_node.id, name=name, comment=comment)
+                        # Nur die Vorfahrenkette neu bewerten statt des ganzen Baums
+                        update_status(tree, current_node.id, status)
+                    _commit(tree)
                     st.success("Goal updated")
                     st.rerun()
 
             # Unterziele anzeigen
             st.subheader("Subgoals:")
-            children = get_children(current_node["id"], nodes_dict)
-            
-            for child in children:
-                col1, col2, col3 = st.columns([5, 1, 1])
-                with col1:
-                    status = child.get("status", "yellow")
-                    farbe = {"red": "red", "yellow": "orange", "green": "green"}.get(status, "gray")
-                    st.markdown(f'<span style="color:{farbe}">●</span> **{child["name"]}**  \n_Status: {status}_', unsafe_allow_html=True)
-                with col2:
-                    if st.button("Edit", key=f"edit_{child['id']}"):
-                        st.session_state.active_node_id = child["id"]
-                        st.rerun()
-                with col3:
-                    if st.button("🗑️", key=f"delete_{child['id']}"):
-                        nodes_dict = [n for n in nodes_dict if n["id"] != child["id"]]
-                        st.session_state["editor_nodes"] = nodes_dict
-                        updated_nodes = [dict_to_node(n) for n in nodes_dict]
-                        set_nodes(updated_nodes)
-                        st.rerun()
+            _paged_rows(get_children(current_node.id, tree), tree, f"children_{current_node.id}")
 
             # Neues Unterziel hinzufügen
             with st.form("add_child"):
                 new_name = st.text_input("Enter new subgoal:")
                 if st.form_submit_button("Add") and new_name:
-                    new_node = {
-                        "id": str(uuid4()),
-                        "parent": current_node["id"],
-                        "name": new_name,
-                        "status": "yellow",
-                        "comment": ""
-                    }
-                    nodes_dict.append(new_node)
-                    st.session_state["editor_nodes"] = nodes_dict
-                    updated_nodes = [dict_to_node(n) for n in nodes_dict]
-                    set_nodes(updated_nodes)
+                    with history_for(tree).step(f"Add “{new_name}”"):
+                        tree.add(Node(id=str(uuid4()), parent=current_node.id, name=new_name, status="yellow", comment=""))
+                    _commit(tree)
                     st.rerun()
 
             # Zurück-Button
@@ -173,12 +252,23 @@ def render():
                 st.session_state.active_node_id = None
                 st.rerun()
 
-    # 5) Download JSON
-    json_data = json.dumps(nodes_dict, ensure_ascii=False, indent=2)
+    # 5) Download JSON (inkrementell aus dem Änderungsprotokoll des Baums)
     st.download_button(
         "💾 Save project as JSON",
-        json_data,
+        export_json(tree),
         file_name="project_network.json",
         mime="application/json",
     )
-    
\ No newline at end of file
+    # Kompakter Binär-Snapshot (siehe data_store.snapshot_bytes) – erst auf
+    # Anforderung serialisiert und nur für die Revision angeboten, für die er gebaut wurde
+    prepared = st.session_state.get("snapshot_download")
+    if prepared is not None and prepared[0]() is tree and prepared[1] == tree.revision:
+        st.download_button(
+            "💾 Save project as snapshot",
+            prepared[2],
+            file_name="project_network.pgsnap",
+            mime="application/octet-stream",
+        )
+    elif st.button("📦 Prepare snapshot"):
+        st.session_state["snapshot_download"] = (weakref.ref(tree), tree.revision, snapshot_bytes(tree))
+        st.rerun()
@@ -1,32 +1,14 @@
 # project_assessment/goals_input.py
 import streamlit as st
-import tempfile, os, json
+import json
 from uuid import uuid4
 
-from project_assessment.helper.tree_builder import build_tree
-from project_assessment.helper.data_store import load_tree
-from project_assessment.helper.data_model import Node, STATUS_CHOICES
-from state_utils import get_nodes, set_nodes, analysis_done
-
-def dict_to_node(node_dict):
-    """Convert dictionary to Node object"""
-    return Node(
-        id=node_dict["id"],
-        name=node_dict["name"],
-        parent=node_dict.get("parent"),
-        status=node_dict.get("status", "yellow"),
-        comment=node_dict.get("comment", "")
-    )
-
-def node_to_dict(node):
-    """Convert Node object to dictionary"""
-    return {
-        "id": node.id,
-        "name": node.name,
-        "parent": node.parent,
-        "status": node.status,
-        "comment": node.comment
-    }
+from project_assessment.helper.tree_builder import project_tree
+from project_assessment.helper.data_store import load_tree, load_snapshot
+from project_assessment.helper.data_model import Node, STATUS_CHOICES, GoalTree, share
+from project_assessment.helper.diff import diff, merge
+from project_assessment.helper.sqlite_store import get_store
+from state_utils import get_nodes, set_nodes, analysis_done, remember_base, get_base
 
 # ── Haupt-Render-Funktion (wird von app.py aufgerufen)
 def render():
@@ -52,34 +34,34 @@ def render():
                 st.warning("Please enter at least one goal.")
             else:
                 goals = [g.strip() for g in goals_input.splitlines() if g.strip()]
-                nodes = build_tree(goals)
-                # Convert to dictionaries before storing
-                nodes_dict = [node_to_dict(n) for n in nodes]
+                # Fork des geteilten Katalogbaums – kopiert wird erst beim Bearbeiten
+                nodes = project_tree(goals)
                 set_nodes(nodes)
-                # Store the dictionary version in session state for the editor
-                st.session_state["editor_nodes"] = nodes_dict
+                remember_base(nodes)
+                st.session_state.pop("project_name", None)   # neues, ungespeichertes Projekt
                 analysis_done(False)          # Analyse-Flag zurücksetzen
                 st.rerun()
                 st.success("Project Network created!")
 
     # -- 2) JSON laden
     with col2:
-        uploaded = st.file_uploader("Load from JSON", type=["json"], key="json_uploader")
+        uploaded = st.file_uploader("Load from JSON", type=["json", "pgsnap"], key="json_uploader")
         if uploaded:
             # only load and rerun once per upload
             if not st.session_state["json_loaded"]:
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".json") as tmp:
-                    tmp.write(uploaded.read())
-                    tmp_path = tmp.name
-                nodes = load_tree(tmp_path)
-                set_nodes(nodes)
-                # Store the dictionary version in session state for the editor
-                st.session_state["editor_nodes"] = [node_to_dict(n) for n in nodes]
-                os.unlink(tmp_path)
-                analysis_done(False)
+                # Direkt aus dem Upload-Puffer lesen, ohne Tempfile
+                if uploaded.name.endswith(".pgsnap"):
+                    nodes = load_snapshot(uploaded.getvalue())
+                else:
+                    nodes = load_tree(uploaded)
                 st.session_state["json_loaded"] = True
+                if get_nodes():
+                    # Es gibt schon einen Baum: erst vergleichen, dann entscheiden
+                    st.session_state["pending_upload"] = GoalTree(nodes)
+                else:
+                    _replace(nodes)
                 st.rerun()
-            else:
+            elif "pending_upload" not in st.session_state:
                 st.success("Project Network loaded from JSON!")
         else:
             # reset flag when uploader is cleared
@@ -91,6 +73,127 @@ def render():
             if not get_nodes():
                 st.warning("Please create or load a Project Network first.")
             else:
+                # Lazy geöffnete Projekte vor der Analyse vollständig laden
+                store, name = get_store(), st.session_state.get("project_name")
+                if name and store.is_partial(get_nodes()):
+                    store.expand(name, get_nodes(), None, depth=None)
                 analysis_done(True)
                 st.success("Analysis started – switch to the *Analysis* tab.")
-                
\ No newline at end of file
+                
+
+    # -- 3b) Hochgeladener Stand trifft auf einen bestehenden Baum
+    if "pending_upload" in st.session_state:
+        render_pending_upload()
+
+    # -- 4) Projekte in der lokalen Datenbank
+    render_projects()
+
+def _replace(nodes):
+    """Loaded tree becomes the current one and the base for later merges"""
+    nodes = share(nodes)
+    set_nodes(nodes)
+    remember_base(nodes)
+    st.session_state.pop("project_name", None)
+    st.session_state.pop("merge_report", None)
+    analysis_done(False)
+
+MAX_DIFF_ROWS = 200
+
+def render_pending_upload():
+    """Diff of the uploaded file against the current tree with Replace / Merge / Discard"""
+    upload, tree = st.session_state["pending_upload"], get_nodes()
+    changes = diff(tree, upload)
+    st.markdown("##### 🔀 Uploaded file vs. current network")
+    if not changes:
+        st.info("The uploaded file matches the current network.")
+    else:
+        counts = changes.counts()
+        st.caption(" · ".join(f"{kind}: {n}" for kind, n in counts.items() if n)
+                   + f" · {changes.visited} of {len(tree)} goals compared")
+        names = lambda nid: (tree.get(nid) or upload.get(nid)).name
+        rows = [{"Change": e.kind, "Goal": names(e.node_id),
+                 "Current": "–" if e.kind == "added" else _describe(e.old, e.kind, tree),
+                 "Uploaded": "–" if e.kind == "removed" else _describe(e.new, e.kind, upload)}
+                for e in changes.edits[:MAX_DIFF_ROWS]]
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+        if len(changes) > MAX_DIFF_ROWS:
+            st.caption(f"First {MAX_DIFF_ROWS} of {len(changes)} changes.")
+    if "merge_base" not in st.session_state:
+        st.caption("No base version is known – Merge keeps both sides and reports every difference as a conflict.")
+
+    col_replace, col_merge, col_discard = st.columns(3)
+    if col_replace.button("Replace", help="Use the uploaded network, dropping the current one"):
+        _replace(st.session_state.pop("pending_upload"))
+        st.rerun()
+    if col_merge.button("Merge", type="primary",
+                        help="Three-way merge against the version loaded last; conflicts keep the current value"):
+        store, name = get_store(), st.session_state.get("project_name")
+        if name and store.is_partial(tree):
+            store.expand(name, tree, None, depth=None)
+        result = merge(get_base(), tree, st.session_state.pop("pending_upload"))
+        set_nodes(result.tree)
+        st.session_state["merge_report"] = result
+        analysis_done(False)
+        st.rerun()
+    if col_discard.button("Discard"):
+        st.session_state.pop("pending_upload")
+        st.rerun()
+
+def _describe(value, kind, tree):
+    """Readable value of one diff column (parent IDs become names)"""
+    if kind in ("moved", "added", "removed"):
+        if value is None:
+            return "(main goal)"
+        parent = tree.get(value)
+        return parent.name if parent is not None else value
+    return "" if value is None else str(value)
+
+def render_projects():
+    """Save the current tree as a named project or open a saved one"""
+    store = get_store()
+    st.markdown("##### 💽 Projects")
+    col_save, col_open = st.columns(2)
+
+    with col_save:
+        name = st.text_input("Project name", value=st.session_state.get("project_name", ""))
+        st.checkbox("Autosave changes", value=True, key="project_autosave",
+                    help="Writes only the changed goals after every edit.")
+        if st.button("Save project"):
+            tree = get_nodes()
+            if not name.strip() or not tree:
+                st.warning("Please enter a name and create a Project Network first.")
+            else:
+                name = name.strip()
+                try:
+                    if store.is_partial(tree):
+                        # Unter neuem Namen lädt autosave das Ausgangsprojekt erst vollständig
+                        store.autosave(name, tree)
+                    else:
+                        store.save(name, tree)
+                except (KeyError, ValueError) as e:
+                    st.error(f"Could not save '{name}': {e}")
+                else:
+                    st.session_state["project_name"] = name
+                    st.success(f"Saved '{name}' (revision {store.revision(name)}).")
+
+    with col_open:
+        projects = {p.name: p for p in store.list_projects()}
+        choice = st.selectbox(
+            "Saved projects", list(projects),
+            format_func=lambda p: f"{p} · {projects[p].nodes} goals · rev {projects[p].revision}",
+        )
+        lazy = st.checkbox("Load deeper levels on demand", value=True,
+                           help="Opens main goals and axes; subgoals are loaded when you edit a goal.")
+        if st.button("Open project", disabled=not projects):
+            # Vollständig geladene Projekte teilen sich Sessions; lazy geöffnete wachsen pro Session
+            tree = store.open(choice, depth=1) if lazy else store.load(choice, shared=True)
+            set_nodes(tree)
+            if lazy:
+                # Ein teilweise geladener Baum taugt nicht als Merge-Basis
+                st.session_state.pop("merge_base", None)
+            else:
+                remember_base(tree)
+            st.session_state["project_name"] = choice
+            st.session_state.active_node_id = None
+            analysis_done(False)
+            st.rerun()
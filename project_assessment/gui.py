@@ -1,16 +1,29 @@
 import streamlit as st
-from project_assessment import editor, goals_input, analysis, visual
+from project_assessment import editor, goals_input, documents, analysis, visual
+from project_assessment.helper import profiler
+from project_assessment.helper.sqlite_store import get_store
+from state_utils import get_nodes
 
 def render_assessment():
    # st.title("01 - 🕸️ Project Goals")
 
     sections = [
         ("📝 Input", goals_input.render),
+        ("📄 Documents", documents.render),
         ("🗂️ Edit", editor.render),
         ("📊 Analysis", analysis.render),
         ("🌳 Visual", visual.render),
     ]
 
-    for label, render_fn in sections:
-        with st.expander(label, expanded=True):
-            render_fn()
+    # Profiler nur, wenn die Diagnose in der Sidebar eingeschaltet ist
+    active = st.session_state.get("profiler") if st.session_state.get("diagnostics_enabled") else None
+    with profiler.activate(active):
+        for label, render_fn in sections:
+            with st.expander(label, expanded=True), profiler.section(label):
+                render_fn()
+
+        # Autosave: nur die seit dem letzten Speichern geänderten Knoten
+        name = st.session_state.get("project_name")
+        if name and st.session_state.get("project_autosave", True) and get_nodes():
+            with profiler.section("💽 Autosave"):
+                get_store().autosave(name, get_nodes())
@@ -2,31 +2,91 @@
 Analysefunktionen:
 - Ampel-Roll-up
 - Kennzahlen
-- Kritische Pfade
+- Kritische Pfade (als Liste, als Wald mit gemeinsamen Präfixen, Top-k)
 """
-from typing import List, Dict
-from project_assessment.helper.data_model import Node
+import heapq
+from collections import Counter
+from typing import Iterable, Dict, List, NamedTuple, Optional, Tuple
+from project_assessment.helper.data_model import Node, as_tree
+from project_assessment.helper.profiler import profiled
+from project_assessment.helper.subtree_index import subtree_index
 
 STATUS_RANK = {"red": 2, "yellow": 1, "green": 0}
+STATUS_BY_RANK = {r: s for s, r in STATUS_RANK.items()}
 
-def aggregate_status(nodes: List[Node]) -> None:
-    """Raise the most critical status of each goal to the root."""
-    lookup = {n.id: n for n in nodes}
-    changed = True
-    while changed:
-        changed = False
-        for n in nodes:
-            if n.parent:
-                parent = lookup[n.parent]
-                if STATUS_RANK[n.status] > STATUS_RANK[parent.status]:
-                    parent.status = n.status
-                    changed = True
-
-def compute_metrics(nodes: List[Node]) -> Dict[str, float]:
-    total = len(nodes)
-    reds = sum(1 for n in nodes if n.status == "red")
-    yellows = sum(1 for n in nodes if n.status == "yellow")
-    greens = sum(1 for n in nodes if n.status == "green")
+@profiled()
+def aggregate_status(nodes: Iterable[Node]) -> List[str]:
+    """
+    Raise the most critical status of each goal to the root.
+
+    Single bottom-up pass in O(n): first every node reports its status to
+    its parent, then the parents are settled level by level from the
+    deepest one upwards, so no edge is looked at twice.
+    Returns the IDs of all nodes whose status was raised.
+    """
+    tree = as_tree(nodes)
+    # 1) Schlimmster Kind-Status je Parent (ein Durchlauf über alle Knoten)
+    worst: Dict[str, int] = {}
+    for n in tree:
+        if n.parent is not None:
+            r = STATUS_RANK[n.status]
+            if r > worst.get(n.parent, -1):
+                worst[n.parent] = r
+
+    # 2) Parents ebenenweise von unten nach oben abschließen
+    levels: Dict[int, List[str]] = {}
+    for pid in worst:
+        if pid in tree:
+            levels.setdefault(tree.depth(pid), []).append(pid)
+
+    changed = []
+    for depth in sorted(levels, reverse=True):
+        for pid in levels[depth]:
+            parent = tree[pid]
+            r = worst[pid]
+            if r > STATUS_RANK[parent.status]:
+                # Über writable: in einem geteilten Baum wird nur dieser Knoten kopiert
+                parent = tree.writable(pid)
+                parent.status = STATUS_BY_RANK[r]
+                changed.append(pid)
+            else:
+                r = STATUS_RANK[parent.status]
+            if parent.parent is not None and r > worst.get(parent.parent, -1):
+                worst[parent.parent] = r
+    if changed:
+        tree.touch(*changed)
+    return changed
+
+@profiled()
+def update_status(nodes: Iterable[Node], node_id: str, status: str) -> List[str]:
+    """
+    Incremental roll-up after a single status change.
+
+    Sets ``status`` on ``node_id`` and only walks its ancestor chain, stopping
+    as soon as an ancestor is already at least as critical. Like
+    :func:`aggregate_status` a roll-up never lowers a parent status.
+    Returns the IDs of all nodes whose status actually changed.
+    """
+    if status not in STATUS_RANK:
+        raise ValueError(f"Status must be one of {tuple(STATUS_RANK)}, got {status}")
+    tree = as_tree(nodes)
+    if tree[node_id].status == status:
+        return []
+    tree.writable(node_id).status = status
+    changed = [node_id]
+    for parent in tree.ancestors(node_id):
+        if STATUS_RANK[status] <= STATUS_RANK[parent.status]:
+            break
+        tree.writable(parent.id).status = status
+        changed.append(parent.id)
+    tree.touch(*changed)
+    return changed
+
+@profiled()
+def compute_metrics(nodes: Iterable[Node]) -> Dict[str, float]:
+    counts = Counter(n.status for n in nodes)
+    total = sum(counts.values())
+    reds, yellows, greens = counts["red"], counts["yellow"], counts["green"]
     return {
         "total": total,
         "red": reds,
@@ -37,16 +97,95 @@ def compute_metrics(nodes: List[Node]) -> Dict[str, float]:
         "green_pct": greens / total if total else 0,
     }
 
-def critical_paths(nodes: List[Node]):
+def path_names(tree, node_id: str) -> Tuple[str, ...]:
+    """
+    Names from the main goal down to ``node_id``.
+
+    Paths are memoised per tree revision and built from the parent's path,
+    so every node's path is assembled only once.
+    """
+    memo = tree.memo("path_names", lambda t: {})
+    chain = []
+    cur = node_id
+    while cur is not None and cur not in memo:
+        chain.append(cur)
+        parent = tree[cur].parent
+        cur = parent if parent in tree else None
+    prefix = memo[cur] if cur is not None else ()
+    for nid in reversed(chain):
+        prefix = prefix + (tree[nid].name,)
+        memo[nid] = prefix
+    return prefix
+
+@profiled()
+def critical_paths(nodes: Iterable[Node]):
     """Returns paths (list of names) to all red nodes."""
-    lookup = {n.id: n for n in nodes}
-    paths = []
-    for n in nodes:
-        if n.status == "red":
-            path = []
-            cur = n
-            while cur:
-                path.append(cur.name)
-                cur = lookup.get(cur.parent)
-            paths.append(list(reversed(path)))
-    return paths
+    tree = as_tree(nodes)
+    return [list(path_names(tree, n.id)) for n in tree if n.status == "red"]
+
+
+class PathNode(NamedTuple):
+    """One node of the critical-path forest."""
+    id: str
+    name: str
+    status: str
+    red: int                      # rote Knoten im Teilbaum (inklusive)
+    size: int                     # Knoten im Teilbaum (inklusive)
+    children: Tuple["PathNode", ...]
+
+    @property
+    def density(self) -> float:
+        return self.red / self.size if self.size else 0.0
+
+
+@profiled()
+def critical_path_forest(nodes: Iterable[Node]) -> Tuple[PathNode, ...]:
+    """
+    All paths to red nodes as a forest: a shared prefix appears once, with
+    the red branches below it as children (in tree order). Every node of
+    the tree is visited at most once.
+    """
+    tree = as_tree(nodes)
+    index = subtree_index(tree)
+
+    # 1) Rote Knoten und ihre Vorfahren markieren – Aufstieg endet am ersten markierten
+    marked = set()
+    for n in tree:
+        if n.status != "red":
+            continue
+        cur = n
+        while cur is not None and cur.id not in marked:
+            marked.add(cur.id)
+            cur = tree.get(cur.parent)
+
+    # 2) Markierte Knoten in Pre-Order, dann von unten nach oben zusammensetzen
+    order = sorted(marked, key=index.position)
+    built: Dict[str, PathNode] = {}
+    for nid in reversed(order):
+        node = tree[nid]
+        children = tuple(built.pop(c) for c in tree.child_ids(nid) if c in built)
+        counts = index.counts(nid)
+        built[nid] = PathNode(nid, node.name, node.status, counts["red"], index.size(nid), children)
+    return tuple(built[nid] for nid in order if nid in built)
+
+
+@profiled()
+def top_critical(nodes: Iterable[Node], k: int = 10, min_size: int = 2) -> List[PathNode]:
+    """
+    The ``k`` subtrees with the highest share of red nodes (ties: more red
+    nodes first). Subtrees smaller than ``min_size`` are ignored, so single
+    red leaves do not crowd out whole branches. Children are not expanded.
+    """
+    tree = as_tree(nodes)
+    index = subtree_index(tree)
+    candidates = []
+    for n in tree:
+        size = index.size(n.id)
+        if size < min_size:
+            continue
+        red = index.counts(n.id)["red"]
+        if red:
+            candidates.append((red / size, red, n.id))
+    top = heapq.nlargest(k, candidates)
+    return [PathNode(nid, tree[nid].name, tree[nid].status, red, index.size(nid), ())
+            for _, red, nid in top]
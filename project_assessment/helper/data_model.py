@@ -1,10 +1,18 @@
+import hashlib
+import threading
+import weakref
+from collections import deque
+from collections.abc import MutableMapping
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Union
 from uuid import uuid4
 
 STATUS_CHOICES = ("red", "yellow", "green")
+# Kanonische Status-Objekte: jeder Node verweist auf einen dieser drei Strings
+_STATUS_INTERN = {s: s for s in STATUS_CHOICES}
 
-@dataclass
+@dataclass(slots=True)
 class Node:
     id: str = field(default_factory=lambda: str(uuid4()))
     name: str = ""
@@ -13,8 +21,10 @@ class Node:
     comment: str = ""
 
     def __post_init__(self):
-        if self.status not in STATUS_CHOICES:
+        status = _STATUS_INTERN.get(self.status)
+        if status is None:
             raise ValueError(f"Status must be one of {STATUS_CHOICES}, got {self.status}")
+        self.status = status
 
     def to_dict(self):
         return {
@@ -27,5 +37,810 @@ class Node:
 
     @classmethod
     def from_dict(cls, data):
-        return cls(**data)
-    
\ No newline at end of file
+        return dict_to_node(data)
+
+
+def dict_to_node(data: Union[Mapping[str, Any], "Node"]) -> "Node":
+    """
+    Canonical conversion of an exported dict (or a Node) into a Node.
+
+    Missing optional keys get their defaults, unknown keys are ignored.
+    """
+    if isinstance(data, Node):
+        return data
+    return Node(
+        id=data["id"],
+        name=data.get("name", ""),
+        parent=data.get("parent"),
+        status=data.get("status") or "yellow",
+        comment=data.get("comment") or "",
+    )
+
+
+class NodeView:
+    """Node-like view on one row of a :class:`NodeStore`."""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "NodeStore", row: int):
+        self._store = store
+        self._row = row
+
+    id = property(lambda self: self._store.ids[self._row])
+    name = property(lambda self: self._store.names[self._row],
+                    lambda self, v: self._store.names.__setitem__(self._row, v))
+    parent = property(lambda self: self._store.parents[self._row],
+                      lambda self, v: self._store.parents.__setitem__(self._row, v))
+    comment = property(lambda self: self._store.comments[self._row],
+                       lambda self, v: self._store.comments.__setitem__(self._row, v))
+
+    @property
+    def status(self) -> str:
+        return STATUS_CHOICES[self._store.statuses[self._row]]
+
+    @status.setter
+    def status(self, value: str) -> None:
+        self._store.statuses[self._row] = NodeStore.status_code(value)
+
+    def to_dict(self):
+        return self._store.row_dict(self._row)
+
+    def to_node(self) -> Node:
+        return Node(**self.to_dict())
+
+    def __eq__(self, other):
+        if isinstance(other, (Node, NodeView)):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"NodeView({self.to_dict()!r})"
+
+
+class NodeStore:
+    """
+    Struct-of-arrays storage for very large trees.
+
+    Every field is one column (status as a byte per node), so no per-node
+    object exists until a :class:`NodeView` is requested. Views read and
+    write through to the columns.
+    """
+
+    __slots__ = ("ids", "names", "parents", "statuses", "comments", "_rows")
+
+    def __init__(self, nodes: Iterable[Union[Node, Mapping[str, Any]]] = ()):
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.parents: List[Optional[str]] = []
+        self.statuses = bytearray()
+        self.comments: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self.extend(nodes)
+
+    @staticmethod
+    def status_code(status: str) -> int:
+        try:
+            return STATUS_CHOICES.index(status)
+        except ValueError:
+            raise ValueError(f"Status must be one of {STATUS_CHOICES}, got {status}") from None
+
+    def append(self, id: Optional[str] = None, name: str = "", parent: Optional[str] = None,
+               status: str = "yellow", comment: str = "") -> NodeView:
+        node_id = id if id is not None else str(uuid4())
+        if node_id in self._rows:
+            raise ValueError(f"Duplicate node id: {node_id}")
+        row = len(self.ids)
+        self.statuses.append(self.status_code(status))
+        self.ids.append(node_id)
+        self.names.append(name)
+        self.parents.append(parent)
+        self.comments.append(comment)
+        self._rows[node_id] = row
+        return NodeView(self, row)
+
+    def extend(self, nodes: Iterable[Union[Node, Mapping[str, Any]]]) -> None:
+        """Bulk append of Nodes or exported dicts (no NodeView per row)."""
+        codes = {s: i for i, s in enumerate(STATUS_CHOICES)}
+        ids, names, parents, statuses, comments, rows = (
+            self.ids, self.names, self.parents, self.statuses, self.comments, self._rows)
+        for n in nodes:
+            if isinstance(n, Mapping):
+                node_id, status = n["id"], n.get("status") or "yellow"
+                name, parent, comment = n.get("name", ""), n.get("parent"), n.get("comment") or ""
+            else:
+                node_id, name, parent, status, comment = n.id, n.name, n.parent, n.status, n.comment
+            if node_id in rows:
+                raise ValueError(f"Duplicate node id: {node_id}")
+            code = codes.get(status)
+            if code is None:
+                raise ValueError(f"Status must be one of {STATUS_CHOICES}, got {status}")
+            rows[node_id] = len(ids)
+            ids.append(node_id)
+            names.append(name)
+            parents.append(parent)
+            statuses.append(code)
+            comments.append(comment)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[NodeView]:
+        return (NodeView(self, r) for r in range(len(self.ids)))
+
+    def __getitem__(self, key: Union[int, str]) -> NodeView:
+        row = self._rows[key] if isinstance(key, str) else range(len(self.ids))[key]
+        return NodeView(self, row)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._rows
+
+    def row_dict(self, row: int) -> dict:
+        return {
+            "id": self.ids[row],
+            "name": self.names[row],
+            "parent": self.parents[row],
+            "status": STATUS_CHOICES[self.statuses[row]],
+            "comment": self.comments[row],
+        }
+
+    def to_dicts(self) -> List[dict]:
+        return [self.row_dict(r) for r in range(len(self.ids))]
+
+    def to_nodes(self) -> List[Node]:
+        return [Node(**self.row_dict(r)) for r in range(len(self.ids))]
+
+
+# Maximale Länge des Änderungsprotokolls eines GoalTree
+CHANGE_LOG_SIZE = 10_000
+
+
+class Change(NamedTuple):
+    revision: int
+    op: str          # "add" | "update" | "remove" | "move"
+    node_id: str
+
+
+class NodeImage(NamedTuple):
+    """Fields of one node at a point in time (the ID is the key it is stored under)."""
+    name: str
+    status: str
+    comment: str
+    parent: Optional[str]
+
+
+class Journal:
+    """
+    Before-images collected since the journal was last taken: node ID →
+    image (``None`` = did not exist) and parent ID → child order.
+    Only the first change of a node or child list is recorded.
+    """
+
+    __slots__ = ("nodes", "children")
+
+    def __init__(self):
+        self.nodes: Dict[str, Optional[NodeImage]] = {}
+        self.children: Dict[Optional[str], tuple] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.nodes or self.children)
+
+
+class _Overlay(MutableMapping):
+    """
+    Writable view over a mapping that must not change (the tables of a
+    frozen base tree): own entries win, tombstones hide base entries.
+    Base keys keep their position; keys new to the view follow in
+    insertion order. Each write costs O(1) – nothing is copied up front.
+    """
+
+    __slots__ = ("base", "own", "dead", "_extra")
+
+    def __init__(self, base: Mapping):
+        self.base = base
+        self.own: dict = {}
+        self.dead: set = set()
+        self._extra = 0          # Anzahl eigener Schlüssel, die die Basis nicht hat
+
+    def __getitem__(self, key):
+        own = self.own
+        if key in own:
+            return own[key]
+        if key in self.dead:
+            raise KeyError(key)
+        return self.base[key]
+
+    def get(self, key, default=None):
+        own = self.own
+        if key in own:
+            return own[key]
+        if key in self.dead:
+            return default
+        return self.base.get(key, default)
+
+    def __contains__(self, key) -> bool:
+        return key in self.own or (key not in self.dead and key in self.base)
+
+    def __setitem__(self, key, value) -> None:
+        if key not in self.own and key not in self.base:
+            self._extra += 1
+        self.own[key] = value
+        self.dead.discard(key)
+
+    def __delitem__(self, key) -> None:
+        found = False
+        if key in self.own:
+            del self.own[key]
+            found = True
+            if key not in self.base:
+                self._extra -= 1
+        if key in self.base and key not in self.dead:
+            self.dead.add(key)
+            found = True
+        if not found:
+            raise KeyError(key)
+
+    def __iter__(self):
+        base, own, dead = self.base, self.own, self.dead
+        for key in base:
+            if key not in dead:
+                yield key
+        for key in own:
+            if key not in base:
+                yield key
+
+    def __len__(self) -> int:
+        return len(self.base) - len(self.dead) + self._extra
+
+    def items(self):
+        base, own, dead = self.base, self.own, self.dead
+        for key, value in base.items():
+            if key not in dead:
+                yield key, own.get(key, value)
+        for key, value in own.items():
+            if key not in base:
+                yield key, value
+
+    def values(self):
+        return (value for _, value in self.items())
+
+    @property
+    def changed(self) -> int:
+        """Entries that differ from the base (own plus tombstones)."""
+        return len(self.own) + len(self.dead)
+
+
+class GoalTree:
+    """
+    Indexed container for the goal network.
+
+    Holds the nodes in insertion order and keeps three indexes up to date
+    on every structural change:
+
+    - id → node
+    - parent id → ordered child ids (``None`` = main goals)
+    - id → depth (main goals have depth 0)
+    - depth → ids on that level
+
+    Lookups are O(1); ``add`` is O(1) (plus the size of an already loaded
+    orphan subtree that gets attached), ``remove`` and ``move`` are
+    O(size of the affected subtree).
+
+    Every mutation increments ``revision``; derived data (content hash,
+    analysis results, …) is cached per revision via :meth:`memo`. Field
+    changes should therefore go through :meth:`update` (or be followed by
+    :meth:`touch` with the changed IDs), re-parenting must go through
+    :meth:`move`.
+
+    Mutations after construction are recorded in a bounded change log;
+    consumers keep their own revision and replay :meth:`changes_since`
+    instead of re-reading the whole tree.
+
+    A frozen tree can be shared between sessions and :meth:`fork`-ed: the
+    fork reads through overlays on the base tables and only stores the
+    entries it changes (nodes one by one, child lists per parent). Once a
+    fork has changed a large part of the tree it flattens its tables.
+    Code that changes node fields itself must therefore get the node from
+    :meth:`writable` instead of ``tree[node_id]``.
+
+    With :meth:`start_journal` every mutation additionally keeps the
+    before-image of the nodes and child lists it touches (see history.py).
+    """
+
+    def __init__(self, nodes: Iterable[Node] = ()):
+        self._nodes: Dict[str, Node] = {}
+        self._children: Dict[Optional[str], Dict[str, None]] = {}
+        self._depth: Dict[str, int] = {}
+        self._levels: Dict[int, Dict[str, None]] = {}
+        # Status → IDs; nach direkten Feldänderungen über touch(*ids) nachgeführt
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        self._memo: Dict[str, tuple] = {}
+        self._log: Deque[Change] = deque()
+        self._log_floor = 0
+        self.revision = 0
+        self._base: Optional["GoalTree"] = None
+        self._frozen = False
+        self._journal: Optional[Journal] = None
+        for n in nodes:
+            self.add(n)
+        # Der Aufbau selbst wird nicht protokolliert
+        self._log.clear()
+        self._log_floor = self.revision
+
+    # ── Container-Protokoll
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __iter__(self) -> Iterator[Node]:
+        return iter(list(self._nodes.values()))
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._nodes
+
+    def __getitem__(self, node_id: str) -> Node:
+        return self._nodes[node_id]
+
+    def __bool__(self) -> bool:
+        return bool(self._nodes)
+
+    def __repr__(self) -> str:
+        return f"GoalTree({len(self)} nodes)"
+
+    # ── Lookups
+    def get(self, node_id: Optional[str]) -> Optional[Node]:
+        return self._nodes.get(node_id) if node_id is not None else None
+
+    def children(self, node_id: Optional[str]) -> List[Node]:
+        """Direct children of ``node_id`` (``None`` returns the main goals)."""
+        return [self._nodes[c] for c in self._children.get(node_id, ())]
+
+    def child_ids(self, node_id: Optional[str]) -> List[str]:
+        return list(self._children.get(node_id, ()))
+
+    def has_children(self, node_id: str) -> bool:
+        return bool(self._children.get(node_id))
+
+    def roots(self) -> List[Node]:
+        """Main goals (nodes without parent)."""
+        return self.children(None)
+
+    def top_nodes(self) -> List[Node]:
+        """Main goals followed by nodes whose parent is not part of the tree."""
+        return [self._nodes[c] for top in self._top_level() for c in self._children.get(top, ())]
+
+    def parent_ids(self) -> set:
+        """IDs of all nodes that have at least one child."""
+        return {p for p, ch in self._children.items() if ch and p in self._nodes}
+
+    def depth(self, node_id: str) -> int:
+        return self._depth[node_id]
+
+    def max_depth(self) -> int:
+        return max(self._levels, default=0)
+
+    def at_depth(self, depth: int) -> List[Node]:
+        """All nodes on one level, in insertion order."""
+        return [self._nodes[i] for i in self._levels.get(depth, ())]
+
+    def find(self, text: str = "", statuses: Optional[Iterable[str]] = None,
+             depth: Optional[int] = None) -> List[Node]:
+        """
+        Nodes whose name contains ``text`` (case-insensitive), optionally
+        restricted to ``statuses`` and one ``depth``.
+
+        The status and depth indexes narrow the candidates first: without a
+        depth the status index alone yields them (grouped by status),
+        otherwise the smaller of the two is scanned. Lower-cased names are
+        memoised per revision, so repeated filtering does not re-fold them.
+        """
+        ids: Iterable[str] = self._levels.get(depth, {}) if depth is not None else self._nodes
+        if statuses is not None:
+            buckets = [self._by_status.get(s, {}) for s in dict.fromkeys(statuses)]
+            if depth is None:
+                ids = [i for b in buckets for i in b]
+            elif sum(map(len, buckets)) <= len(ids):
+                level = ids
+                ids = [i for b in buckets for i in b if i in level]
+            else:
+                wanted = set(statuses)
+                ids = [i for i in ids if self._nodes[i].status in wanted]
+        needle = text.strip().casefold()
+        if needle:
+            folded = self.memo("folded_names", _folded_names)
+            ids = [i for i in ids if needle in folded[i]]
+        return [self._nodes[i] for i in ids]
+
+    def ancestors(self, node_id: str) -> Iterator[Node]:
+        """Yields the parent chain of ``node_id`` up to its main goal."""
+        cur = self._nodes.get(node_id)
+        while cur is not None:
+            cur = self._nodes.get(cur.parent) if cur.parent is not None else None
+            if cur is not None:
+                yield cur
+
+    def path(self, node_id: str) -> List[Node]:
+        """Nodes from the main goal down to ``node_id`` (inclusive)."""
+        chain = [self._nodes[node_id], *self.ancestors(node_id)]
+        chain.reverse()
+        return chain
+
+    def walk(self, node_id: Optional[str] = None) -> Iterator[Node]:
+        """
+        Pre-order traversal (iterative, no recursion limit).
+
+        Without ``node_id`` the whole tree is traversed, including subtrees
+        whose parent is not part of the tree (e.g. partially loaded JSON).
+        """
+        if node_id is None:
+            stack = [c for top in reversed(self._top_level()) for c in reversed(self._children.get(top, ()))]
+        else:
+            stack = [node_id]
+        while stack:
+            nid = stack.pop()
+            yield self._nodes[nid]
+            stack.extend(reversed(self._children.get(nid, ())))
+
+    def subtree_ids(self, node_id: str) -> List[str]:
+        return [n.id for n in self.walk(node_id)]
+
+    def _top_level(self) -> List[Optional[str]]:
+        """Parent keys whose children start a traversal: ``None`` plus unknown parents."""
+        tops: List[Optional[str]] = [None]
+        tops.extend(p for p in self._children if p is not None and p not in self._nodes)
+        return tops
+
+    # ── Revisionen und abgeleitete Daten
+    def touch(self, *node_ids: str) -> int:
+        """
+        Marks the tree as changed after direct edits of node fields.
+        Without ``node_ids`` the change cannot be replayed and consumers of
+        the change log have to resynchronise completely.
+        """
+        self._check_mutable()
+        self.revision += 1
+        if node_ids:
+            for nid in node_ids:
+                self._index_status(nid)
+                self._record("update", nid)
+        else:
+            self._by_status = {}
+            for n in self._nodes.values():
+                self._by_status.setdefault(n.status, {})[n.id] = None
+            self._log.clear()
+            self._log_floor = self.revision
+        return self.revision
+
+    def changes_since(self, revision: int) -> Optional[List[Change]]:
+        """
+        Changes after ``revision`` in order, or ``None`` if the log no longer
+        reaches back that far (the caller must then rebuild from the tree).
+        """
+        if revision < self._log_floor or revision > self.revision:
+            return None
+        if revision == self.revision:
+            return []
+        out = []
+        for change in reversed(self._log):
+            if change.revision <= revision:
+                break
+            out.append(change)
+        out.reverse()
+        return out
+
+    def _record(self, op: str, node_id: str) -> None:
+        if len(self._log) >= CHANGE_LOG_SIZE:
+            self._log_floor = self._log.popleft().revision
+        self._log.append(Change(self.revision, op, node_id))
+
+    def memo(self, key: str, compute):
+        """
+        Returns ``compute(self)``, cached until the next revision.
+        If ``compute`` itself changes the tree, the result is stored for the
+        revision it leaves behind.
+        """
+        hit = self._memo.get(key)
+        if hit is not None and hit[0] == self.revision:
+            return hit[1]
+        value = compute(self)
+        self._memo[key] = (self.revision, value)
+        return value
+
+    def content_hash(self) -> str:
+        """SHA-1 over all node fields in insertion order (memoised per revision)."""
+        return self.memo("content_hash", _content_hash)
+
+    # ── Teilen (Copy-on-write)
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    def freeze(self) -> "GoalTree":
+        """Makes the tree read-only (all mutations raise) so it can be shared and forked."""
+        self._frozen = True
+        return self
+
+    def fork(self) -> "GoalTree":
+        """
+        Copy-on-write copy of this frozen tree in O(1). Memoised results of
+        the current revision are carried over.
+        """
+        if not self._frozen:
+            raise ValueError("Only frozen trees can be forked; call freeze() first")
+        child = GoalTree()
+        child._nodes, child._children = _Overlay(self._nodes), _Overlay(self._children)
+        child._depth, child._levels = _Overlay(self._depth), _Overlay(self._levels)
+        child._by_status = _Overlay(self._by_status)
+        child._base = self
+        child._memo = dict(self._memo)
+        child.revision = child._log_floor = self.revision
+        return child
+
+    @property
+    def shared_nodes(self) -> int:
+        """Nodes still shared with the base tree (0 for trees that are not forks)."""
+        nodes = self._nodes
+        return len(nodes) - len(nodes.own) if isinstance(nodes, _Overlay) else 0
+
+    def writable(self, node_id: str) -> Node:
+        """
+        The node for in-place field changes; in a fork a shared node is
+        copied first. Follow the change with :meth:`touch`.
+        """
+        self._check_mutable()
+        self._remember(node_id)
+        nodes = self._nodes
+        if not isinstance(nodes, _Overlay) or node_id in nodes.own:
+            return nodes[node_id]
+        n = nodes[node_id]
+        node = nodes[node_id] = Node(n.id, n.name, n.parent, n.status, n.comment)
+        self._compact()
+        return node
+
+    # ── Journal (Vorher-Abbilder für Undo)
+    def start_journal(self) -> None:
+        if self._journal is None:
+            self._journal = Journal()
+
+    def take_journal(self) -> Journal:
+        """Before-images since the last call; the journal keeps running."""
+        journal = self._journal if self._journal is not None else Journal()
+        if self._journal is not None:
+            self._journal = Journal()
+        return journal
+
+    @contextmanager
+    def journal_paused(self):
+        """Mutations inside are not journaled (e.g. loading more nodes is no edit)."""
+        journal, self._journal = self._journal, None
+        try:
+            yield
+        finally:
+            self._journal = journal
+
+    def image(self, node_id: str) -> Optional[NodeImage]:
+        node = self._nodes.get(node_id)
+        return None if node is None else NodeImage(node.name, node.status, node.comment, node.parent)
+
+    def _remember(self, node_id: str) -> None:
+        if self._journal is not None and node_id not in self._journal.nodes:
+            self._journal.nodes[node_id] = self.image(node_id)
+
+    def _remember_children(self, parent_id: Optional[str]) -> None:
+        if self._journal is not None and parent_id not in self._journal.children:
+            self._journal.children[parent_id] = tuple(self._children.get(parent_id, ()))
+
+    def _check_mutable(self) -> None:
+        if self._frozen:
+            raise ValueError("This GoalTree is frozen; fork() it to make changes")
+
+    @staticmethod
+    def _inner(table, key, copy=dict) -> dict:
+        """``table[key]`` for changes; in a fork the base entry is copied (``copy``) first."""
+        inner = table.get(key)
+        if inner is None:
+            inner = table[key] = {}
+        elif isinstance(table, _Overlay) and key not in table.own:
+            inner = table[key] = copy(inner)
+        return inner
+
+    def _compact(self) -> None:
+        """Flattens a fork's overlays once it has changed half of the tree (amortised O(1) per edit)."""
+        nodes, depth = self._nodes, self._depth
+        if not isinstance(nodes, _Overlay) or nodes.changed + depth.changed <= len(nodes.base):
+            return
+        self._nodes = dict(nodes.items())
+        self._depth = dict(depth.items())
+        self._children = {p: dict(ch) for p, ch in self._children.items()}
+        self._levels = {d: dict(ids.items()) for d, ids in self._levels.items()}
+        self._by_status = {s: dict(ids.items()) for s, ids in self._by_status.items()}
+
+    def _index_status(self, node_id: str) -> None:
+        """Moves ``node_id`` to the bucket of its current status (drops it if the node is gone)."""
+        node = self._nodes.get(node_id)
+        status = node.status if node is not None else None
+        if status is not None and node_id in self._by_status.get(status, ()):
+            return
+        for s, ids in list(self._by_status.items()):
+            if s != status and node_id in ids:
+                ids = self._inner(self._by_status, s, _Overlay)
+                del ids[node_id]
+                if not ids:
+                    del self._by_status[s]
+        if status is not None:
+            self._inner(self._by_status, status, _Overlay)[node_id] = None
+
+    # ── Mutationen
+    def update(self, node_id: str, **fields) -> Node:
+        """Changes ``name``, ``status`` and/or ``comment`` of a node."""
+        self._check_mutable()
+        node = self._nodes[node_id]
+        unknown = set(fields) - {"name", "status", "comment"}
+        if unknown:
+            raise ValueError(f"Cannot update {sorted(unknown)}; use move() to re-parent")
+        if "status" in fields and fields["status"] not in _STATUS_INTERN:
+            raise ValueError(f"Status must be one of {STATUS_CHOICES}, got {fields['status']}")
+        node = self.writable(node_id)
+        for key, value in fields.items():
+            setattr(node, key, _STATUS_INTERN[value] if key == "status" else value)
+        if "status" in fields:
+            self._index_status(node_id)
+        self.revision += 1
+        self._record("update", node_id)
+        return node
+
+    def add(self, node: Node) -> Node:
+        """Inserts ``node``; its parent does not have to be present yet."""
+        if node.id in self._nodes:
+            raise ValueError(f"Duplicate node id: {node.id}")
+        self._check_mutable()
+        self._remember(node.id)
+        self._remember_children(node.parent)
+        self.revision += 1
+        self._nodes[node.id] = node
+        if node.parent is not None and node.parent in self._nodes:
+            # Verweis auf den ID-String des Parents statt einer eigenen Kopie
+            node.parent = self._nodes[node.parent].id
+        self._inner(self._children, node.parent)[node.id] = None
+        parent_depth = self._depth.get(node.parent) if node.parent is not None else None
+        self._set_depth(node.id, 0 if parent_depth is None else parent_depth + 1)
+        self._inner(self._by_status, node.status, _Overlay)[node.id] = None
+        # Kinder, die vor ihrem Parent geladen wurden, bekommen jetzt die richtige Tiefe
+        if self._children.get(node.id):
+            self._refresh_depth(node.id)
+        self._record("add", node.id)
+        self._compact()
+        return node
+
+    def remove(self, node_id: str) -> List[Node]:
+        """Removes ``node_id`` together with its whole subtree and returns the removed nodes."""
+        self._check_mutable()
+        node = self._nodes[node_id]
+        removed = list(self.walk(node_id))
+        self._remember_children(node.parent)
+        for n in removed:
+            self._remember(n.id)
+            self._remember_children(n.id)
+        self.revision += 1
+        if node.parent in self._children:
+            siblings = self._inner(self._children, node.parent)
+            siblings.pop(node_id, None)
+            if not siblings and node.parent is not None:
+                del self._children[node.parent]
+        for n in removed:
+            del self._nodes[n.id]
+            self._drop_level(n.id, self._depth.pop(n.id))
+            self._index_status(n.id)
+            self._children.pop(n.id, None)
+            self._record("remove", n.id)
+        self._compact()
+        return removed
+
+    def move(self, node_id: str, new_parent: Optional[str]) -> None:
+        """Re-parents ``node_id`` (with its subtree) below ``new_parent``."""
+        self._check_mutable()
+        node = self._nodes[node_id]
+        if new_parent is not None:
+            if new_parent not in self._nodes:
+                raise KeyError(new_parent)
+            if new_parent == node_id or any(a.id == node_id for a in self.ancestors(new_parent)):
+                raise ValueError("A node cannot be moved below its own subtree.")
+        node = self.writable(node_id)
+        self._remember_children(node.parent)
+        self._remember_children(new_parent)
+        self.revision += 1
+        if node.parent in self._children:
+            siblings = self._inner(self._children, node.parent)
+            siblings.pop(node_id, None)
+            if not siblings and node.parent is not None:
+                del self._children[node.parent]
+        node.parent = new_parent
+        self._inner(self._children, new_parent)[node_id] = None
+        self._set_depth(node_id, 0 if new_parent is None else self._depth[new_parent] + 1)
+        self._refresh_depth(node_id)
+        self._record("move", node_id)
+
+    def reorder(self, parent_id: Optional[str], child_ids: Iterable[str]) -> None:
+        """
+        Puts the listed children of ``parent_id`` first, in the given order;
+        the remaining children follow in their current order.
+        """
+        self._check_mutable()
+        current = self._children.get(parent_id)
+        if not current:
+            return
+        wanted = [c for c in dict.fromkeys(child_ids) if c in current]
+        first = set(wanted)
+        order = wanted + [c for c in current if c not in first]
+        if order == list(current):
+            return
+        self._remember_children(parent_id)
+        self.revision += 1
+        self._children[parent_id] = dict.fromkeys(order)
+        # Neue Reihenfolge gilt im Änderungsprotokoll als Verschiebung
+        for c in order:
+            self._record("move", c)
+
+    def _refresh_depth(self, node_id: str) -> None:
+        stack = [node_id]
+        while stack:
+            nid = stack.pop()
+            d = self._depth[nid] + 1
+            for c in self._children.get(nid, ()):
+                self._set_depth(c, d)
+                stack.append(c)
+
+    def _set_depth(self, node_id: str, depth: int) -> None:
+        old = self._depth.get(node_id)
+        if old == depth:
+            return
+        if old is not None:
+            self._drop_level(node_id, old)
+        self._depth[node_id] = depth
+        self._inner(self._levels, depth, _Overlay)[node_id] = None
+
+    def _drop_level(self, node_id: str, depth: int) -> None:
+        level = self._inner(self._levels, depth, _Overlay)
+        del level[node_id]
+        if not level:
+            del self._levels[depth]
+
+    # ── Export
+    def to_list(self) -> List[Node]:
+        return list(self._nodes.values())
+
+    def to_dicts(self) -> List[dict]:
+        return [n.to_dict() for n in self._nodes.values()]
+
+
+def _content_hash(tree: GoalTree) -> str:
+    h = hashlib.sha1()
+    for n in tree:
+        h.update(f"{n.id}\x1f{n.parent}\x1f{n.status}\x1f{n.name}\x1f{n.comment}\x1e".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _folded_names(tree: GoalTree) -> Dict[str, str]:
+    return {n.id: n.name.casefold() for n in tree}
+
+
+def as_tree(nodes: Iterable[Node]) -> GoalTree:
+    """Returns ``nodes`` unchanged if it already is a GoalTree, otherwise indexes it."""
+    return nodes if isinstance(nodes, GoalTree) else GoalTree(nodes)
+
+
+# Prozessweit geteilte, eingefrorene Bäume nach Inhalt (leben, solange ein Fork sie nutzt)
+_SHARED: "weakref.WeakValueDictionary[str, GoalTree]" = weakref.WeakValueDictionary()
+_SHARED_LOCK = threading.Lock()
+
+def share(nodes: Iterable[Node]) -> GoalTree:
+    """
+    Copy-on-write fork of the process-wide frozen tree with the same
+    content as ``nodes``. The first caller's tree becomes that shared base,
+    so ``nodes`` must not be changed afterwards – work on the returned fork.
+    """
+    tree = as_tree(nodes)
+    key = tree.content_hash()
+    with _SHARED_LOCK:
+        base = _SHARED.get(key)
+        if base is None:
+            base = _SHARED[key] = tree.freeze()
+    return base.fork()
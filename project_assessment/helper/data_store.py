@@ -1,17 +1,499 @@
+import codecs
+import io
 import json
-from typing import List
+import mmap
+import struct
+import sys
+import weakref
+from array import array
+from typing import BinaryIO, Dict, Iterable, Iterator, List, TextIO, Union
 from pathlib import Path
-from project_assessment.helper.data_model import Node
+from project_assessment.helper.data_model import GoalTree, Node, STATUS_CHOICES
+from project_assessment.helper.profiler import profiled
 
-def save_tree(nodes: List[Node], path: str | Path) -> None:
-    """Save the tree to a JSON file."""
+# Lese-Blockgröße für das Streaming (Zeichen bzw. Bytes)
+CHUNK_SIZE = 1 << 16
+
+Source = Union[str, Path, BinaryIO, TextIO]
+
+_WS = " \t\r\n"
+_decoder = json.JSONDecoder()
+
+
+def _text_chunks(fp: Union[BinaryIO, TextIO], chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Reads ``fp`` in blocks and yields text, decoding bytes incrementally (UTF-8)."""
+    decoder = None
+    while True:
+        block = fp.read(chunk_size)
+        if not block:
+            break
+        if isinstance(block, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder("utf-8-sig")()
+            block = decoder.decode(block)
+        if block:
+            yield block
+    if decoder is not None:
+        rest = decoder.decode(b"", final=True)
+        if rest:
+            yield rest
+
+
+def _iter_array(fp: Union[BinaryIO, TextIO], chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Yields the elements of a top-level JSON array one by one.
+
+    Only the current element (plus one read block) is held in memory, the
+    document as a whole is never materialised.
+    """
+    chunks = _text_chunks(fp, chunk_size)
+    buf, pos = "", 0
+    # Erwartet: "[" am Anfang, danach Element oder "]", nach einem
+    # Element "," oder "]", nach einem Komma wieder ein Element
+    expect = "["
+
+    def fill() -> bool:
+        nonlocal buf, pos
+        nxt = next(chunks, None)
+        if nxt is None:
+            return False
+        buf, pos = buf[pos:] + nxt, 0
+        return True
+
+    while True:
+        # Trennzeichen überspringen
+        while pos < len(buf) and buf[pos] in _WS:
+            pos += 1
+        if pos >= len(buf):
+            if not fill():
+                raise ValueError("Unexpected end of JSON input")
+            continue
+        ch = buf[pos]
+        if expect == "[":
+            if ch != "[":
+                raise ValueError("Expected a JSON array of nodes")
+            expect = "first"
+            pos += 1
+            continue
+        if expect == "separator":
+            if ch not in ",]":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {ch!r}")
+        elif ch in ",]" and not (ch == "]" and expect == "first"):
+            raise ValueError(f"Expected a JSON value in array, got {ch!r}")
+        if ch == "]":
+            break
+        if ch == ",":
+            expect = "element"
+            pos += 1
+            continue
+        try:
+            obj, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # Element ist noch nicht vollständig im Puffer
+            if not fill():
+                raise
+            continue
+        if end == len(buf) and fill():
+            # Zahlen/Literale könnten am Blockende abgeschnitten sein
+            continue
+        pos = end
+        expect = "separator"
+        yield obj
+
+    # Nach dem Array ist nur noch Whitespace erlaubt
+    rest = buf[pos + 1:]
+    while rest is not None:
+        if rest.strip(_WS):
+            raise ValueError("Unexpected data after the JSON array")
+        rest = next(chunks, None)
+
+
+def _open_source(source: Source, mode: str = "rb"):
+    if isinstance(source, (str, Path)):
+        return Path(source).open(mode), True
+    if hasattr(source, "seek"):
+        try:
+            source.seek(0)
+        except (OSError, io.UnsupportedOperation):
+            pass
+    return source, False
+
+
+def iter_text(source: Source, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Streams a text file (path or open file object) in decoded blocks."""
+    fp, owned = _open_source(source)
+    try:
+        yield from _text_chunks(fp, chunk_size)
+    finally:
+        if owned:
+            fp.close()
+
+
+def iter_tree(source: Source, chunk_size: int = CHUNK_SIZE) -> Iterator[Node]:
+    """
+    Streams the nodes of a JSON export.
+
+    ``source`` may be a path or an open (binary or text) file object such as
+    Streamlit's ``UploadedFile`` – no temporary file is needed.
+    """
+    fp, owned = _open_source(source)
+    try:
+        for data in _iter_array(fp, chunk_size):
+            yield Node.from_dict(data)
+    finally:
+        if owned:
+            fp.close()
+
+
+def save_tree(nodes: Iterable[Node], path: str | Path) -> None:
+    """Save the tree to a JSON file (streamed, one node per line)."""
     path = Path(path)
     with path.open("w", encoding="utf-8") as f:
-        json.dump([n.to_dict() for n in nodes], f, indent=2)
+        write_tree(nodes, f)
+
+def write_tree(nodes: Iterable[Node], fp: TextIO) -> None:
+    """Writes the JSON array node by node into an open text stream."""
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    fp.write("[")
+    sep = "\n"
+    for n in nodes:
+        fp.write(sep)
+        fp.write(dumps(n.to_dict()))
+        sep = ",\n"
+    fp.write("\n]\n")
+
+@profiled()
+def load_tree(source: Source) -> List[Node]:
+    """Load the tree from a JSON file (path or open file object)."""
+    return list(iter_tree(source))
+
+
+class JsonExport:
+    """
+    JSON export of one GoalTree that is kept up to date from its change log.
+
+    Every node's line is encoded once; afterwards only added, updated or
+    moved nodes are re-encoded. The output has the same layout as
+    :func:`write_tree`.
+    """
+
+    def __init__(self, tree: GoalTree):
+        self._tree = weakref.ref(tree)
+        self._dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        self._lines: Dict[str, str] = {}
+        self._data = b""
+        self.revision = -1
+        self.encoded = 0            # Anzahl kodierter Knoten (Diagnose)
+
+    def _rebuild(self, tree: GoalTree) -> None:
+        self._lines = {n.id: self._dumps(n.to_dict()) for n in tree}
+        self.encoded += len(self._lines)
+
+    def _replay(self, tree: GoalTree, changes) -> None:
+        dirty: Dict[str, None] = {}
+        for change in changes:
+            if change.op == "remove":
+                self._lines.pop(change.node_id, None)
+                dirty.pop(change.node_id, None)
+            else:
+                # Neue Knoten ans Ende – wie in der Einfügereihenfolge des Baums
+                self._lines.setdefault(change.node_id, "")
+                dirty[change.node_id] = None
+        for nid in dirty:
+            self._lines[nid] = self._dumps(tree[nid].to_dict())
+        self.encoded += len(dirty)
 
-def load_tree(path: str | Path) -> List[Node]:
-    """Load the tree from a JSON file."""
+    def bytes(self) -> bytes:
+        tree = self._tree()
+        if tree is None:
+            raise ReferenceError("The exported GoalTree no longer exists")
+        if tree.revision != self.revision:
+            changes = tree.changes_since(self.revision) if self.revision >= 0 else None
+            if changes is None:
+                self._rebuild(tree)
+            else:
+                self._replay(tree, changes)
+            body = ",\n".join(self._lines.values())
+            self._data = (f"[\n{body}\n]\n" if body else "[\n]\n").encode("utf-8")
+            self.revision = tree.revision
+        return self._data
+
+
+_EXPORTS: "weakref.WeakKeyDictionary[GoalTree, JsonExport]" = weakref.WeakKeyDictionary()
+
+@profiled()
+def export_json(tree: GoalTree) -> bytes:
+    """JSON bytes of ``tree``, maintained incrementally between calls."""
+    export = _EXPORTS.get(tree)
+    if export is None:
+        export = _EXPORTS[tree] = JsonExport(tree)
+    return export.bytes()
+
+
+# ── NDJSON: ein Knoten pro Zeile, kann fortlaufend ergänzt werden
+def save_tree_ndjson(nodes: Iterable[Node], path: str | Path, append: bool = False) -> None:
+    """Writes one JSON object per line; ``append=True`` adds to an existing file."""
     path = Path(path)
-    with path.open("r", encoding="utf-8") as f:
-        return [Node.from_dict(n) for n in json.load(f)]
-    
\ No newline at end of file
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    with path.open("a" if append else "w", encoding="utf-8") as f:
+        for n in nodes:
+            f.write(dumps(n.to_dict()))
+            f.write("\n")
+
+def iter_tree_ndjson(source: Source) -> Iterator[Node]:
+    """Streams nodes from an NDJSON file (path or open file object)."""
+    fp, owned = _open_source(source)
+    try:
+        for line in fp:
+            if isinstance(line, bytes):
+                line = line.decode("utf-8")
+            line = line.strip()
+            if line:
+                yield Node.from_dict(json.loads(line))
+    finally:
+        if owned:
+            fp.close()
+
+def load_tree_ndjson(source: Source) -> List[Node]:
+    """Load the tree from an NDJSON file."""
+    return list(iter_tree_ndjson(source))
+
+
+# ── Binärer Snapshot (spaltenorientiert, mmap-fähig)
+#
+# Aufbau (little-endian, alle int32-Spalten 4-Byte-ausgerichtet):
+#   Header   "<8sHHIII": Magic, Version, Flags, Knoten n, Strings s, Blob-Länge
+#   parent   int32[n]   Index des Parents, -1 = kein Parent,
+#                       <= -2 = unbekannter Parent, ID steht in Strings[-p - 2]
+#   name     int32[n]   Index in die String-Tabelle
+#   comment  int32[n]   Index in die String-Tabelle
+#   offsets  uint32[s+1] Start der Strings im Blob
+#   ids      16 Byte je Knoten (FLAG_UUID) oder int32[n] String-Index
+#   status   uint8[n]   Index in STATUS_CHOICES
+#   blob     UTF-8-Daten der String-Tabelle
+SNAPSHOT_MAGIC = b"PGSNAP\x00\x00"
+SNAPSHOT_VERSION = 1
+FLAG_UUID = 0x1
+_HEADER = struct.Struct("<8sHHIII")
+_NATIVE_LE = sys.byteorder == "little"
+_HEX_LOWER = frozenset("0123456789abcdef")
+
+
+def _le(arr: array) -> bytes:
+    if not _NATIVE_LE:
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _is_canonical_uuid(value: object) -> bool:
+    """True for the lower-case 8-4-4-4-12 form produced by ``str(uuid4())``."""
+    return (
+        isinstance(value, str) and len(value) == 36 and value.count("-") == 4
+        and value[8] == value[13] == value[18] == value[23] == "-"
+        and _HEX_LOWER.issuperset(value.replace("-", ""))
+    )
+
+
+def _uuid_strings(raw: bytes) -> List[str]:
+    """Formats a block of 16-byte UUIDs back into their canonical strings."""
+    h = raw.hex()
+    return [
+        f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}"
+        for i in range(0, len(h), 32)
+    ]
+
+
+@profiled()
+def snapshot_bytes(nodes: Iterable[Node]) -> bytes:
+    """Serialises the nodes into the binary snapshot format."""
+    nodes = list(nodes)
+    index = {n.id: i for i, n in enumerate(nodes)}
+    strings: Dict[str, int] = {}
+
+    def intern(s: str) -> int:
+        i = strings.get(s)
+        if i is None:
+            i = strings[s] = len(strings)
+        return i
+
+    parent = array("i", [0]) * len(nodes)
+    name = array("i", [0]) * len(nodes)
+    comment = array("i", [0]) * len(nodes)
+    status = bytearray(len(nodes))
+    status_code = {s: i for i, s in enumerate(STATUS_CHOICES)}
+    for i, n in enumerate(nodes):
+        if n.parent is None:
+            parent[i] = -1
+        else:
+            p = index.get(n.parent)
+            parent[i] = p if p is not None else -2 - intern(n.parent)
+        name[i] = intern(n.name)
+        comment[i] = intern(n.comment)
+        status[i] = status_code[n.status]
+
+    # IDs als 16 Byte speichern, wenn alle kanonische UUIDs sind
+    if all(_is_canonical_uuid(n.id) for n in nodes):
+        flags = FLAG_UUID
+        ids = bytes.fromhex("".join(n.id for n in nodes).replace("-", ""))
+    else:
+        flags = 0
+        ids = _le(array("i", [intern(n.id) for n in nodes]))
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = array("I", [0]) * (len(encoded) + 1)
+    pos = 0
+    for i, e in enumerate(encoded):
+        pos += len(e)
+        offsets[i + 1] = pos
+    blob = b"".join(encoded)
+
+    return b"".join([
+        _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, len(nodes), len(encoded), len(blob)),
+        _le(parent), _le(name), _le(comment), _le(offsets), ids, bytes(status), blob,
+    ])
+
+
+class Snapshot:
+    """
+    Read-only view on a binary snapshot.
+
+    The columns are exposed as zero-copy ``memoryview`` objects over the
+    underlying buffer (bytes or ``mmap``); strings and ``Node`` objects are
+    only created when they are accessed.
+    """
+
+    def __init__(self, buffer, _mmap: mmap.mmap | None = None, _file=None):
+        self._mmap, self._file = _mmap, _file
+        self._buf = memoryview(buffer)
+        magic, version, flags, n, s, blob_len = _HEADER.unpack_from(self._buf, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a goal network snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        self.flags, self.count, self._string_count = flags, n, s
+
+        off = _HEADER.size
+        self.parents = self._int_column(off, n, "i"); off += 4 * n
+        self.names = self._int_column(off, n, "i"); off += 4 * n
+        self.comments = self._int_column(off, n, "i"); off += 4 * n
+        self._offsets = self._int_column(off, s + 1, "I"); off += 4 * (s + 1)
+        id_size = 16 * n if flags & FLAG_UUID else 4 * n
+        self._ids = self._buf[off:off + id_size] if flags & FLAG_UUID else self._int_column(off, n, "i")
+        off += id_size
+        self.statuses = self._buf[off:off + n]; off += n
+        self._blob = self._buf[off:off + blob_len]
+        self._cache: Dict[int, str] = {}
+
+    def _int_column(self, off: int, count: int, fmt: str):
+        view = self._buf[off:off + 4 * count]
+        if _NATIVE_LE:
+            return view.cast(fmt)
+        arr = array(fmt, view.tobytes())
+        arr.byteswap()
+        return arr
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def string(self, i: int) -> str:
+        s = self._cache.get(i)
+        if s is None:
+            s = self._cache[i] = str(self._blob[self._offsets[i]:self._offsets[i + 1]], "utf-8")
+        return s
+
+    def node_id(self, i: int) -> str:
+        if self.flags & FLAG_UUID:
+            return _uuid_strings(self._ids[16 * i:16 * i + 16].tobytes())[0]
+        return self.string(self._ids[i])
+
+    def node_ids(self) -> List[str]:
+        """The whole ID column, decoded in one go."""
+        if self.flags & FLAG_UUID:
+            return _uuid_strings(self._ids.tobytes())
+        return [self.string(i) for i in self._ids]
+
+    def status(self, i: int) -> str:
+        return STATUS_CHOICES[self.statuses[i]]
+
+    def node(self, i: int, ids: List[str] | None = None) -> Node:
+        """Builds the ``Node`` at index ``i`` (``ids`` = pre-decoded ID column)."""
+        p = self.parents[i]
+        if p == -1:
+            parent = None
+        elif p >= 0:
+            parent = ids[p] if ids is not None else self.node_id(p)
+        else:
+            parent = self.string(-p - 2)
+        return Node(
+            id=ids[i] if ids is not None else self.node_id(i),
+            name=self.string(self.names[i]),
+            parent=parent,
+            status=STATUS_CHOICES[self.statuses[i]],
+            comment=self.string(self.comments[i]),
+        )
+
+    def __iter__(self) -> Iterator[Node]:
+        # Voll-Laden: Spalten einmal dekodieren statt pro Knoten nachzuschlagen
+        ids = self.node_ids()
+        strings = [self.string(i) for i in range(self._string_count)]
+        for i, (p, name, comment, status) in enumerate(
+            zip(self.parents.tolist(), self.names.tolist(), self.comments.tolist(), self.statuses.tolist())
+        ):
+            yield Node(
+                id=ids[i],
+                name=strings[name],
+                parent=None if p == -1 else ids[p] if p >= 0 else strings[-p - 2],
+                status=STATUS_CHOICES[status],
+                comment=strings[comment],
+            )
+
+    def to_nodes(self) -> List[Node]:
+        return list(self)
+
+    def close(self) -> None:
+        """Releases the views and closes a memory-mapped file."""
+        for attr in ("parents", "names", "comments", "_offsets", "_ids", "statuses", "_blob"):
+            v = getattr(self, attr, None)
+            if isinstance(v, memoryview):
+                v.release()
+        self._cache.clear()
+        self._buf.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def save_snapshot(nodes: Iterable[Node], path: str | Path) -> None:
+    """Save the tree as binary snapshot."""
+    Path(path).write_bytes(snapshot_bytes(nodes))
+
+def open_snapshot(path: str | Path) -> Snapshot:
+    """Memory-maps a snapshot file; close it (or use ``with``) when done."""
+    f = Path(path).open("rb")
+    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return Snapshot(mm, _mmap=mm, _file=f)
+
+@profiled()
+def load_snapshot(source: Union[str, Path, bytes, bytearray, memoryview, BinaryIO]) -> List[Node]:
+    """Load the tree from a snapshot (path, bytes or open binary file)."""
+    if isinstance(source, (str, Path)):
+        with open_snapshot(source) as snap:
+            return snap.to_nodes()
+    if hasattr(source, "read"):
+        fp, _ = _open_source(source)
+        source = fp.read()
+    snap = Snapshot(source)
+    try:
+        return snap.to_nodes()
+    finally:
+        snap.close()
@@ -0,0 +1,245 @@
+"""
+diff.py
+-------
+Vergleich und Zusammenführung zweier Stände eines Zielnetzes.
+
+• Merkle-Hashes: jeder Knoten bekommt einen Hash über seine Felder und die
+  (geordneten) Hashes seiner Kinder. Einmal O(n) je Baum-Revision
+  (``GoalTree.memo``), danach wird ein unveränderter Teilbaum beim
+  Vergleich in O(1) übersprungen.
+• ``diff`` liefert einen strukturierten Änderungssatz: hinzugefügt,
+  entfernt, verschoben, Status geändert, umbenannt, Kommentar geändert.
+• ``merge`` führt drei Stände (Basis, unserer, ihrer) zusammen; Konflikte
+  werden gemeldet, im Ergebnis bleibt dann „unserer“ Stand.
+
+Knoten werden über ihre ID zugeordnet.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from project_assessment.helper.data_model import GoalTree, Node, as_tree
+from project_assessment.helper.profiler import profiled
+
+EDIT_KINDS = ("added", "removed", "moved", "status", "renamed", "comment")
+# Feld eines Knotens → Art der Änderung
+_FIELD_KINDS = (("parent", "moved"), ("status", "status"), ("name", "renamed"), ("comment", "comment"))
+
+
+class Merkle(NamedTuple):
+    """Subtree hashes of one tree revision plus the IDs where traversals start."""
+    hashes: Dict[str, bytes]
+    tops: Tuple[str, ...]
+    root: bytes
+
+
+def _merkle(tree: GoalTree) -> Merkle:
+    order = [n.id for n in tree.walk()]
+    hashes: Dict[str, bytes] = {}
+    # Pre-Order rückwärts: Kinder sind immer vor ihrem Parent fertig
+    for nid in reversed(order):
+        n = tree[nid]
+        h = hashlib.sha1(f"{n.id}\x1f{n.status}\x1f{n.name}\x1f{n.comment}\x1e".encode("utf-8"))
+        for c in tree.child_ids(nid):
+            h.update(hashes[c])
+        hashes[nid] = h.digest()
+    tops = tuple(nid for nid in order if tree[nid].parent not in tree)
+    root = hashlib.sha1(b"".join(hashes[t] for t in tops)).digest()
+    return Merkle(hashes, tops, root)
+
+
+def merkle(tree: GoalTree) -> Merkle:
+    """Merkle hashes of ``tree`` (memoised per revision)."""
+    return tree.memo("merkle", _merkle)
+
+
+class Edit(NamedTuple):
+    kind: str                  # siehe EDIT_KINDS
+    node_id: str
+    old: object = None         # bisheriger Wert (Parent-ID, Status, Name, Kommentar)
+    new: object = None
+
+
+@dataclass
+class ChangeSet:
+    """Differences from one tree to another, grouped by kind."""
+    edits: List[Edit] = field(default_factory=list)
+    # Verglichene Knoten – zeigt, wie viel übersprungen wurde
+    visited: int = 0
+
+    def __len__(self) -> int:
+        return len(self.edits)
+
+    def __bool__(self) -> bool:
+        return bool(self.edits)
+
+    def of_kind(self, kind: str) -> List[Edit]:
+        return [e for e in self.edits if e.kind == kind]
+
+    def counts(self) -> Dict[str, int]:
+        out = dict.fromkeys(EDIT_KINDS, 0)
+        for e in self.edits:
+            out[e.kind] += 1
+        return out
+
+    def by_node(self) -> Dict[str, Dict[str, Edit]]:
+        """Node ID → kind → edit."""
+        out: Dict[str, Dict[str, Edit]] = {}
+        for e in self.edits:
+            out.setdefault(e.node_id, {})[e.kind] = e
+        return out
+
+
+@profiled()
+def diff(old: Iterable[Node], new: Iterable[Node]) -> ChangeSet:
+    """
+    Changes that turn ``old`` into ``new``.
+
+    Both trees are walked top-down in parallel; wherever a node has the
+    same subtree hash on both sides its subtree is skipped. Reordering
+    children alone is not reported.
+    """
+    a, b = as_tree(old), as_tree(new)
+    ma, mb = merkle(a), merkle(b)
+    changes = ChangeSet()
+    if ma.root == mb.root:
+        return changes
+
+    seen = set()
+    stack = list(reversed(mb.tops)) + list(reversed(ma.tops))
+    while stack:
+        nid = stack.pop()
+        if nid in seen:
+            continue
+        seen.add(nid)
+        na, nb = a.get(nid), b.get(nid)
+        if na is None:
+            changes.edits.append(Edit("added", nid, None, nb.parent))
+            stack.extend(reversed(b.child_ids(nid)))
+            continue
+        if nb is None:
+            changes.edits.append(Edit("removed", nid, na.parent, None))
+            stack.extend(reversed(a.child_ids(nid)))
+            continue
+        for attr, kind in _FIELD_KINDS:
+            va, vb = getattr(na, attr), getattr(nb, attr)
+            if va != vb:
+                changes.edits.append(Edit(kind, nid, va, vb))
+        if ma.hashes[nid] != mb.hashes[nid]:
+            stack.extend(reversed(b.child_ids(nid)))
+            stack.extend(reversed(a.child_ids(nid)))
+    changes.visited = len(seen)
+    return changes
+
+
+class Conflict(NamedTuple):
+    node_id: str
+    kind: str                  # "status", "renamed", "moved", "comment", "added", "removed", "parent"
+    ours: object
+    theirs: object
+
+
+@dataclass
+class MergeResult:
+    tree: GoalTree
+    # Von der anderen Seite übernommene Änderungen
+    applied: List[Edit] = field(default_factory=list)
+    conflicts: List[Conflict] = field(default_factory=list)
+
+
+def _field_changes(changes: ChangeSet) -> Dict[str, Dict[str, object]]:
+    """Node ID → field → new value, for nodes present on both sides."""
+    kinds = {kind: attr for attr, kind in _FIELD_KINDS}
+    out: Dict[str, Dict[str, object]] = {}
+    for e in changes.edits:
+        if e.kind in kinds:
+            out.setdefault(e.node_id, {})[kinds[e.kind]] = e.new
+    return out
+
+
+@profiled()
+def merge(base: Iterable[Node], ours: Iterable[Node], theirs: Iterable[Node]) -> MergeResult:
+    """
+    Three-way merge: starts from a copy of ``ours`` and applies every change
+    ``theirs`` made relative to ``base`` that does not collide with one of
+    ours. Collisions are reported as conflicts and keep our version:
+
+    - both sides changed the same field to different values
+    - a node was added on both sides with different content
+    - theirs removed a node that we changed or added children below
+    - theirs added or moved a node below one we removed (added nodes below a
+      rejected one are rejected as well)
+    - theirs moved a node below its own subtree (in our tree)
+    """
+    base, ours, theirs = as_tree(base), as_tree(ours), as_tree(theirs)
+    mine, other = diff(base, ours), diff(base, theirs)
+    result = MergeResult(GoalTree(Node(**n.to_dict()) for n in ours))
+    tree = result.tree
+
+    mine_fields = _field_changes(mine)
+    touched_by_us = set(mine_fields) | {e.node_id for e in mine.of_kind("added")}
+
+    # 1) Von ihnen hinzugefügte Knoten (Pre-Order: Parents vor Kindern)
+    added = {e.node_id for e in other.of_kind("added")}
+    # Abgelehnte Knoten – ihre hinzugefügten Kinder hätten keinen Parent
+    rejected = set()
+    for nid in (n.id for n in theirs.walk() if n.id in added):
+        node = theirs[nid]
+        mine_node = ours.get(nid)
+        if mine_node is not None:
+            # Auf beiden Seiten angelegt
+            if mine_node.to_dict() != node.to_dict():
+                result.conflicts.append(Conflict(nid, "added", mine_node.to_dict(), node.to_dict()))
+            continue
+        if node.parent is not None and (node.parent in rejected or node.parent not in tree):
+            result.conflicts.append(Conflict(nid, "parent", None, node.parent))
+            rejected.add(nid)
+            continue
+        tree.add(Node(**node.to_dict()))
+        result.applied.append(Edit("added", nid, None, node.parent))
+
+    # 2) Feldänderungen und Verschiebungen
+    kinds = dict(_FIELD_KINDS)
+    for nid, fields in _field_changes(other).items():
+        if nid not in tree:
+            # Bei uns gelöscht, bei ihnen geändert
+            result.conflicts.append(Conflict(nid, "removed", None, fields))
+            continue
+        ours_fields = mine_fields.get(nid, {})
+        for attr, value in fields.items():
+            kind = kinds[attr]
+            if attr in ours_fields:
+                if ours_fields[attr] != value:
+                    result.conflicts.append(Conflict(nid, kind, ours_fields[attr], value))
+                continue
+            old = getattr(tree[nid], attr)
+            if attr == "parent":
+                if value is not None and value not in tree:
+                    result.conflicts.append(Conflict(nid, "parent", old, value))
+                    continue
+                try:
+                    tree.move(nid, value)
+                except ValueError:
+                    result.conflicts.append(Conflict(nid, "moved", old, value))
+                    continue
+            else:
+                tree.update(nid, **{attr: value})
+            result.applied.append(Edit(kind, nid, old, value))
+
+    # 3) Von ihnen entfernte Knoten – nur, wenn wir darunter nichts geändert haben
+    removed = {e.node_id for e in other.of_kind("removed")}
+    for e in other.of_kind("removed"):
+        nid = e.node_id
+        if nid not in tree or tree[nid].parent in removed and tree[nid].parent in tree:
+            continue  # schon mit dem Parent entfernt bzw. wird mit ihm entfernt
+        subtree = tree.subtree_ids(nid)
+        kept = [i for i in subtree if i in touched_by_us or i not in removed]
+        if kept:
+            result.conflicts.append(Conflict(nid, "removed", kept, None))
+            continue
+        tree.remove(nid)
+        result.applied.extend(Edit("removed", i, None, None) for i in subtree)
+    return result
@@ -0,0 +1,233 @@
+"""
+history.py
+----------
+Undo/Redo für einen GoalTree.
+
+• Ein Schritt speichert nur, was sich geändert hat: Vorher- und
+  Nachher-Abbild der betroffenen Knoten und die Kinder-Reihenfolge der
+  betroffenen Parents (aus dem Journal des GoalTree). Unveränderte Knoten
+  werden nie kopiert – Speicher O(geänderte Knoten) je Schritt.
+• Begrenzte Historie: der älteste Schritt fällt heraus, sobald mehr als
+  ``limit`` Schritte vorliegen.
+• Jeder Stand hat eine Versionsnummer; ``goto`` springt per Undo/Redo zu
+  jeder noch erreichbaren Version.
+• Änderungen außerhalb eines Schritts (z. B. der Status-Roll-up der
+  Analyse) werden dem letzten Schritt zugeschlagen – sie sind seine Folge.
+"""
+
+from __future__ import annotations
+
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from project_assessment.helper.data_model import GoalTree, Journal, Node, NodeImage
+from project_assessment.helper.profiler import profiled
+
+# Maximale Anzahl Undo-Schritte je Baum
+HISTORY_LIMIT = 100
+
+Images = Dict[str, Optional[NodeImage]]
+Orders = Dict[Optional[str], Tuple[str, ...]]
+
+
+class Step(NamedTuple):
+    label: str
+    version: int              # Version nach diesem Schritt
+    before: Images
+    after: Images
+    before_order: Orders
+    after_order: Orders
+
+    @property
+    def size(self) -> int:
+        """Stored node images (memory indicator)."""
+        return len(self.before) + len(self.after)
+
+
+def _restore(tree: GoalTree, images: Images, orders: Orders) -> None:
+    """Brings the nodes in ``images`` and the child lists in ``orders`` to the given state."""
+    # 1) Fehlende Knoten anlegen (Parents dürfen später folgen), dann Felder und Parent setzen
+    for nid, img in images.items():
+        if img is not None and nid not in tree:
+            tree.add(Node(nid, img.name, img.parent, img.status, img.comment))
+    moves = []
+    for nid, img in images.items():
+        if img is None or nid not in tree:
+            continue
+        node = tree[nid]
+        fields = {f: getattr(img, f) for f in ("name", "status", "comment") if getattr(node, f) != getattr(img, f)}
+        if fields:
+            tree.update(nid, **fields)
+        if node.parent != img.parent:
+            moves.append((nid, img.parent))
+    # Verschiebungen, die erst nach einer anderen möglich sind (Zyklus), in weiteren Runden
+    while moves:
+        pending = []
+        for nid, parent in moves:
+            try:
+                tree.move(nid, parent)
+            except ValueError:
+                pending.append((nid, parent))
+        if len(pending) == len(moves):
+            raise ValueError("History step cannot be restored: conflicting moves")
+        moves = pending
+    # 2) Knoten entfernen, die es im Zielzustand nicht gibt
+    for nid, img in images.items():
+        if img is None and nid in tree:
+            tree.remove(nid)
+    # 3) Reihenfolge der Geschwister
+    for parent, order in orders.items():
+        if parent is None or parent in tree:
+            tree.reorder(parent, order)
+
+
+class History:
+    """Bounded undo/redo history of one GoalTree."""
+
+    def __init__(self, tree: GoalTree, limit: int = HISTORY_LIMIT):
+        self._tree = weakref.ref(tree)
+        self._undo: Deque[Step] = deque(maxlen=limit)
+        self._redo: List[Step] = []
+        self._next_version = 1
+        # Version des ältesten noch erreichbaren Stands
+        self._floor = 0
+        tree.start_journal()
+
+    @property
+    def tree(self) -> GoalTree:
+        tree = self._tree()
+        if tree is None:
+            raise ReferenceError("The GoalTree of this history no longer exists")
+        return tree
+
+    # ── Zustand
+    @property
+    def version(self) -> int:
+        return self._undo[-1].version if self._undo else self._floor
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def entries(self) -> List[Tuple[int, str]]:
+        """(version, label) of every reachable state, oldest first; version ``floor`` is the start."""
+        out = [(self._floor, "Start")]
+        out += [(s.version, s.label) for s in self._undo]
+        out += [(s.version, s.label) for s in reversed(self._redo)]
+        return out
+
+    def stored_images(self) -> int:
+        return sum(s.size for s in self._undo) + sum(s.size for s in self._redo)
+
+    # ── Schritte aufzeichnen
+    @contextmanager
+    def step(self, label: str):
+        """Records the changes made inside the block as one undoable step."""
+        self._absorb()
+        try:
+            yield
+        finally:
+            self.commit(label)
+
+    @profiled()
+    def commit(self, label: str) -> Optional[Step]:
+        """Turns the changes since the last step into a new one (``None`` if nothing changed)."""
+        tree = self.tree
+        journal = tree.take_journal()
+        step = self._make_step(label, self._next_version, journal.nodes, journal.children)
+        if step is None:
+            return None
+        self._next_version += 1
+        self._push(step)
+        self._redo.clear()
+        return step
+
+    def _make_step(self, label: str, version: int, before: Images, before_order: Orders) -> Optional[Step]:
+        tree = self.tree
+        after = {nid: tree.image(nid) for nid in before}
+        after_order = {p: tuple(tree.child_ids(p)) for p in before_order}
+        # Unverändert Zurückgesetztes fällt heraus
+        before = {nid: img for nid, img in before.items() if img != after[nid]}
+        after = {nid: after[nid] for nid in before}
+        before_order = {p: o for p, o in before_order.items() if o != after_order[p]}
+        after_order = {p: after_order[p] for p in before_order}
+        if not before and not before_order:
+            return None
+        return Step(label, version, before, after, before_order, after_order)
+
+    def _push(self, step: Step) -> None:
+        if len(self._undo) == self._undo.maxlen:
+            # Ältester Schritt fällt heraus – sein Ergebnis ist der neue Ausgangsstand
+            self._floor = self._undo[0].version
+        self._undo.append(step)
+
+    def _absorb(self) -> None:
+        """Changes made outside of a step belong to the last one (or start the history)."""
+        journal: Journal = self.tree.take_journal()
+        if not journal:
+            return
+        self._redo.clear()
+        if not self._undo:
+            return
+        last = self._undo.pop()
+        before = dict(last.before)
+        for nid, img in journal.nodes.items():
+            before.setdefault(nid, img)
+        before_order = dict(last.before_order)
+        for p, order in journal.children.items():
+            before_order.setdefault(p, order)
+        step = self._make_step(last.label, last.version, before, before_order)
+        if step is not None:
+            self._undo.append(step)
+
+    # ── Undo / Redo
+    @profiled()
+    def undo(self) -> Optional[Step]:
+        self._absorb()
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        self._apply(step.before, step.before_order)
+        self._redo.append(step)
+        return step
+
+    @profiled()
+    def redo(self) -> Optional[Step]:
+        self._absorb()
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        self._apply(step.after, step.after_order)
+        self._push(step)
+        return step
+
+    def goto(self, version: int) -> None:
+        """Undoes or redoes steps until ``version`` is the current state."""
+        self._absorb()
+        if version not in {v for v, _ in self.entries()}:
+            raise ValueError(f"Version {version} is no longer in the history")
+        while self.version != version:
+            if any(s.version == version for s in self._redo):
+                self.redo()
+            else:
+                self.undo()
+
+    def _apply(self, images: Images, orders: Orders) -> None:
+        tree = self.tree
+        _restore(tree, images, orders)
+        # Das Zurückspielen selbst ist kein neuer Schritt
+        tree.take_journal()
+
+
+_HISTORIES: "weakref.WeakKeyDictionary[GoalTree, History]" = weakref.WeakKeyDictionary()
+
+def history_for(tree: GoalTree) -> History:
+    """The undo history of ``tree``; recording starts with the first call."""
+    history = _HISTORIES.get(tree)
+    if history is None:
+        history = _HISTORIES[tree] = History(tree)
+    return history
@@ -0,0 +1,331 @@
+"""
+ingest.py
+---------
+Projektdokumente einlesen und Belegstellen für den Fragenkatalog finden.
+
+• Dokumente werden blockweise gelesen und in überlappende Passagen
+  zerlegt; der Text liegt nie komplett im Speicher.
+• BM25-Index über alle Passagen. Er wird je Dokument nachgeführt: ein
+  neues Dokument tokenisiert nur seine eigenen Passagen, Entfernen löscht
+  nur deren Postings. IDF und mittlere Länge werden erst bei der Abfrage
+  aus den laufenden Summen berechnet.
+• ``match_questions`` ordnet jeder Frage des Katalogs (Blätter unter den
+  Achsen aus ``tree_builder``) ihre besten Passagen zu,
+  ``match_categories`` die Abfragen aus ``config/categories.yaml.old``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import io
+import math
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from project_assessment.helper.data_model import GoalTree, Node, as_tree
+from project_assessment.helper.data_store import CHUNK_SIZE, Source, iter_text
+from project_assessment.helper.profiler import profiled
+from project_assessment.helper.search import tokenize
+
+CATEGORIES_YAML = Path("config/categories.yaml.old")
+
+# Passagen: Länge und Überlappung in Wörtern
+PASSAGE_WORDS = 120
+PASSAGE_OVERLAP = 30
+# BM25-Parameter (übliche Standardwerte)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Gewicht der Achsen-Begriffe gegenüber denen der Frage selbst
+AXIS_WEIGHT = 0.5
+
+# Füllwörter der Katalogfragen (Englisch/Deutsch) – tragen nichts zur Zuordnung bei
+STOPWORDS = frozenset("""
+a an and are as at be been by can do does for from has have how in is it of on or
+that the their there these this to was were what when which who why will with
+any are certain concrete e g etc other seem such
+der die das den dem des ein eine einer und oder ist sind wer was wie wo warum
+für mit von zu im in auf werden wird
+""".split())
+
+_LAST_SPACE = re.compile(r"\s(?=\S*$)")
+
+
+def iter_passages(chunks: Iterable[str], size: int = PASSAGE_WORDS,
+                  overlap: int = PASSAGE_OVERLAP) -> Iterator[str]:
+    """
+    Splits streamed text into passages of ``size`` words, consecutive
+    passages sharing ``overlap`` words. Only one passage plus one read
+    block is held in memory.
+    """
+    if not 0 <= overlap < size:
+        raise ValueError("overlap must be smaller than size")
+    words: List[str] = []
+    tail = ""
+    emitted = False
+    for chunk in chunks:
+        text = tail + chunk
+        # Ein am Blockende abgeschnittenes Wort bis zum nächsten Block zurückhalten
+        m = _LAST_SPACE.search(text)
+        if m is None:
+            tail = text
+            continue
+        tail = text[m.end():]
+        words.extend(text[:m.start()].split())
+        while len(words) >= size:
+            yield " ".join(words[:size])
+            emitted = True
+            del words[:size - overlap]
+    words.extend(tail.split())
+    # Rest nur, wenn er mehr als die Überlappung der letzten Passage enthält
+    if words and (not emitted or len(words) > overlap):
+        yield " ".join(words)
+
+
+def query_terms(text: str) -> List[str]:
+    return [t for t in tokenize(text) if t not in STOPWORDS and not t.isdigit()]
+
+
+class Passage(NamedTuple):
+    doc: str
+    ordinal: int          # Position im Dokument
+    text: str
+
+
+class Evidence(NamedTuple):
+    passage_id: int
+    score: float
+
+
+@dataclass(frozen=True)
+class DocumentInfo:
+    name: str
+    chars: int
+    passages: Tuple[int, ...]
+
+
+class Corpus:
+    """
+    BM25 index over the passages of all ingested documents.
+
+    Documents are added and removed one at a time; ``revision`` changes
+    with every document so callers can cache their matches.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1, self.b = k1, b
+        self.passages: Dict[int, Passage] = {}
+        self._lengths: Dict[int, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._documents: Dict[str, DocumentInfo] = {}
+        self._total_length = 0
+        self._next_id = 0
+        self.revision = 0
+        # Abfrage → Treffer bis zur nächsten Änderung; gleiche Fragen kommen in jedem Ziel vor
+        self._cache: Dict[tuple, List[Evidence]] = {}
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._documents
+
+    def documents(self) -> List[DocumentInfo]:
+        return list(self._documents.values())
+
+    def document(self, name: str) -> Optional[DocumentInfo]:
+        return self._documents.get(name)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._postings)
+
+    # ── Pflege
+    @profiled()
+    def add_document(self, name: str, source: Source, chunk_size: int = CHUNK_SIZE) -> DocumentInfo:
+        """
+        Streams ``source`` (path or file object) into the index; replaces a
+        document of the same name. The document is read completely before
+        the index is touched, so a read or decode error (``UnicodeDecodeError``
+        for non-UTF-8 files) leaves the corpus unchanged.
+        """
+        chars = 0
+
+        def counted(chunks):
+            nonlocal chars
+            for chunk in chunks:
+                chars += len(chunk)
+                yield chunk
+
+        texts = list(iter_passages(counted(iter_text(source, chunk_size))))
+        if name in self._documents:
+            self.remove_document(name)
+        ids = []
+        for ordinal, text in enumerate(texts):
+            pid = self._next_id
+            self._next_id += 1
+            self.passages[pid] = Passage(name, ordinal, text)
+            self._add_passage(pid, text)
+            ids.append(pid)
+        info = self._documents[name] = DocumentInfo(name, chars, tuple(ids))
+        self._changed()
+        return info
+
+    def add_text(self, name: str, text: str) -> DocumentInfo:
+        return self.add_document(name, io.StringIO(text))
+
+    def remove_document(self, name: str) -> None:
+        info = self._documents.pop(name)
+        for pid in info.passages:
+            for term in set(query_terms(self.passages.pop(pid).text)):
+                posting = self._postings[term]
+                del posting[pid]
+                if not posting:
+                    del self._postings[term]
+            self._total_length -= self._lengths.pop(pid)
+        self._changed()
+
+    def _add_passage(self, pid: int, text: str) -> None:
+        terms = query_terms(text)
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+            posting[pid] = posting.get(pid, 0) + 1
+        self._lengths[pid] = len(terms)
+        self._total_length += len(terms)
+
+    def _changed(self) -> None:
+        self.revision += 1
+        self._cache.clear()
+
+    # ── Abfrage
+    def search(self, query: Dict[str, float] | str, k: int = 3) -> List[Evidence]:
+        """
+        Top-``k`` passages by BM25. ``query`` is text or a term → weight
+        mapping (for weighting question and axis terms differently).
+        """
+        if isinstance(query, str):
+            weights: Dict[str, float] = {}
+            for t in query_terms(query):
+                weights[t] = weights.get(t, 0.0) + 1.0
+        else:
+            weights = query
+        key = (tuple(sorted(weights.items())), k)
+        hit = self._cache.get(key)
+        if hit is not None:
+            return hit
+
+        n = len(self.passages)
+        avg = self._total_length / n if n else 0.0
+        k1, b, lengths = self.k1, self.b, self._lengths
+        scores: Dict[int, float] = {}
+        for term, weight in weights.items():
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = weight * math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for pid, tf in posting.items():
+                norm = k1 * (1 - b + b * lengths[pid] / avg) if avg else k1
+                scores[pid] = scores.get(pid, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        result = self._cache[key] = [Evidence(pid, score) for pid, score in top]
+        return result
+
+
+def question_nodes(tree: GoalTree, root: Optional[str] = None) -> List[Node]:
+    """
+    Catalogue questions: leaves below a goal (main goals themselves are not
+    questions), optionally only those in the subtree of ``root``.
+    """
+    nodes = tree.walk(root) if root is not None else tree
+    return [n for n in nodes if n.parent in tree and not tree.has_children(n.id)]
+
+
+def question_query(node: Node, tree: GoalTree) -> Dict[str, float]:
+    """Terms of the question plus (weaker) those of its axis."""
+    weights: Dict[str, float] = {}
+    parent = tree.get(node.parent)
+    if parent is not None and parent.parent is not None:
+        for t in query_terms(parent.name):
+            weights[t] = weights.get(t, 0.0) + AXIS_WEIGHT
+    for t in query_terms(node.name):
+        weights[t] = weights.get(t, 0.0) + 1.0
+    return weights
+
+
+@profiled()
+def match_questions(nodes: Iterable[Node], corpus: Corpus, k: int = 3,
+                    root: Optional[str] = None) -> Dict[str, List[Evidence]]:
+    """
+    Question node ID → best passages (questions without any match are left
+    out). ``root`` restricts the questions to one subtree, e.g. one goal.
+    """
+    tree = as_tree(nodes)
+    out: Dict[str, List[Evidence]] = {}
+    for q in question_nodes(tree, root):
+        hits = corpus.search(question_query(q, tree), k)
+        if hits:
+            out[q.id] = hits
+    return out
+
+
+# ── Kategorien aus config/categories.yaml.old
+class Category(NamedTuple):
+    id: str
+    label: str
+    prompt_type: str
+    queries: Tuple[str, ...]
+
+
+_CATEGORY_CACHE: Dict[Tuple[str, float], Tuple[Category, ...]] = {}
+_CATEGORY_LOCK = threading.Lock()
+
+
+def parse_categories(entries) -> Tuple[Category, ...]:
+    """The ``query`` field is folded text with several ``query:`` prefixes – one query each."""
+    out = []
+    for entry in entries or ():
+        raw = str(entry.get("query") or "")
+        queries = tuple(q.strip() for q in re.split(r"\bquery:", raw) if q.strip())
+        out.append(Category(str(entry.get("id", "")), str(entry.get("label", "")),
+                            str(entry.get("prompt_type", "default")), queries))
+    return tuple(out)
+
+
+def load_categories(path: Path = CATEGORIES_YAML) -> Tuple[Category, ...]:
+    """Category catalogue, cached by path and mtime (empty if the file is missing)."""
+    try:
+        key = (str(path), path.stat().st_mtime)
+    except FileNotFoundError:
+        print(f"[INFO] {path} nicht gefunden – keine Kategorien.")
+        return ()
+    categories = _CATEGORY_CACHE.get(key)
+    if categories is None:
+        import yaml  # erst bei Bedarf laden
+        with path.open("r", encoding="utf-8") as f:
+            categories = parse_categories(yaml.safe_load(f))
+        with _CATEGORY_LOCK:
+            for old in [k for k in _CATEGORY_CACHE if k[0] == key[0] and k != key]:
+                del _CATEGORY_CACHE[old]
+            categories = _CATEGORY_CACHE.setdefault(key, categories)
+    return categories
+
+
+@profiled()
+def match_categories(corpus: Corpus, categories: Iterable[Category], k: int = 3) -> Dict[str, List[Evidence]]:
+    """Category ID → best passages over all of its queries (best score per passage)."""
+    out: Dict[str, List[Evidence]] = {}
+    for cat in categories:
+        best: Dict[int, float] = {}
+        for q in cat.queries:
+            for e in corpus.search(q, k):
+                if e.score > best.get(e.passage_id, 0.0):
+                    best[e.passage_id] = e.score
+        if best:
+            top = heapq.nlargest(k, best.items(), key=lambda item: item[1])
+            out[cat.id] = [Evidence(pid, score) for pid, score in top]
+    return out
@@ -0,0 +1,91 @@
+"""
+pipeline.py
+-----------
+Komplette Analyse eines Zielbaums in einem Aufruf:
+Roll-up → Kennzahlen → kritische Pfade → Zusammenfassung → Empfehlungen.
+
+Ergebnisse sind unveränderlich und werden prozessweit nach Inhalt des
+Baums (Content-Hash) und Regelsatz gecacht, so dass ein unveränderter Baum
+beim Streamlit-Rerun nichts kostet und Sessions mit demselben Baum sich
+das Ergebnis teilen.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable, Optional, Tuple
+
+from project_assessment.helper.analysis import (
+    PathNode, aggregate_status, compute_metrics, critical_path_forest, critical_paths,
+)
+from project_assessment.helper.cache import LRUCache
+from project_assessment.helper.data_model import Node, as_tree
+from project_assessment.helper.profiler import profiled
+from project_assessment.helper.recommendations import RuleSet, get_recommendations, load_ruleset
+from project_assessment.helper.search import index_for
+from project_assessment.helper.summarizer import generate_summary
+
+
+@dataclass(frozen=True)
+class AnalysisResult:
+    metrics: Tuple[Tuple[str, float], ...]
+    critical_paths: Tuple[Tuple[str, ...], ...]
+    summary: str
+    recommendations: Tuple[str, ...]
+    # Dieselben Pfade als Wald, gemeinsame Präfixe nur einmal (nur mit ``forest=True``)
+    critical_forest: Optional[Tuple[PathNode, ...]] = None
+
+    @property
+    def metric(self) -> dict:
+        return dict(self.metrics)
+
+    @cached_property
+    def critical_path_lines(self) -> Tuple[str, ...]:
+        """Markdown line per path, all elements but the last one bold."""
+        return tuple(
+            " → ".join([f"**{name}**" for name in p[:-1]] + [p[-1]])
+            for p in self.critical_paths if p
+        )
+
+
+# Prozessweit, begrenzt: (Content-Hash, Regelsatz) → AnalysisResult
+analysis_cache = LRUCache(maxsize=32)
+
+
+def analyze(nodes: Iterable[Node], ruleset: Optional[RuleSet] = None, forest: bool = False) -> AnalysisResult:
+    """
+    Runs the whole pipeline (including the status roll-up) without caching.
+    The critical path forest is only built with ``forest=True``.
+    """
+    tree = as_tree(nodes)
+    aggregate_status(tree)
+    return _evaluate(tree, ruleset if ruleset is not None else load_ruleset(), forest=forest)
+
+
+@profiled()
+def cached_analysis(nodes: Iterable[Node], ruleset: Optional[RuleSet] = None,
+                    forest: bool = False) -> AnalysisResult:
+    """
+    Like :func:`analyze`, but memoised.
+
+    The roll-up runs at most once per tree revision (it changes the tree);
+    everything after it is looked up by content hash in ``analysis_cache``.
+    On a miss the recommendations are narrowed down with the tree's search
+    index (``search.index_for``), which the editor keeps up to date anyway.
+    """
+    tree = as_tree(nodes)
+    ruleset = ruleset if ruleset is not None else load_ruleset()
+    tree.memo("rollup", aggregate_status)
+    key = (tree.content_hash(), ruleset.fingerprint, forest)
+    return analysis_cache.get_or_compute(key, lambda: _evaluate(tree, ruleset, index_for(tree), forest))
+
+
+def _evaluate(tree, ruleset: RuleSet, index=None, forest: bool = False) -> AnalysisResult:
+    return AnalysisResult(
+        metrics=tuple(compute_metrics(tree).items()),
+        critical_paths=tuple(tuple(p) for p in critical_paths(tree)),
+        summary=generate_summary(tree),
+        recommendations=tuple(get_recommendations(tree, ruleset, index=index)),
+        critical_forest=critical_path_forest(tree) if forest else None,
+    )
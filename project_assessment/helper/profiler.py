@@ -0,0 +1,163 @@
+"""
+profiler.py
+-----------
+Opt-in Laufzeit-Instrumentierung für Streamlit-Reruns.
+
+• ``Profiler`` sammelt Dauer je Abschnitt und je Helper-Aufruf, die Anzahl
+  verarbeiteter Knoten und die an Komponenten gesendeten Bytes; pro Label
+  werden die letzten ``window`` Messungen für Perzentile gehalten.
+
+• Der aktive Profiler steckt in einer ContextVar – Helper brauchen kein
+  Streamlit und zahlen ohne aktiven Profiler nur einen ``ContextVar.get``.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+DEFAULT_WINDOW = 100
+PERCENTILES = (50, 90, 99)
+
+_ACTIVE: ContextVar[Optional["Profiler"]] = ContextVar("project_goals_profiler", default=None)
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[k]
+
+
+class Profiler:
+    """Rolling timings and counters, keyed by ``section/label``."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self.timings: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.nodes: Dict[str, int] = defaultdict(int)
+        self.bytes: Dict[str, int] = defaultdict(int)
+        self.reruns = 0
+        self._section: Optional[str] = None
+
+    def _key(self, label: str) -> str:
+        return f"{self._section}/{label}" if self._section and label != self._section else label
+
+    def record(self, label: str, seconds: float) -> None:
+        key = self._key(label)
+        self.timings[key].append(seconds)
+        self.calls[key] += 1
+
+    def count_nodes(self, label: str, n: int) -> None:
+        # Letzter Wert je Label – „wie groß war der Baum beim letzten Rerun"
+        self.nodes[self._key(label)] = n
+
+    def count_bytes(self, label: str, n: int) -> None:
+        self.bytes[self._key(label)] = n
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Times a UI section; helper calls inside are grouped under it."""
+        outer, self._section = self._section, name
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - t0)
+            self._section = outer
+
+    def clear(self) -> None:
+        self.timings.clear()
+        self.calls.clear()
+        self.nodes.clear()
+        self.bytes.clear()
+        self.reruns = 0
+
+    def stats(self) -> Dict[str, dict]:
+        """Per label: calls, last/mean and percentiles in milliseconds."""
+        out = {}
+        for key, values in self.timings.items():
+            ordered = sorted(values)
+            row = {
+                "calls": self.calls[key],
+                "last_ms": values[-1] * 1e3,
+                "mean_ms": sum(values) / len(values) * 1e3,
+            }
+            row.update({f"p{p}_ms": _percentile(ordered, p) * 1e3 for p in PERCENTILES})
+            if key in self.nodes:
+                row["nodes"] = self.nodes[key]
+            if key in self.bytes:
+                row["bytes"] = self.bytes[key]
+            out[key] = row
+        for key in self.bytes.keys() - out.keys():
+            out[key] = {"bytes": self.bytes[key]}
+        return out
+
+    def to_json(self) -> str:
+        return json.dumps({"reruns": self.reruns, "window": self.window, "stats": self.stats()},
+                          indent=2, ensure_ascii=False)
+
+
+# ── Modul-API für Helper (no-op ohne aktiven Profiler) ──────────────────────
+
+def active() -> Optional[Profiler]:
+    return _ACTIVE.get()
+
+
+@contextmanager
+def activate(profiler: Optional[Profiler]) -> Iterator[Optional[Profiler]]:
+    """Makes ``profiler`` the active one for the current context (``None`` = off)."""
+    token = _ACTIVE.set(profiler)
+    try:
+        if profiler is not None:
+            profiler.reruns += 1
+        yield profiler
+    finally:
+        _ACTIVE.reset(token)
+
+
+@contextmanager
+def section(name: str) -> Iterator[None]:
+    profiler = _ACTIVE.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.section(name):
+        yield
+
+
+def record_bytes(label: str, n: int) -> None:
+    profiler = _ACTIVE.get()
+    if profiler is not None:
+        profiler.count_bytes(label, n)
+
+
+def profiled(label: Optional[str] = None) -> Callable:
+    """
+    Decorator for helpers: times each call and, if the first argument is a
+    sized collection of nodes, records its length.
+    """
+    def decorate(fn: Callable) -> Callable:
+        name = label or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profiler = _ACTIVE.get()
+            if profiler is None:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.record(name, time.perf_counter() - t0)
+                if args and hasattr(args[0], "__len__") and not isinstance(args[0], (str, bytes)):
+                    profiler.count_nodes(name, len(args[0]))
+        return wrapper
+    return decorate
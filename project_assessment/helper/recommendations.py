@@ -1,24 +1,184 @@
+import hashlib
 import json
 import re
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional, Set, Tuple, Union
 from pathlib import Path
-import yaml
 from project_assessment.helper.data_model import Node
+from project_assessment.helper.profiler import profiled
+
+# Zeichen, die ein "match" zu einer echten Regex machen
+_REGEX_META = set(".^$*+?{}[]\\|()")
+_WORD_RE = re.compile(r"\w+")
+# Gruppenbezüge (\1, (?P=name), (?(1)…)) und benannte Gruppen ändern ihre Bedeutung in einer Alternation
+_GROUP_REFS = re.compile(r"\\[1-9]|\(\?P[=<]|\(\?\(")
 
 def load_rules(path: str = "config/rules.yaml") -> List[dict]:
+    import yaml  # nur beim (gecachten) Laden der Regeln gebraucht
     try:
         with open(path, "r", encoding="utf-8") as f:
             return yaml.safe_load(f) or []
     except FileNotFoundError:
         return []
 
-def get_recommendations(nodes: List[Node], rules: List[dict]) -> List[str]:
+
+class _LiteralMatcher:
+    """
+    Aho-Corasick automaton over the (lower-cased) literal rule patterns.
+
+    One pass over a text reports every pattern that occurs in it, no matter
+    how many patterns there are or how they overlap.
+    """
+
+    def __init__(self, patterns: Dict[str, List[int]]):
+        # patterns: lower-cased literal → rule indices
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[Tuple[int, ...]] = [()]
+        for pattern, rule_ids in patterns.items():
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._out.append(())
+                state = nxt
+            self._out[state] += tuple(rule_ids)
+
+        # Failure-Links per BFS; Ausgaben der Suffix-Zustände werden übernommen
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    def find(self, text: str) -> set:
+        """Rule indices of all literals contained in ``text`` (already lower-cased)."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class RuleSet:
+    """
+    Compiled form of ``rules.yaml``.
+
+    Plain-text rules go into one Aho-Corasick automaton, real regex rules
+    into one combined alternation that serves as a pre-filter before the
+    individually compiled patterns are checked. Patterns with group
+    references are left out of the alternation (its group numbers differ)
+    and always checked on their own. Build once, reuse for every render
+    (see :func:`load_ruleset`).
+    """
+
+    def __init__(self, rules: Iterable[dict], status: str = "red"):
+        self.rules = [r for r in rules if r.get("match")]
+        self.status = status
+        # Inhaltlicher Schlüssel, z. B. für Ergebnis-Caches
+        self.fingerprint = hashlib.sha1(
+            repr((status, [(r.get("match"), r.get("action")) for r in self.rules])).encode("utf-8")
+        ).hexdigest()
+        literals: Dict[str, List[int]] = {}
+        self._regexes: List[Tuple[int, re.Pattern]] = []
+        for i, rule in enumerate(self.rules):
+            pattern = str(rule["match"])
+            if _REGEX_META.isdisjoint(pattern):
+                literals.setdefault(pattern.lower(), []).append(i)
+            else:
+                self._regexes.append((i, re.compile(pattern, re.I)))
+        self._literals = _LiteralMatcher(literals) if literals else None
+        self._literal_patterns = list(literals)
+        self._combinable = [(i, p) for i, p in self._regexes if not _GROUP_REFS.search(p.pattern)]
+        self._separate = [(i, p) for i, p in self._regexes if _GROUP_REFS.search(p.pattern)]
+        self._combined = None
+        if self._combinable:
+            try:
+                self._combined = re.compile("|".join(f"(?:{p.pattern})" for _, p in self._combinable), re.I)
+            except re.error:
+                # z. B. Inline-Flags mitten im Muster – dann jede Regex einzeln prüfen
+                pass
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, text: str) -> List[int]:
+        """Indices of all rules matching ``text`` in rule order."""
+        hits = self._literals.find(text.lower()) if self._literals else set()
+        if self._combinable and (self._combined is None or self._combined.search(text)):
+            hits.update(i for i, p in self._combinable if p.search(text))
+        hits.update(i for i, p in self._separate if p.search(text))
+        return sorted(hits)
+
+    def candidates(self, index) -> Optional[Set[str]]:
+        """
+        Node IDs that can match at all, looked up in a search index
+        (see ``search.SearchIndex``): the rarest word of each literal
+        pattern must occur inside a word of the node's name. ``None`` if a
+        rule cannot be narrowed down this way (regex rules, patterns without
+        words) or if the rules are not selective enough to pay off.
+        """
+        if self._regexes:
+            return None
+        ids: Set[str] = set()
+        for pattern in self._literal_patterns:
+            words = _WORD_RE.findall(pattern)
+            if not words:
+                return None
+            terms = min((index.terms_containing(w) for w in words), key=index.document_frequency)
+            ids |= index.nodes_with_terms(terms)
+            if len(ids) > len(index) // 2:
+                # Kaum selektiv – der Automat über alle Namen ist dann schneller
+                return None
+        return ids
+
+
+# Prozessweiter Cache: Pfad → (mtime, RuleSet)
+_RULESET_CACHE: Dict[str, Tuple[float, RuleSet]] = {}
+
+def load_ruleset(path: str = "config/rules.yaml") -> RuleSet:
+    """Compiled rules, re-read only when the file's mtime changes."""
+    try:
+        mtime = Path(path).stat().st_mtime
+    except FileNotFoundError:
+        return RuleSet([])
+    cached = _RULESET_CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, RuleSet(load_rules(path)))
+        _RULESET_CACHE[path] = cached
+    return cached[1]
+
+@profiled()
+def get_recommendations(nodes: Iterable[Node], rules: Union[RuleSet, List[dict]], index=None) -> List[str]:
+    """
+    One line per (node, matching rule). With a ``search.SearchIndex`` of the
+    same tree only the index candidates are matched against the rules.
+    """
+    ruleset = rules if isinstance(rules, RuleSet) else RuleSet(rules)
     recs = []
+    if not len(ruleset):
+        return recs
+    candidates = ruleset.candidates(index) if index is not None else None
     for n in nodes:
-        for rule in rules:
-            pattern = rule.get("match", "")
-            if pattern and re.search(pattern, n.name, re.I) and n.status == "red":
-                recs.append(f"**{n.name}** → {rule.get('action')}")
+        # Status-Filter vor jedem Textvergleich
+        if n.status != ruleset.status:
+            continue
+        if candidates is not None and n.id not in candidates:
+            continue
+        for i in ruleset.match(n.name):
+            recs.append(f"**{n.name}** → {ruleset.rules[i].get('action')}")
     return recs
 
 def load_recommendations(path: str | Path) -> Dict[str, List[str]]:
@@ -26,4 +186,3 @@ def load_recommendations(path: str | Path) -> Dict[str, List[str]]:
     path = Path(path)
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
-    
\ No newline at end of file
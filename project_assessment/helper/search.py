@@ -0,0 +1,297 @@
+"""
+search.py
+---------
+Invertierter Volltext-Index über Name und Kommentar der Knoten.
+
+• Postings: Term → {Knoten-ID: (Vorkommen im Namen, im Kommentar)}, dazu
+  je Term die IDs gruppiert nach Gewicht – Ein-Wort-Suchen laufen damit in
+  absteigender Relevanz und brechen nach ``limit`` Treffern ab
+• Präfixsuche per ``bisect`` über das sortierte Vokabular
+• Fehlertolerante Suche (1 Edit) über Lösch-Nachbarschaften der Terme
+• Ranking: Treffer im Namen zählen mehr, seltene Terme mehr (IDF)
+• Wird aus dem Änderungsprotokoll des GoalTree inkrementell nachgeführt
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import math
+import re
+import weakref
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from project_assessment.helper.data_model import GoalTree, Node
+from project_assessment.helper.profiler import profiled
+from project_assessment.helper.subtree_index import subtree_index
+
+_TOKEN_RE = re.compile(r"\w+")
+# Gewicht eines Treffers im Namen gegenüber einem im Kommentar
+NAME_WEIGHT = 3
+# Faktoren für Treffer, die nicht exakt sind
+PREFIX_FACTOR = 0.7
+FUZZY_FACTOR = 0.5
+# Kürzere Terme werden nicht fehlertolerant gesucht (zu viele Zufallstreffer)
+FUZZY_MIN_LEN = 4
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def _deletes(term: str) -> Set[str]:
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Levenshtein distance ≤ 1, adjacent transpositions included."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    i = 0
+    while i < min(la, lb) and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        return a[i + 1:] == b[i + 1:] or (a[i + 2:] == b[i + 2:] and a[i:i + 2] == b[i:i + 2][::-1])
+    return a[i:] == b[i + 1:] if la < lb else a[i + 1:] == b[i:]
+
+
+class Hit(NamedTuple):
+    node_id: str
+    score: float
+
+
+class SearchIndex:
+    """
+    Full-text index of one GoalTree.
+
+    Call :meth:`sync` (done by :meth:`search`) to catch up with the tree;
+    only nodes from the change log are re-tokenised.
+    """
+
+    def __init__(self, tree: GoalTree):
+        self._tree = weakref.ref(tree)
+        self._postings: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        # Term → Gewicht → IDs (Einfügereihenfolge)
+        self._impact: Dict[str, Dict[int, Dict[str, None]]] = {}
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self._vocab: List[str] = []
+        self._variants: Dict[str, Set[str]] = {}
+        self.revision = -1
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    @property
+    def tree(self) -> GoalTree:
+        tree = self._tree()
+        if tree is None:
+            raise ReferenceError("The indexed GoalTree no longer exists")
+        return tree
+
+    # ── Pflege
+    def sync(self) -> None:
+        tree = self.tree
+        if tree.revision == self.revision:
+            return
+        changes = tree.changes_since(self.revision) if self.revision >= 0 else None
+        if changes is None:
+            self._postings.clear()
+            self._impact.clear()
+            self._doc_terms.clear()
+            self._vocab.clear()
+            self._variants.clear()
+            for n in tree:
+                self._add(n, rebuild=True)
+            # Vokabular beim Neuaufbau einmal sortieren statt je Term einzufügen
+            self._vocab = sorted(self._postings)
+        else:
+            for nid in dict.fromkeys(c.node_id for c in changes):
+                self._remove(nid)
+                node = tree.get(nid)
+                if node is not None:
+                    self._add(node)
+        self.revision = tree.revision
+
+    def _add(self, node: Node, rebuild: bool = False) -> None:
+        counts: Dict[str, List[int]] = {}
+        for t in tokenize(node.name):
+            counts.setdefault(t, [0, 0])[0] += 1
+        for t in tokenize(node.comment):
+            counts.setdefault(t, [0, 0])[1] += 1
+        for term, (in_name, in_comment) in counts.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                self._impact[term] = {}
+                self._add_term(term, rebuild)
+            posting[node.id] = (in_name, in_comment)
+            self._impact[term].setdefault(NAME_WEIGHT * in_name + in_comment, {})[node.id] = None
+        self._doc_terms[node.id] = tuple(counts)
+
+    def _remove(self, node_id: str) -> None:
+        for term in self._doc_terms.pop(node_id, ()):
+            posting = self._postings[term]
+            in_name, in_comment = posting.pop(node_id)
+            impact = self._impact[term]
+            weight = NAME_WEIGHT * in_name + in_comment
+            del impact[weight][node_id]
+            if not impact[weight]:
+                del impact[weight]
+            if not posting:
+                del self._postings[term]
+                del self._impact[term]
+                self._drop_term(term)
+
+    def _add_term(self, term: str, rebuild: bool = False) -> None:
+        if not rebuild:
+            bisect.insort(self._vocab, term)
+        if len(term) >= FUZZY_MIN_LEN:
+            for v in _deletes(term) | {term}:
+                self._variants.setdefault(v, set()).add(term)
+
+    def _drop_term(self, term: str) -> None:
+        del self._vocab[bisect.bisect_left(self._vocab, term)]
+        if len(term) >= FUZZY_MIN_LEN:
+            for v in _deletes(term) | {term}:
+                terms = self._variants[v]
+                terms.discard(term)
+                if not terms:
+                    del self._variants[v]
+
+    # ── Term-Expansion
+    def prefix_terms(self, prefix: str) -> List[str]:
+        """Vocabulary terms starting with ``prefix`` (sorted)."""
+        lo = bisect.bisect_left(self._vocab, prefix)
+        hi = bisect.bisect_left(self._vocab, prefix + "\U0010ffff")
+        return self._vocab[lo:hi]
+
+    def fuzzy_terms(self, term: str) -> Set[str]:
+        """Vocabulary terms at most one edit away from ``term``."""
+        if len(term) < FUZZY_MIN_LEN - 1:
+            return set()
+        candidates: Set[str] = set()
+        for v in _deletes(term) | {term}:
+            candidates |= self._variants.get(v, set())
+        return {c for c in candidates if _within_one_edit(term, c)}
+
+    def terms_containing(self, fragment: str) -> List[str]:
+        """Vocabulary terms that contain ``fragment`` (linear in the vocabulary, not in the nodes)."""
+        fragment = fragment.casefold()
+        return [term for term in self._vocab if fragment in term]
+
+    def document_frequency(self, terms: Iterable[str]) -> int:
+        """Upper bound for the number of nodes containing any of ``terms``."""
+        return sum(len(self._postings[t]) for t in terms)
+
+    def nodes_with_terms(self, terms: Iterable[str], field: str = "name") -> Set[str]:
+        """IDs of nodes having one of ``terms`` in ``field`` ("name", "comment" or "any")."""
+        slot = {"name": 0, "comment": 1}.get(field)
+        ids: Set[str] = set()
+        for term in terms:
+            posting = self._postings[term]
+            ids.update(posting if slot is None else (i for i, tf in posting.items() if tf[slot]))
+        return ids
+
+    def nodes_containing(self, fragment: str, field: str = "name") -> Set[str]:
+        """IDs of nodes with a term in ``field`` that contains ``fragment``."""
+        return self.nodes_with_terms(self.terms_containing(fragment), field)
+
+    def _expand(self, token: str, prefix: bool, fuzzy: bool) -> Dict[str, float]:
+        """Term → match factor for one query token."""
+        expansion: Dict[str, float] = {}
+        if fuzzy:
+            expansion.update(dict.fromkeys(self.fuzzy_terms(token), FUZZY_FACTOR))
+        if prefix:
+            expansion.update(dict.fromkeys(self.prefix_terms(token), PREFIX_FACTOR))
+        if token in self._postings:
+            expansion[token] = 1.0
+        return expansion
+
+    # ── Abfrage
+    def search(self, query: str, statuses: Optional[Iterable[str]] = None,
+               within: Optional[str] = None, depth: Optional[int] = None,
+               limit: Optional[int] = 20, prefix: bool = True, fuzzy: bool = True) -> List[Hit]:
+        """
+        Ranked nodes matching every token of ``query``.
+
+        Tokens match exactly, as prefix or with one typo. ``statuses``,
+        ``within`` (subtree root) and ``depth`` restrict the result.
+        """
+        self.sync()
+        tree = self.tree
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        n_docs = max(1, len(self._doc_terms))
+        # Je Token: Term → Faktor × IDF
+        expansions = []
+        for token in tokens:
+            terms = self._expand(token, prefix, fuzzy)
+            if not terms:
+                return []
+            expansions.append({t: f * math.log(1 + n_docs / len(self._postings[t])) for t, f in terms.items()})
+
+        wanted = set(statuses) if statuses is not None else None
+        subtrees = subtree_index(tree) if within is not None else None
+
+        def accept(nid: str) -> bool:
+            if wanted is not None and tree[nid].status not in wanted:
+                return False
+            if depth is not None and tree.depth(nid) != depth:
+                return False
+            return subtrees is None or subtrees.is_within(nid, within)
+
+        if len(expansions) == 1:
+            return self._search_one(expansions[0], accept, limit)
+
+        # Mehrere Tokens: Schnittmenge der Kandidaten, nur diese werden bewertet
+        candidates = [set().union(*(self._postings[t] for t in exp)) for exp in expansions]
+        candidates.sort(key=len)
+        ids = candidates[0].intersection(*candidates[1:])
+        ranked = []
+        for nid in ids:
+            if not accept(nid):
+                continue
+            score = 0.0
+            for exp in expansions:
+                score += max(w * (NAME_WEIGHT * tf[0] + tf[1])
+                             for t, w in exp.items() if (tf := self._postings[t].get(nid)) is not None)
+            ranked.append((score, nid))
+        top = sorted(ranked, reverse=True) if limit is None else heapq.nlargest(limit, ranked)
+        return [Hit(i, score) for score, i in top]
+
+    def _search_one(self, expansion: Dict[str, float], accept, limit: Optional[int]) -> List[Hit]:
+        """
+        Single token: walks the (term, weight) blocks in descending score
+        order, so the first time a node shows up is its best score and the
+        walk stops after ``limit`` accepted nodes.
+        """
+        blocks = sorted(((w * weight, term, weight) for term, w in expansion.items()
+                         for weight in self._impact[term]), reverse=True)
+        hits: List[Hit] = []
+        seen: Set[str] = set()
+        for score, term, weight in blocks:
+            for nid in self._impact[term][weight]:
+                if nid in seen:
+                    continue
+                seen.add(nid)
+                if accept(nid):
+                    hits.append(Hit(nid, score))
+                    if limit is not None and len(hits) >= limit:
+                        return hits
+        return hits
+
+
+_INDEXES: "weakref.WeakKeyDictionary[GoalTree, SearchIndex]" = weakref.WeakKeyDictionary()
+
+@profiled()
+def index_for(tree: GoalTree) -> SearchIndex:
+    """The (synchronised) search index of ``tree``, created on first use."""
+    index = _INDEXES.get(tree)
+    if index is None:
+        index = _INDEXES[tree] = SearchIndex(tree)
+    index.sync()
+    return index
@@ -0,0 +1,337 @@
+"""
+sqlite_store.py
+---------------
+Lokale Ablage vieler Projekte in einer SQLite-Datei.
+
+• Eine Zeile pro Knoten, indiziert nach (Projekt, Parent) und (Projekt, Status)
+• Jedes Projekt hat eine Revision, die bei jedem Speichern steigt
+• ``autosave`` schreibt nur die Zeilen, die laut Änderungsprotokoll des
+  GoalTree geändert wurden – in einer Transaktion
+• Projekte lassen sich ebenenweise öffnen und Teilbäume bei Bedarf per
+  rekursivem CTE nachladen
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from project_assessment.helper.data_model import GoalTree, Node, STATUS_CHOICES, share
+from project_assessment.helper.profiler import profiled
+
+DEFAULT_DB = Path(os.environ.get("PROJECT_GOALS_DB", "data/projects.sqlite3"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id            INTEGER PRIMARY KEY,
+    name          TEXT NOT NULL UNIQUE,
+    revision      INTEGER NOT NULL DEFAULT 0,
+    next_position INTEGER NOT NULL DEFAULT 0,
+    updated       REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    project  INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    id       TEXT NOT NULL,
+    parent   TEXT,
+    name     TEXT NOT NULL,
+    status   TEXT NOT NULL,
+    comment  TEXT NOT NULL DEFAULT '',
+    position INTEGER NOT NULL,
+    PRIMARY KEY (project, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS nodes_by_parent ON nodes (project, parent, position);
+CREATE INDEX IF NOT EXISTS nodes_by_status ON nodes (project, status);
+"""
+
+_COLUMNS = "n.id, n.name, n.parent, n.status, n.comment"
+
+_UPSERT = """
+INSERT INTO nodes (project, id, parent, name, status, comment, position)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (project, id) DO UPDATE SET
+    parent = excluded.parent, name = excluded.name,
+    status = excluded.status, comment = excluded.comment
+"""
+# Hinzugefügte/verschobene Knoten bekommen zusätzlich eine neue Position
+_UPSERT_PLACED = _UPSERT + ", position = excluded.position\n"
+
+# Teilbaum unter ?2 (inklusive) bis zur relativen Tiefe ?3 (NULL = unbegrenzt)
+_SUBTREE = """
+WITH RECURSIVE sub(id, lvl) AS (
+    SELECT id, 0 FROM nodes WHERE project = ?1 AND id = ?2
+    UNION ALL
+    SELECT c.id, sub.lvl + 1 FROM nodes c JOIN sub ON c.project = ?1 AND c.parent = sub.id
+    WHERE ?3 IS NULL OR sub.lvl < ?3
+)
+"""
+
+
+class ProjectInfo(NamedTuple):
+    name: str
+    revision: int
+    nodes: int
+    updated: float
+
+
+class ProjectStore:
+    """
+    Projects in one SQLite file; safe to share between Streamlit sessions.
+
+    The store remembers which GoalTree (and revision) it last wrote for a
+    project, so :meth:`autosave` can replay the tree's change log instead
+    of rewriting the project.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_DB):
+        self.path = Path(path)
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        self._synced: Dict[str, Tuple["weakref.ref[GoalTree]", int]] = {}
+        # Teilweise geladene Bäume (→ Projekt, aus dem sie stammen) dürfen das Projekt nie komplett ersetzen
+        self._partial: "weakref.WeakKeyDictionary[GoalTree, str]" = weakref.WeakKeyDictionary()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ── Projekte
+    def list_projects(self) -> List[ProjectInfo]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT p.name, p.revision, COUNT(n.id), p.updated FROM projects p "
+                "LEFT JOIN nodes n ON n.project = p.id GROUP BY p.id ORDER BY p.updated DESC"
+            ).fetchall()
+        return [ProjectInfo(*r) for r in rows]
+
+    def revision(self, name: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT revision FROM projects WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return row[0]
+
+    def status_counts(self, name: str) -> Dict[str, int]:
+        """Nodes per status, answered from the status index without loading the project."""
+        counts = dict.fromkeys(STATUS_CHOICES, 0)
+        with self._lock:
+            pid = self._project_id(name)
+            counts.update(self._conn.execute(
+                "SELECT status, COUNT(*) FROM nodes WHERE project = ? GROUP BY status", (pid,)))
+        return counts
+
+    def is_partial(self, tree: GoalTree) -> bool:
+        """True for trees from :meth:`open` that have not been expanded completely."""
+        return tree in self._partial
+
+    def delete_project(self, name: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM projects WHERE name = ?", (name,))
+            self._synced.pop(name, None)
+
+    def _project_id(self, name: str) -> int:
+        row = self._conn.execute("SELECT id FROM projects WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return row[0]
+
+    # ── Schreiben
+    @profiled()
+    def save(self, name: str, tree: GoalTree) -> int:
+        """Writes the whole project (replacing a previous version); returns the new revision."""
+        if tree in self._partial:
+            raise ValueError("The tree is only partially loaded; use autosave() or expand() it first")
+        with self._lock, self._transaction():
+            self._conn.execute(
+                "INSERT INTO projects (name, updated) VALUES (?, ?) ON CONFLICT (name) DO NOTHING",
+                (name, time.time()))
+            pid = self._project_id(name)
+            self._conn.execute("DELETE FROM nodes WHERE project = ?", (pid,))
+            self._conn.executemany(
+                "INSERT INTO nodes (project, id, parent, name, status, comment, position) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((pid, n.id, n.parent, n.name, n.status, n.comment, i) for i, n in enumerate(tree)))
+            revision = self._bump(pid, next_position=len(tree))
+            self._synced[name] = (weakref.ref(tree), tree.revision)
+        return revision
+
+    @profiled()
+    def autosave(self, name: str, tree: GoalTree) -> int:
+        """
+        Writes only the rows changed since the last save of this tree.
+        Falls back to :meth:`save` if the change log does not reach back
+        far enough. Returns the number of changed nodes (0 = nothing to do).
+
+        A partially loaded tree saved under another name than the project it
+        was opened from is expanded completely first; otherwise the new
+        project would lack every subtree that was never loaded.
+        """
+        origin = self._partial.get(tree)
+        if origin is not None and origin != name:
+            self.expand(origin, tree, None, depth=None)
+        synced = self._synced.get(name)
+        changes = None
+        if synced is not None and synced[0]() is tree:
+            if synced[1] == tree.revision:
+                return 0
+            changes = tree.changes_since(synced[1])
+        if changes is None:
+            if tree not in self._partial:
+                self.save(name, tree)
+                return len(tree)
+            # Ohne Protokoll: alle geladenen Zeilen schreiben, nichts löschen
+            dirty = dict.fromkeys((n.id for n in tree), "write")
+        else:
+            dirty = {}
+            for c in changes:
+                if c.op == "update":
+                    dirty.setdefault(c.node_id, "write")
+                else:
+                    # Reihenfolge der letzten Platzierung = neue Reihenfolge unter den Geschwistern
+                    dirty.pop(c.node_id, None)
+                    dirty[c.node_id] = "remove" if c.op == "remove" else "place"
+        with self._lock, self._transaction():
+            pid = self._project_id(name)
+            position = self._conn.execute(
+                "SELECT next_position FROM projects WHERE id = ?", (pid,)).fetchone()[0]
+            rows, placed = [], []
+            for nid, op in dirty.items():
+                node = tree.get(nid)
+                if op == "remove" or node is None:
+                    # Auch nicht geladene Nachfahren eines lazy geöffneten Projekts
+                    self._conn.execute(
+                        _SUBTREE + "DELETE FROM nodes WHERE project = ?1 AND id IN (SELECT id FROM sub)",
+                        (pid, nid, None))
+                else:
+                    (placed if op == "place" else rows).append(
+                        (pid, node.id, node.parent, node.name, node.status, node.comment, position))
+                    position += 1
+            self._conn.executemany(_UPSERT, rows)
+            self._conn.executemany(_UPSERT_PLACED, placed)
+            self._bump(pid, next_position=position)
+            self._synced[name] = (weakref.ref(tree), tree.revision)
+        return len(dirty)
+
+    def _bump(self, pid: int, next_position: int) -> int:
+        self._conn.execute(
+            "UPDATE projects SET revision = revision + 1, next_position = ?, updated = ? WHERE id = ?",
+            (next_position, time.time(), pid))
+        return self._conn.execute("SELECT revision FROM projects WHERE id = ?", (pid,)).fetchone()[0]
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    # ── Lesen
+    def _nodes(self, sql: str, params: tuple) -> List[Node]:
+        with self._lock:
+            return [Node(id=r[0], name=r[1], parent=r[2], status=r[3], comment=r[4])
+                    for r in self._conn.execute(sql, params)]
+
+    @profiled()
+    def load(self, name: str, shared: bool = False) -> GoalTree:
+        """
+        The complete project. With ``shared`` the result is a copy-on-write
+        fork of a process-wide tree (see ``data_model.share``), so sessions
+        opening the same project revision share its nodes.
+        """
+        with self._lock:
+            pid = self._project_id(name)
+            tree = GoalTree(self._nodes(
+                f"SELECT {_COLUMNS} FROM nodes n WHERE n.project = ? ORDER BY n.position", (pid,)))
+        if shared:
+            tree = share(tree)
+        self._synced[name] = (weakref.ref(tree), tree.revision)
+        return tree
+
+    @profiled()
+    def open(self, name: str, depth: int = 1) -> GoalTree:
+        """
+        Main goals and their descendants down to ``depth`` (0 = main goals
+        only); load more with :meth:`expand`. Changes can be autosaved as
+        usual.
+        """
+        with self._lock:
+            pid = self._project_id(name)
+            tree = GoalTree(self._nodes(
+                "WITH RECURSIVE sub(id, lvl) AS ("
+                "  SELECT id, 0 FROM nodes WHERE project = ?1 AND parent IS NULL"
+                "  UNION ALL"
+                "  SELECT c.id, sub.lvl + 1 FROM nodes c JOIN sub ON c.project = ?1 AND c.parent = sub.id"
+                "  WHERE sub.lvl < ?2"
+                f") SELECT {_COLUMNS} FROM nodes n JOIN sub ON n.project = ?1 AND n.id = sub.id "
+                "ORDER BY n.position", (pid, depth)))
+        self._synced[name] = (weakref.ref(tree), tree.revision)
+        self._partial[tree] = name
+        return tree
+
+    def load_subtree(self, name: str, node_id: str, depth: Optional[int] = None) -> List[Node]:
+        """``node_id`` and its descendants down to ``depth`` levels (``None`` = all)."""
+        with self._lock:
+            pid = self._project_id(name)
+            return self._nodes(
+                _SUBTREE + f"SELECT {_COLUMNS} FROM nodes n JOIN sub ON n.project = ?1 AND n.id = sub.id "
+                "ORDER BY sub.lvl, n.position", (pid, node_id, depth))
+
+    def has_children(self, name: str, node_id: str) -> bool:
+        with self._lock:
+            pid = self._project_id(name)
+            return self._conn.execute(
+                "SELECT 1 FROM nodes WHERE project = ? AND parent = ? LIMIT 1", (pid, node_id)
+            ).fetchone() is not None
+
+    @profiled()
+    def expand(self, name: str, tree: GoalTree, node_id: Optional[str] = None,
+               depth: Optional[int] = 1) -> int:
+        """
+        Adds the not yet loaded part below ``node_id`` (``None`` = every
+        main goal) to ``tree``. Loading is not a change: if the tree was in
+        sync with the store before, it stays in sync. Returns the number of
+        added nodes.
+        """
+        if node_id is None:
+            added = sum(self.expand(name, tree, r.id, depth) for r in tree.roots())
+            if depth is None:
+                self._partial.pop(tree, None)
+            return added
+        synced = self._synced.get(name)
+        in_sync = synced is not None and synced[0]() is tree and synced[1] == tree.revision
+        added = 0
+        # Nachladen ist keine Bearbeitung – nicht in die Undo-Historie
+        with tree.journal_paused():
+            for n in self.load_subtree(name, node_id, depth):
+                if n.id not in tree:
+                    tree.add(n)
+                    added += 1
+        if in_sync:
+            self._synced[name] = (weakref.ref(tree), tree.revision)
+        return added
+
+
+_STORE: Optional[ProjectStore] = None
+_STORE_LOCK = threading.Lock()
+
+def get_store(path: str | Path = DEFAULT_DB) -> ProjectStore:
+    """Process-wide store (one connection for all sessions)."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None or _STORE.path != Path(path):
+            _STORE = ProjectStore(path)
+        return _STORE
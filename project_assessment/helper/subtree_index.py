@@ -0,0 +1,150 @@
+"""
+subtree_index.py
+----------------
+Euler-Tour-Index für Kennzahlen je Teilbaum.
+
+• Ein Pre-Order-Durchlauf vergibt jedem Knoten ``tin``; ``tout`` ist die
+  letzte Position seines Teilbaums. Teilbaum = ``order[tin:tout + 1]``,
+  Größe und „liegt in“ sind damit O(1).
+• Status-Zähler und Höhe je Teilbaum werden einmal in O(n) von unten nach
+  oben aufgebaut; Abfragen sind O(1).
+• Statusänderungen (aus dem Änderungsprotokoll des GoalTree) korrigieren
+  nur die Zähler der Vorfahren – O(Tiefe). Strukturänderungen bauen den
+  Index neu auf.
+"""
+
+from __future__ import annotations
+
+import weakref
+from array import array
+from typing import Dict, List
+
+from project_assessment.helper.data_model import GoalTree, STATUS_CHOICES
+from project_assessment.helper.profiler import profiled
+
+_CODE = {s: i for i, s in enumerate(STATUS_CHOICES)}
+
+
+class SubtreeIndex:
+    """Subtree sizes, heights and status counts of one GoalTree."""
+
+    def __init__(self, tree: GoalTree):
+        self._tree = weakref.ref(tree)
+        self.revision = -1
+        self.rebuilds = 0
+        self._build(tree)
+
+    @property
+    def tree(self) -> GoalTree:
+        tree = self._tree()
+        if tree is None:
+            raise ReferenceError("The indexed GoalTree no longer exists")
+        return tree
+
+    # ── Aufbau und Pflege
+    def _build(self, tree: GoalTree) -> None:
+        order: List[str] = []
+        parent_pos = array("i")
+        tin: Dict[str, int] = {}
+        codes = bytearray()
+        # Pre-Order: der Parent hat seine Position immer vor den Kindern
+        for node in tree.walk():
+            tin[node.id] = len(order)
+            order.append(node.id)
+            parent_pos.append(tin.get(node.parent, -1) if node.parent is not None else -1)
+            codes.append(_CODE[node.status])
+
+        n = len(order)
+        counts = [array("i", [0]) * n for _ in STATUS_CHOICES]
+        size = array("i", [1]) * n
+        height = array("i", [0]) * n
+        for pos in range(n):
+            counts[codes[pos]][pos] = 1
+        # Kinder stehen immer hinter ihrem Parent – rückwärts aufsummieren
+        for pos in range(n - 1, -1, -1):
+            p = parent_pos[pos]
+            if p >= 0:
+                size[p] += size[pos]
+                for c in counts:
+                    c[p] += c[pos]
+                if height[pos] + 1 > height[p]:
+                    height[p] = height[pos] + 1
+
+        self._order, self._tin, self._parent_pos = order, tin, parent_pos
+        self._codes = codes
+        self._counts, self._size, self._height = counts, size, height
+        self.revision = tree.revision
+        self.rebuilds += 1
+
+    def sync(self) -> None:
+        """Catches up with the tree: status deltas in O(depth), anything else rebuilds."""
+        tree = self.tree
+        if tree.revision == self.revision:
+            return
+        changes = tree.changes_since(self.revision)
+        if changes is None or any(c.op != "update" for c in changes):
+            self._build(tree)
+            return
+        for nid in dict.fromkeys(c.node_id for c in changes):
+            pos = self._tin[nid]
+            old, new = self._codes[pos], _CODE[tree[nid].status]
+            if old != new:
+                self._codes[pos] = new
+                while pos >= 0:
+                    self._counts[old][pos] -= 1
+                    self._counts[new][pos] += 1
+                    pos = self._parent_pos[pos]
+        self.revision = tree.revision
+
+    # ── Abfragen (O(1))
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._tin
+
+    def size(self, node_id: str) -> int:
+        return self._size[self._tin[node_id]]
+
+    def height(self, node_id: str) -> int:
+        """Levels below ``node_id`` (0 for a leaf)."""
+        return self._height[self._tin[node_id]]
+
+    def position(self, node_id: str) -> int:
+        """Pre-order position; sorting by it yields tree order."""
+        return self._tin[node_id]
+
+    def span(self, node_id: str) -> tuple:
+        """(tin, tout) – the subtree occupies these Euler-tour positions."""
+        pos = self._tin[node_id]
+        return pos, pos + self._size[pos] - 1
+
+    def is_within(self, node_id: str, root_id: str) -> bool:
+        """True if ``node_id`` lies in the subtree of ``root_id`` (itself included)."""
+        tin, tout = self.span(root_id)
+        return tin <= self._tin[node_id] <= tout
+
+    def subtree_ids(self, node_id: str) -> List[str]:
+        tin, tout = self.span(node_id)
+        return self._order[tin:tout + 1]
+
+    def counts(self, node_id: str) -> Dict[str, int]:
+        pos = self._tin[node_id]
+        return {s: self._counts[i][pos] for i, s in enumerate(STATUS_CHOICES)}
+
+    def metrics(self, node_id: str) -> Dict[str, float]:
+        """Same keys as ``analysis.compute_metrics``, for one subtree."""
+        counts = self.counts(node_id)
+        total = self.size(node_id)
+        out: Dict[str, float] = {"total": total, **counts}
+        out.update({f"{s}_pct": counts[s] / total for s in STATUS_CHOICES})
+        return out
+
+
+_INDEXES: "weakref.WeakKeyDictionary[GoalTree, SubtreeIndex]" = weakref.WeakKeyDictionary()
+
+@profiled()
+def subtree_index(tree: GoalTree) -> SubtreeIndex:
+    """The (synchronised) subtree index of ``tree``, built on first use."""
+    index = _INDEXES.get(tree)
+    if index is None:
+        index = _INDEXES[tree] = SubtreeIndex(tree)
+    index.sync()
+    return index
@@ -1,18 +1,21 @@
-from typing import List
-from project_assessment.helper.data_model import Node
+from typing import Iterable
+from project_assessment.helper.data_model import Node, as_tree
+from project_assessment.helper.profiler import profiled
 
-def generate_summary(nodes: List[Node]) -> str:
+@profiled()
+def generate_summary(nodes: Iterable[Node]) -> str:
     """
     Erstellt eine Zusammenfassung:
     - Listet rote und gelbe Knoten auf.
     - Fettet alle Parent-Knoten (Ziele und Achsen).
     """
     # 1) Ermittel alle Parent-IDs (haben mindestens ein Kind)
-    parent_ids = {n.id for n in nodes if any(m.parent == n.id for m in nodes)}
+    tree = as_tree(nodes)
+    parent_ids = tree.parent_ids()
 
     # 2) Sammle Labels, fett bei Parent
     reds, yellows = [], []
-    for n in nodes:
+    for n in tree:
         label = f"**{n.name}**" if n.id in parent_ids else n.name
         if n.status == "red":
             reds.append(label)
@@ -7,17 +7,31 @@ Erzeugt für jedes eingegebene Projektziel einen hierarchischen Baum
 • Die Fragen‑ und Achsen‑Definitionen werden primär aus
   'config/questions.yaml' geladen.
 
+• Der Katalog wird einmal zu einem unveränderlichen Template geparst
+  (Cache nach Pfad + mtime) und pro Ziel nur noch mit neuen IDs geklont.
+
 • Fehlt die YAML oder ist defekt, greift ein minimalistisches Fallback‑Gerüst
   (Achsen ohne Fragen), damit die App nicht abstürzt.
+
+• ``project_tree`` baut den Baum einer neuen Session als Copy-on-write-
+  Fork eines prozessweit eingefrorenen Katalogbaums (einer je Anzahl
+  Ziele): Achsen und Fragen teilen sich alle Sessions, nur die Ziele und
+  bearbeitete Knoten gehören der Session. Ziel-IDs sind zufällig, Achsen-
+  und Frage-IDs stehen für die Katalogposition (Ziel-Nr. + Pfad) und sind
+  daher in allen so erzeugten Projekten gleich. ``build_tree`` liefert
+  weiterhin eine Liste mit durchweg frischen IDs.
 """
 
 from __future__ import annotations
 
-from typing import List, Dict, Any
+import threading
+import weakref
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
 from pathlib import Path
-import yaml
+from uuid import NAMESPACE_URL, UUID, uuid5
 
-from project_assessment.helper.data_model import Node
+from project_assessment.helper.data_model import GoalTree, Node
+from project_assessment.helper.profiler import profiled
 
 
 # --------------------------------------------------------------------------- #
@@ -26,6 +40,9 @@ from project_assessment.helper.data_model import Node
 # YAML‑Pfad – bei Bedarf anpassen
 QUESTIONS_YAML = Path("config/questions.yaml")
 
+# Namensraum der festen IDs im geteilten Katalogbaum
+CATALOGUE_NAMESPACE = uuid5(NAMESPACE_URL, "project-goals/catalogue")
+
 # Minimal‑Fallback (keine Fragen), falls YAML fehlt/unkorrekt
 FALLBACK_QUESTIONS: dict[str, list[str]] = {
     "Prozess": [],
@@ -70,64 +87,142 @@ def process_yaml_node(node: Any, parent_id: str, nodes: List[Node], level: int =
         nodes.append(Node(name=node, parent=parent_id))
 
 
-def load_questions(path: Path = QUESTIONS_YAML) -> List[Node]:
+class TemplateNode(NamedTuple):
+    """Unveränderlicher Knoten des geparsten Fragenkatalogs (ohne IDs)."""
+    name: str
+    children: Tuple["TemplateNode", ...] = ()
+
+
+# Prozessweiter Cache: (Pfad, mtime) → geparster Katalog
+_TEMPLATE_CACHE: Dict[Tuple[str, float], Tuple[TemplateNode, ...]] = {}
+_TEMPLATE_LOCK = threading.Lock()
+
+
+def parse_questions(yaml_text: str) -> Tuple[TemplateNode, ...]:
     """
-    Versucht, die Achsen/Fragen aus der YAML zu laden.
+    Parst den Katalog anhand der Einrückung (eine Zeile = ein Knoten) in
+    einen unveränderlichen Template-Baum.
+    """
+    roots: list = []
+    # (Kinderliste, Einrückung); die Wurzel hat Einrückung -1
+    stack: list = [(roots, -1)]
+    entries: list = []  # (name, Kinderliste) in Dokumentreihenfolge
+
+    for line in yaml_text.split('\n'):
+        if not line.strip():
+            continue
+
+        # Count leading spaces to determine indentation level
+        indent = len(line) - len(line.lstrip())
+        content = line.strip()
+
+        # Skip empty lines and comments
+        if not content or content.startswith('#'):
+            continue
+
+        # Remove list markers
+        if content.startswith('- '):
+            content = content[2:]
+
+        # Pop stack until we find the appropriate parent
+        while len(stack) > 1 and stack[-1][1] >= indent:
+            stack.pop()
+
+        children: list = []
+        stack[-1][0].append((content, children))
+        stack.append((children, indent))
+
+    def freeze(items: list) -> Tuple[TemplateNode, ...]:
+        return tuple(TemplateNode(name, freeze(ch)) for name, ch in items)
+
+    return freeze(roots)
+
+
+def load_question_template(path: Path = QUESTIONS_YAML) -> Tuple[TemplateNode, ...]:
+    """
+    Geparster Fragenkatalog, gecacht nach Pfad und mtime – die Datei wird
+    nur neu gelesen, wenn sie sich geändert hat.
     Gibt bei Fehlern das Fallback‑Gerüst zurück.
     """
-    if path.exists():
-        try:
-            # Read the YAML file as text to preserve indentation
-            yaml_text = path.read_text(encoding="utf-8")
-            # Split into lines and process indentation
-            lines = yaml_text.split('\n')
-            nodes = []
-            stack = [(None, -1)]  # (parent_id, indentation_level)
-            
-            for line in lines:
-                if not line.strip():
-                    continue
-                    
-                # Count leading spaces to determine indentation level
-                indent = len(line) - len(line.lstrip())
-                content = line.strip()
-                
-                # Skip empty lines and comments
-                if not content or content.startswith('#'):
-                    continue
-                    
-                # Remove list markers
-                if content.startswith('- '):
-                    content = content[2:]
-                
-                # Pop stack until we find the appropriate parent
-                while stack and stack[-1][1] >= indent:
-                    stack.pop()
-                
-                # Create new node
-                parent_id = stack[-1][0]
-                node = Node(name=content, parent=parent_id)
-                nodes.append(node)
-                
-                # Push this node onto the stack
-                stack.append((node.id, indent))
-            
-            return nodes
-        except yaml.YAMLError as err:
-            print(f"[WARN] YAML‑Parse‑Fehler in {path}: {err}")
-    else:
+    try:
+        key = (str(path), path.stat().st_mtime)
+    except FileNotFoundError:
         print(f"[INFO] {path} nicht gefunden – nutze Fallback‑Fragen.")
+        return tuple(TemplateNode(category) for category in FALLBACK_QUESTIONS)
+
+    template = _TEMPLATE_CACHE.get(key)
+    if template is None:
+        template = parse_questions(path.read_text(encoding="utf-8"))
+        # Sessions laufen in eigenen Threads: alte Versionen derselben Datei
+        # verwerfen und das zuerst eingetragene Template für alle verwenden
+        with _TEMPLATE_LOCK:
+            for old in [k for k in _TEMPLATE_CACHE if k[0] == key[0] and k != key]:
+                del _TEMPLATE_CACHE[old]
+            template = _TEMPLATE_CACHE.setdefault(key, template)
+    return template
+
 
-    # Return fallback structure
-    nodes = []
-    for category in FALLBACK_QUESTIONS:
-        node = Node(name=category)
-        nodes.append(node)
+def instantiate_template(template: Tuple[TemplateNode, ...], parent_id: str | None = None,
+                         namespace: Optional[UUID] = None) -> List[Node]:
+    """
+    Klont den Template-Baum unter ``parent_id``: mit frischen IDs oder,
+    mit ``namespace``, mit IDs aus dem Pfad im Katalog (``"0.2.1"``).
+    Die Knoten kommen in Dokumentreihenfolge (pre-order) zurück.
+    """
+    nodes: List[Node] = []
+    append = nodes.append
+    stack = [(t, parent_id, str(i)) for i, t in reversed(list(enumerate(template)))]
+    while stack:
+        tpl, pid, path = stack.pop()
+        if namespace is None:
+            node = Node(name=tpl.name, parent=pid)
+        else:
+            node = Node(id=str(uuid5(namespace, path)), name=tpl.name, parent=pid)
+        append(node)
+        if tpl.children:
+            nid = node.id
+            stack.extend((c, nid, f"{path}.{i}") for i, c in reversed(list(enumerate(tpl.children))))
     return nodes
 
 
+# Eingefrorene Katalogbäume je Anzahl Ziele zum aktuell gecachten Template
+# (leben, solange ein Fork sie nutzt)
+_CATALOGUE: Optional[Tuple[Tuple[TemplateNode, ...], "weakref.WeakValueDictionary[int, GoalTree]"]] = None
+_CATALOGUE_LOCK = threading.Lock()
+
+
+def _catalogue_base(template: Tuple[TemplateNode, ...], slots: int) -> GoalTree:
+    """
+    Frozen tree with ``slots`` copies of the catalogue, each below a
+    nameless placeholder goal; IDs derive from slot and catalogue path.
+    """
+    global _CATALOGUE
+    with _CATALOGUE_LOCK:
+        if _CATALOGUE is None or _CATALOGUE[0] is not template:
+            _CATALOGUE = (template, weakref.WeakValueDictionary())
+        bases = _CATALOGUE[1]
+        base = bases.get(slots)
+        if base is None:
+            nodes: List[Node] = []
+            for slot in range(slots):
+                ns = uuid5(CATALOGUE_NAMESPACE, str(slot))
+                nodes.append(Node(id=str(ns), name=""))
+                nodes.extend(instantiate_template(template, str(ns), ns))
+            base = bases[slots] = GoalTree(nodes).freeze()
+    return base
+
+
+def load_questions(path: Path = QUESTIONS_YAML) -> List[Node]:
+    """
+    Versucht, die Achsen/Fragen aus der YAML zu laden.
+    Gibt bei Fehlern das Fallback‑Gerüst zurück.
+    """
+    return instantiate_template(load_question_template(path))
+
+
 # 2.  Öffentliche API
 # --------------------------------------------------------------------------- #
+@profiled()
 def build_tree(goals: List[str]) -> List[Node]:
     """
     Baut die Node‑Liste für alle übergebenen Projektziele.
@@ -152,6 +247,8 @@ def build_tree(goals: List[str]) -> List[Node]:
      └─ ...
     """
     nodes: list[Node] = []
+    # Katalog nur einmal pro Aufruf holen (und prozessweit gecacht)
+    template = load_question_template()
 
     for raw_goal in goals:
         goal = raw_goal.strip()
@@ -162,11 +259,25 @@ def build_tree(goals: List[str]) -> List[Node]:
         root = Node(name=goal)
         nodes.append(root)
 
-        # Load and process the YAML structure
-        yaml_nodes = load_questions()
-        for node in yaml_nodes:
-            if node.parent is None:  # Top-level nodes
-                node.parent = root.id
-            nodes.append(node)
+        # Katalog-Template mit frischen IDs klonen und unter das Ziel hängen
+        nodes.extend(instantiate_template(template, root.id))
 
     return nodes
+
+
+@profiled()
+def project_tree(goals: List[str]) -> GoalTree:
+    """
+    Wie :func:`build_tree`, aber als Copy-on-write-Fork des geteilten
+    Katalogbaums: jedes Ziel bekommt eine zufällige ID und übernimmt die
+    Achsen eines Platzhalters; Achsen werden dabei kopiert, Fragen bleiben
+    geteilt, bis sie bearbeitet werden.
+    """
+    goals = [g.strip() for g in goals if g.strip()]
+    tree = _catalogue_base(load_question_template(), len(goals)).fork()
+    for placeholder, goal in zip(tree.roots(), goals):
+        root = tree.add(Node(name=goal))
+        for axis_id in tree.child_ids(placeholder.id):
+            tree.move(axis_id, root.id)
+        tree.remove(placeholder.id)
+    return tree
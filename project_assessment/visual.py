@@ -3,9 +3,10 @@ import json
 import streamlit as st
 
 from state_utils import get_nodes
-from visualization.visualizer import build_network, render_network
-from visualization.visualizer3d import build_plotly_3d     # 3-D-Version
-from project_assessment.helper.data_model import Node
+from visualization.layout import LAYOUT_ALGORITHMS, get_layout
+from visualization.lod import DEFAULT_NODE_BUDGET, build_lod_view
+from project_assessment.helper.data_model import Node, GoalTree
+from project_assessment.helper import profiler
 
 # Status-Farben (konsistent mit editor.py und drilldown.py)
 STATUS_COLORS = {
@@ -23,17 +24,55 @@ def render():
 
     st.subheader("🌳 Visualization")
 
+    # networkx/pyvis erst hier laden – nicht schon beim Start der App
+    from visualization.visualizer import build_network, render_network
+
     # ── 1) Optionen
-    col_view, _ = st.columns([1, 4])
+    col_view, col_layout, col_lod, col_budget = st.columns([1, 1, 1, 1])
     view_3d = col_view.checkbox("Enable 3-D view")
+    layout = col_layout.selectbox(
+        "Layout", LAYOUT_ALGORITHMS,
+        format_func={"radial": "Tree (radial)", "hierarchical": "Tree (hierarchical)",
+                     "spring": "Force-directed"}.get,
+    )
+    lod = col_lod.checkbox("Level of detail", value=len(nodes) > DEFAULT_NODE_BUDGET,
+                           help="Collapse deeper levels into aggregate nodes.")
+    budget = col_budget.number_input("Node budget", min_value=20, max_value=5000,
+                                     value=DEFAULT_NODE_BUDGET, step=50, disabled=not lod)
+
+    # ── 2) Sichtbaren Ausschnitt wählen (Level of Detail)
+    shown, aggregates = nodes, {}
+    if lod:
+        expanded = st.session_state.get("visual_expanded", [])
+        view = build_lod_view(nodes, expanded=set(expanded), budget=int(budget))
+        shown, aggregates = GoalTree(view.nodes), view.collapsed
+        options = list(dict.fromkeys([*expanded, *view.counts]))
+        st.multiselect(
+            "Expand collapsed goals", options, key="visual_expanded",
+            format_func=lambda nid: nodes[nid].name if nid in nodes else nid,
+        )
+        # Nur echte Ziele zählen – Aggregate und „+k more goals“ sind Platzhalter
+        real = sum(1 for n in view.nodes if n.id in nodes)
+        st.caption(f"Showing {real} of {len(nodes)} nodes; "
+                   f"{len(view.nodes) - real} collapsed groups.")
 
-    # ── 2) Netzwerk-Graph bauen
-    g = build_network(nodes)
-    parent_ids = [n.id for n in nodes if any(ch.parent == n.id for ch in nodes)]
+    # ── 3) Netzwerk-Graph bauen
+    g = build_network(shown)
+    parent_ids = shown.parent_ids() | set(aggregates)
+    for agg_id in aggregates:
+        # Aggregat-Knoten: Kasten in der Farbe des kritischsten Status
+        color = STATUS_COLORS.get(shown[agg_id].status, "#888888")
+        g.nodes[agg_id].update(shape="box", borderWidth=2, color={"border": color, "background": "#ffffff"})
 
-    # ── 3) Rendern
+    # ── 4) Rendern
+    # Positionen hängen nur von der Topologie ab und sind gecacht
+    pos = get_layout(shown, dim=3 if view_3d else 2, algorithm=layout)
     if view_3d:
-        fig = build_plotly_3d(g, parent_ids)
+        from visualization.visualizer3d import build_plotly_3d     # Plotly nur für die 3-D-Ansicht
+        fig = build_plotly_3d(g, parent_ids, pos=pos)
+        if profiler.active():
+            # Serialisierung nur bei aktivem Profiler – bei großen Figuren teuer
+            profiler.record_bytes("plotly_figure", len(fig.to_json()))
         st.plotly_chart(
             fig,
             use_container_width=True,
@@ -49,7 +88,8 @@ def render():
             },
         )
     else:
-        net = render_network(g)
+        net = render_network(g, pos=pos)
         html = net.generate_html(notebook=False)
+        profiler.record_bytes("pyvis_html", len(html.encode("utf-8")))
         st.components.v1.html(html, height=650, scrolling=True)
         
\ No newline at end of file
@@ -1,4 +1,5 @@
 import streamlit as st
+from project_assessment.helper.profiler import Profiler
 
 def render_sidebar(mode):
 
@@ -7,3 +8,28 @@ def render_sidebar(mode):
     st.sidebar.radio("Choose your scenario", [
         "Project Assessment"
     ], key="workflow_mode")
+
+    # Opt-in Diagnose: misst jeden Rerun der Abschnitte
+    if st.sidebar.checkbox("🩺 Diagnostics", key="diagnostics_enabled",
+                           help="Time each section and helper call on every rerun."):
+        st.session_state.setdefault("profiler", Profiler())
+
+def render_diagnostics():
+    """Performance panel; call after the sections so it shows the current rerun."""
+    profiler = st.session_state.get("profiler")
+    if not st.session_state.get("diagnostics_enabled") or profiler is None:
+        return
+
+    with st.sidebar.expander("⏱ Performance", expanded=True):
+        stats = profiler.stats()
+        st.caption(f"{profiler.reruns} reruns, percentiles over the last {profiler.window}")
+        if stats:
+            rows = [{"label": label, **{k: round(v, 2) if isinstance(v, float) else v
+                                         for k, v in row.items()}}
+                    for label, row in sorted(stats.items())]
+            st.dataframe(rows, hide_index=True, use_container_width=True)
+        col_export, col_reset = st.columns(2)
+        col_export.download_button("Export JSON", profiler.to_json(),
+                                   file_name="diagnostics.json", mime="application/json")
+        if col_reset.button("Reset"):
+            profiler.clear()
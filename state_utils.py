@@ -1,17 +1,41 @@
 # state_utils.py
 import streamlit as st
-from typing import List
-from project_assessment.helper.data_model import Node
+from typing import Iterable
+from project_assessment.helper.data_model import Node, GoalTree, as_tree
+from project_assessment.helper.data_store import load_snapshot, snapshot_bytes
 
-def get_nodes() -> List[Node]:
-    """Garantiert ein Knoten-Array im Session-State und gibt es zurück."""
-    if "nodes" not in st.session_state:
-        st.session_state["nodes"] = []
+def get_nodes() -> GoalTree:
+    """Garantiert einen (indizierten) Knoten-Baum im Session-State und gibt ihn zurück."""
+    if not isinstance(st.session_state.get("nodes"), GoalTree):
+        st.session_state["nodes"] = as_tree(st.session_state.get("nodes") or [])
     return st.session_state["nodes"]
 
-def set_nodes(nodes: List[Node]) -> None:
-    """Schreibt das Knoten-Array zurück in den Session-State."""
-    st.session_state["nodes"] = nodes
+def set_nodes(nodes: Iterable[Node]) -> None:
+    """
+    Schreibt den Knoten-Baum zurück in den Session-State (Listen werden indiziert)
+    und erhöht die Session-Revision.
+    """
+    st.session_state["nodes"] = as_tree(nodes)
+    st.session_state["tree_revision"] = st.session_state.get("tree_revision", 0) + 1
+
+def remember_base(nodes: Iterable[Node]) -> None:
+    """
+    Merkt sich den gerade geladenen Stand als Basis für spätere Drei-Wege-Merges
+    (kompakt als Snapshot, unabhängig von späteren Änderungen am Baum).
+    """
+    st.session_state["merge_base"] = as_tree(nodes).memo("snapshot", snapshot_bytes)
+
+def get_base() -> GoalTree:
+    """Der gemerkte Basis-Stand (leer, wenn keiner existiert)."""
+    raw = st.session_state.get("merge_base")
+    return GoalTree(load_snapshot(raw) if raw else [])
+
+def tree_revision() -> tuple:
+    """
+    Eindeutiger Stand des Baums in dieser Session:
+    (Anzahl set_nodes-Aufrufe, interne Revision des GoalTree).
+    """
+    return st.session_state.get("tree_revision", 0), get_nodes().revision
 
 def analysis_done(flag: bool | None = None) -> bool:
     """
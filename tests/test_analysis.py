@@ -0,0 +1,73 @@
+import random
+
+from project_assessment.helper.analysis import (
+    aggregate_status, compute_metrics, critical_path_forest, critical_paths, update_status,
+)
+from project_assessment.helper.data_model import STATUS_CHOICES, GoalTree, Node
+from project_assessment.helper.subtree_index import subtree_index
+
+
+def _node(nid, parent=None, status="green"):
+    return Node(id=nid, name=nid, parent=parent, status=status, comment="")
+
+
+def _tree():
+    # G ─ A ─ A1 (red), A2 ; G ─ B ─ B1 (yellow)
+    return GoalTree([_node("G"), _node("A", "G"), _node("A1", "A", "red"), _node("A2", "A"),
+                     _node("B", "G"), _node("B1", "B", "yellow")])
+
+
+def _random_tree(n, seed):
+    rnd = random.Random(seed)
+    nodes = [_node("n0")]
+    for i in range(1, n):
+        nodes.append(_node(f"n{i}", f"n{rnd.randrange(i)}", rnd.choice(STATUS_CHOICES)))
+    return GoalTree(nodes)
+
+
+def test_aggregate_status_raises_parents_only():
+    tree = _tree()
+    assert sorted(aggregate_status(tree)) == ["A", "B", "G"]
+    assert [tree[i].status for i in ("G", "A", "A2", "B")] == ["red", "red", "green", "yellow"]
+    assert aggregate_status(tree) == []
+
+
+def test_update_status_stops_at_critical_ancestor():
+    tree = _tree()
+    aggregate_status(tree)
+    assert update_status(tree, "B1", "red") == ["B1", "B"]
+    assert update_status(tree, "A2", "yellow") == ["A2"]
+    # Ein Roll-up senkt keinen Status
+    assert update_status(tree, "A1", "green") == ["A1"] and tree["A"].status == "red"
+
+
+def test_metrics_and_critical_paths():
+    tree = _tree()
+    aggregate_status(tree)
+    assert compute_metrics(tree) == {"total": 6, "red": 3, "yellow": 2, "green": 1,
+                                     "red_pct": 0.5, "yellow_pct": 2 / 6, "green_pct": 1 / 6}
+    assert critical_paths(tree) == [["G"], ["G", "A"], ["G", "A", "A1"]]
+    (root,) = critical_path_forest(tree)
+    assert (root.id, root.red, root.size) == ("G", 3, 6)
+    assert [c.id for c in root.children] == ["A"] and root.children[0].children[0].id == "A1"
+
+
+def test_subtree_index_follows_edits():
+    tree = _random_tree(300, seed=3)
+    rnd = random.Random(4)
+    index = subtree_index(tree)
+    for step in range(60):
+        nid = f"n{rnd.randrange(len(tree))}"
+        if step % 10 == 9:
+            # Strukturänderung → Neuaufbau
+            tree.add(_node(f"x{step}", nid, "red"))
+        else:
+            tree.update(nid, status=rnd.choice(STATUS_CHOICES))
+        index = subtree_index(tree)
+        probe = f"n{rnd.randrange(300)}"
+        sub = [tree[i] for i in tree.subtree_ids(probe)]
+        assert index.size(probe) == len(sub)
+        assert index.counts(probe) == {s: sum(n.status == s for n in sub) for s in STATUS_CHOICES}
+        assert set(index.subtree_ids(probe)) == {n.id for n in sub}
+        assert index.is_within(sub[-1].id, probe)
+    assert index.rebuilds == 1 + 6
@@ -0,0 +1,129 @@
+import pytest
+
+from project_assessment.helper.data_model import GoalTree, Node
+
+
+def _node(nid, parent=None, status="yellow"):
+    return Node(id=nid, name=nid, parent=parent, status=status, comment="")
+
+
+def _base():
+    # R ─ A ─ A1, A2 ; R ─ B
+    return GoalTree([_node("R"), _node("A", "R"), _node("A1", "A"), _node("A2", "A"), _node("B", "R")]).freeze()
+
+
+def _shape(tree):
+    return [(n.id, n.parent, n.status, tree.depth(n.id)) for n in tree.walk()]
+
+
+def test_fork_edits_do_not_touch_the_base():
+    base = _base()
+    before = _shape(base)
+    fork = base.fork()
+    fork.update("A1", status="red")
+    fork.add(_node("C", "B"))
+    fork.move("A2", "B")
+    fork.remove("A")
+    assert _shape(base) == before
+    assert _shape(fork) == [("R", None, "yellow", 0), ("B", "R", "yellow", 1),
+                            ("C", "B", "yellow", 2), ("A2", "B", "yellow", 2)]
+    assert {n.id for n in fork.find("", ["yellow"], 2)} == {"C", "A2"}
+    assert "A1" not in fork and "A1" in base
+    with pytest.raises(ValueError):
+        base.update("R", name="x")
+
+
+def test_fork_copies_only_the_nodes_it_writes():
+    base = _base()
+    fork = base.fork()
+    assert fork.shared_nodes == len(base)
+    fork.update("A1", name="changed")
+    assert fork.shared_nodes == len(base) - 1
+    assert fork["A2"] is base["A2"] and fork["A1"] is not base["A1"]
+    # Der Fork eines eingefrorenen Forks sieht dessen Änderungen
+    grandchild = fork.freeze().fork()
+    assert grandchild["A1"].name == "changed"
+    grandchild.remove("A1")
+    assert "A1" in fork and [n.id for n in grandchild.children("A")] == ["A2"]
+
+
+def test_fork_flattens_after_many_changes():
+    base = _base()
+    fork = base.fork()
+    for nid in ("R", "A", "A1", "A2", "B"):
+        fork.update(nid, status="green")
+    assert fork.shared_nodes == 0
+    fork.add(_node("D", "B"))
+    assert type(fork._nodes) is dict
+    assert fork.depth("D") == 2 and base.get("D") is None
+    assert [n.id for n in fork.find("", ["yellow"])] == ["D"]
+
+
+def _check_indexes(tree):
+    """Kinder-, Tiefen-, Ebenen- und Status-Index gegen einen Neuaufbau prüfen."""
+    fresh = GoalTree([Node(**n.to_dict()) for n in tree])
+    for n in tree:
+        assert tree.depth(n.id) == fresh.depth(n.id)
+        assert tree.child_ids(n.id) == fresh.child_ids(n.id)
+    assert tree.max_depth() == fresh.max_depth()
+    for d in range(tree.max_depth() + 1):
+        assert {n.id for n in tree.at_depth(d)} == {n.id for n in fresh.at_depth(d)}
+    for status in ("red", "yellow", "green"):
+        assert {n.id for n in tree.find("", [status])} == {n.id for n in fresh.find("", [status])}
+
+
+def test_indexes_follow_edits():
+    tree = GoalTree([_node("R"), _node("A", "R"), _node("A1", "A"), _node("B", "R"), _node("X", "missing")])
+    assert [n.id for n in tree.roots()] == ["R"]
+    assert [n.id for n in tree.top_nodes()] == ["R", "X"]
+    assert [n.id for n in tree.path("A1")] == ["R", "A", "A1"]
+    tree.move("A", "B")
+    assert tree.depth("A1") == 3
+    tree.update("A1", status="red", name="Budget plan")
+    tree.add(_node("missing"))          # der fehlende Parent taucht auf
+    assert tree.depth("X") == 1 and [n.id for n in tree.roots()] == ["R", "missing"]
+    tree.reorder("R", ["B"])
+    tree.remove("B")
+    assert "A1" not in tree
+    _check_indexes(tree)
+    assert [n.id for n in tree.find("budget")] == []
+
+
+def test_find_filters_text_status_and_depth():
+    tree = _base().fork()
+    tree.update("A1", name="Risk log", status="red")
+    tree.update("B", name="risk owner")
+    assert [n.id for n in tree.find("RISK")] == ["A1", "B"]
+    assert [n.id for n in tree.find("risk", ["red"])] == ["A1"]
+    assert [n.id for n in tree.find("risk", depth=1)] == ["B"]
+
+
+def test_change_log_and_memo():
+    tree = _base().fork()
+    start = tree.revision
+    hash_before = tree.content_hash()
+    calls = []
+    tree.memo("x", lambda t: calls.append(1) or len(calls))
+    assert tree.memo("x", lambda t: calls.append(1) or len(calls)) == 1
+    tree.update("A1", status="green")
+    tree.add(_node("C", "R"))
+    tree.remove("A2")
+    assert [(c.op, c.node_id) for c in tree.changes_since(start)] == [
+        ("update", "A1"), ("add", "C"), ("remove", "A2")]
+    assert tree.changes_since(tree.revision) == []
+    assert tree.memo("x", lambda t: calls.append(1) or len(calls)) == 2
+    assert tree.content_hash() != hash_before
+    tree.touch()
+    assert tree.changes_since(start) is None
+
+
+def test_journal_keeps_first_image():
+    tree = _base().fork()
+    tree.start_journal()
+    tree.update("A1", name="one")
+    tree.update("A1", name="two")
+    with tree.journal_paused():
+        tree.update("B", name="untracked")
+    journal = tree.take_journal()
+    assert journal.nodes["A1"].name == "A1" and "B" not in journal.nodes
+    assert not tree.take_journal()
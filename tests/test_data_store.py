@@ -0,0 +1,93 @@
+import io
+import json
+import uuid
+
+import pytest
+
+from project_assessment.helper.data_model import GoalTree, Node
+from project_assessment.helper.data_store import (
+    FLAG_UUID, JsonExport, Snapshot, _is_canonical_uuid, iter_tree, load_snapshot, load_tree,
+    load_tree_ndjson, open_snapshot, save_snapshot, save_tree_ndjson, snapshot_bytes, write_tree,
+)
+
+
+def _nodes(ids):
+    root, *rest = ids
+    return [Node(id=root, name="root", parent=None, status="green", comment="")] + [
+        Node(id=i, name=f"n{k}", parent=root, status="red", comment="c") for k, i in enumerate(rest)
+    ]
+
+
+def test_canonical_uuid_check():
+    value = str(uuid.uuid4())
+    assert _is_canonical_uuid(value)
+    assert not _is_canonical_uuid(value.upper())
+    assert not _is_canonical_uuid(value.replace("-", "")[:31] + "-----")
+    # 36 Zeichen mit den Bindestrichen an der richtigen Stelle, aber einem zusätzlichen
+    assert not _is_canonical_uuid("abcdefab-abcd-abcd-abcd-abcdefab-abc")
+
+
+@pytest.mark.parametrize("odd", ["abcdefab-abcd-abcd-abcd-abcdefab-abc", "not-a-uuid", "1"])
+def test_snapshot_round_trip_keeps_ids(odd):
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    for nodes in (_nodes(ids), _nodes(ids + [odd])):
+        data = snapshot_bytes(nodes)
+        assert load_snapshot(data) == nodes
+        assert load_snapshot(io.BytesIO(data)) == nodes
+    assert Snapshot(snapshot_bytes(_nodes(ids))).flags & FLAG_UUID
+    assert not Snapshot(snapshot_bytes(_nodes(ids + [odd]))).flags & FLAG_UUID
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_streaming_round_trip(chunk_size):
+    nodes = _nodes([str(uuid.uuid4()) for _ in range(5)])
+    text = io.StringIO()
+    write_tree(nodes, text)
+    assert list(iter_tree(io.BytesIO(text.getvalue().encode("utf-8")), chunk_size)) == nodes
+    assert load_tree(io.StringIO(text.getvalue())) == nodes
+
+
+@pytest.mark.parametrize("text", [
+    '[{"id": "a", "name": "a"} {"id": "b", "name": "b"}]',
+    '[{"id": "a", "name": "a"},]',
+    '[,{"id": "a", "name": "a"}]',
+    '[{"id": "a", "name": "a"}] trailing',
+    '[{"id": "a", "name": "a"}]]',
+    '[{"id": "a", "name": "a"}',
+])
+@pytest.mark.parametrize("chunk_size", [1, 1 << 16])
+def test_streaming_rejects_malformed_arrays(text, chunk_size):
+    with pytest.raises(ValueError):
+        list(iter_tree(io.BytesIO(text.encode("utf-8")), chunk_size))
+
+
+def test_ndjson_append(tmp_path):
+    nodes = _nodes([str(uuid.uuid4()) for _ in range(4)])
+    path = tmp_path / "tree.ndjson"
+    save_tree_ndjson(nodes[:2], path)
+    save_tree_ndjson(nodes[2:], path, append=True)
+    assert load_tree_ndjson(path) == nodes
+
+
+def test_json_export_is_incremental():
+    tree = GoalTree(_nodes([str(uuid.uuid4()) for _ in range(5)]))
+    export = JsonExport(tree)
+    assert load_tree(io.BytesIO(export.bytes())) == list(tree)
+    assert export.encoded == 5
+    child = next(n for n in tree if n.parent is not None)
+    tree.update(child.id, status="green")
+    tree.add(Node(id="extra", name="ü", parent=child.id))
+    data = export.bytes()
+    assert export.encoded == 7
+    assert json.loads(data) == [n.to_dict() for n in tree]
+
+
+def test_snapshot_file_is_lazy(tmp_path):
+    nodes = _nodes([str(uuid.uuid4()) for _ in range(3)]) + [Node(id="x", name="ä", parent="gone")]
+    path = tmp_path / "tree.pgsnap"
+    save_snapshot(nodes, path)
+    with open_snapshot(path) as snap:
+        assert len(snap) == 4
+        assert snap.node(3) == nodes[3]
+        assert [snap.status(i) for i in range(4)] == [n.status for n in nodes]
+    assert load_snapshot(path) == nodes
@@ -0,0 +1,23 @@
+from project_assessment.helper.data_model import Node
+from project_assessment.helper.diff import merge
+
+
+def _node(nid, parent=None):
+    return Node(id=nid, name=nid, parent=parent, status="yellow", comment="")
+
+
+def test_merge_rejects_children_of_rejected_added_node():
+    base = [_node("R")]
+    theirs = [_node("R"), _node("P", "X"), _node("C", "P")]
+    result = merge(base, base, theirs)
+    assert [(n.id, n.parent) for n in result.tree] == [("R", None)]
+    assert {(c.node_id, c.kind) for c in result.conflicts} == {("P", "parent"), ("C", "parent")}
+
+
+def test_merge_rejects_subtree_added_below_node_we_removed():
+    base = [_node("R"), _node("Q", "R")]
+    ours = [_node("R")]
+    theirs = base + [_node("P", "Q"), _node("C", "P")]
+    result = merge(base, ours, theirs)
+    assert [n.id for n in result.tree] == ["R"]
+    assert {c.node_id for c in result.conflicts if c.kind == "parent"} == {"P", "C"}
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from project_assessment.helper.data_model import STATUS_CHOICES, GoalTree, Node
+from project_assessment.helper.history import History, history_for
+
+
+def _node(nid, parent=None):
+    return Node(id=nid, name=nid, parent=parent, status="yellow", comment="")
+
+
+def _tree():
+    return GoalTree([_node("R"), _node("A", "R"), _node("B", "R"), _node("A1", "A")])
+
+
+def _state(tree):
+    return [(n.id, n.parent, n.name, n.status, n.comment) for n in tree.walk()]
+
+
+def test_undo_redo_single_steps():
+    tree = _tree()
+    history = history_for(tree)
+    start = _state(tree)
+    with history.step("rename"):
+        tree.update("A", name="Alpha")
+    with history.step("move"):
+        tree.move("A1", "B")
+    with history.step("nothing"):
+        pass
+    assert [label for _, label in history.entries()] == ["Start", "rename", "move"]
+    moved = _state(tree)
+    history.undo()
+    assert tree["A1"].parent == "A" and tree["A"].name == "Alpha"
+    history.undo()
+    assert _state(tree) == start and not history.can_undo()
+    history.redo()
+    history.redo()
+    assert _state(tree) == moved and not history.can_redo()
+
+
+def test_new_step_clears_redo():
+    tree = _tree()
+    history = history_for(tree)
+    with history.step("remove"):
+        tree.remove("A")
+    history.undo()
+    assert tree.child_ids("A") == ["A1"]
+    with history.step("add"):
+        tree.add(_node("C", "R"))
+    assert not history.can_redo()
+
+
+def test_goto_random_edits():
+    rnd = random.Random(7)
+    tree = _tree()
+    history = History(tree)
+    states = {history.version: _state(tree)}
+    counter = 0
+    for i in range(40):
+        ids = [n.id for n in tree]
+        with history.step(f"step {i}"):
+            op = rnd.random()
+            nid = rnd.choice(ids)
+            if op < 0.4:
+                tree.update(nid, status=rnd.choice(STATUS_CHOICES))
+            elif op < 0.6:
+                counter += 1
+                tree.add(_node(f"n{counter}", nid))
+            elif op < 0.75 and nid != "R":
+                tree.remove(nid)
+            elif op < 0.9:
+                target = rnd.choice(ids)
+                if target != nid and nid not in {a.id for a in tree.ancestors(target)} and nid != "R":
+                    tree.move(nid, target)
+            else:
+                tree.reorder(tree[nid].parent, list(reversed(tree.child_ids(tree[nid].parent))))
+        states[history.version] = _state(tree)
+    for version in rnd.sample(sorted(states), len(states)):
+        history.goto(version)
+        assert _state(tree) == states[version]
+    with pytest.raises(ValueError):
+        history.goto(10_000)
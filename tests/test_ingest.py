@@ -0,0 +1,37 @@
+import io
+
+import pytest
+
+from project_assessment.helper.ingest import Corpus, iter_passages
+
+
+def test_passages_overlap_across_chunks():
+    words = [f"w{i}" for i in range(25)]
+    text = " ".join(words)
+    chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    passages = [p.split() for p in iter_passages(chunks, size=10, overlap=3)]
+    assert passages[0] == words[:10] and passages[1] == words[7:17]
+    assert passages[-1][-1] == "w24"
+
+
+def test_corpus_search_and_remove():
+    corpus = Corpus()
+    corpus.add_text("a.txt", "budget approval for the new warehouse")
+    corpus.add_text("b.txt", "staffing plan and hiring schedule")
+    assert [corpus.passages[e.passage_id].doc for e in corpus.search("warehouse budget")] == ["a.txt"]
+    corpus.remove_document("a.txt")
+    assert corpus.search("warehouse budget") == []
+    assert corpus.vocabulary_size == len({"staffing", "plan", "hiring", "schedule"})
+
+
+def test_failed_upload_leaves_the_index_unchanged():
+    corpus = Corpus()
+    corpus.add_text("a.txt", "budget approval for the warehouse")
+    before = (dict(corpus.passages), corpus.vocabulary_size, corpus.revision)
+    bad = io.BytesIO(b"warehouse " * 50 + b"\xff\xfe broken")
+    with pytest.raises(UnicodeDecodeError):
+        corpus.add_document("a.txt", bad, chunk_size=16)
+    with pytest.raises(UnicodeDecodeError):
+        corpus.add_document("b.txt", io.BytesIO(b"staffing \xff"), chunk_size=4)
+    assert (dict(corpus.passages), corpus.vocabulary_size, corpus.revision) == before
+    assert [d.name for d in corpus.documents()] == ["a.txt"]
@@ -0,0 +1,53 @@
+import random
+
+from project_assessment.helper.data_model import GoalTree, Node
+from project_assessment.helper.pipeline import analyze, analysis_cache, cached_analysis
+from project_assessment.helper.recommendations import RuleSet, get_recommendations
+from project_assessment.helper.search import index_for
+from project_assessment.helper.tree_builder import build_tree
+
+RULES = [
+    {"match": "Stakeholder", "action": "analyse stakeholders"},
+    {"match": "Risiko", "action": "risk log"},
+    {"match": "Data Migration", "action": "staging test"},
+]
+
+
+def _tree(seed=1):
+    rnd = random.Random(seed)
+    nodes = build_tree(["Data Migration", "Risiko Workshop", "Intranet"])
+    nodes += [Node(name=f"Stakeholder {i}", parent=nodes[0].id) for i in range(3)]
+    tree = GoalTree(nodes)
+    for n in list(tree):
+        if not tree.has_children(n.id):
+            tree.update(n.id, status=rnd.choice(["red", "red", "green", "yellow"]))
+    return tree
+
+
+def test_indexed_recommendations_match_the_full_scan():
+    tree = _tree()
+    ruleset = RuleSet(RULES)
+    index = index_for(tree)
+    assert ruleset.candidates(index) is not None
+    assert get_recommendations(tree, ruleset, index=index) == get_recommendations(tree, ruleset)
+
+
+def test_cached_analysis_matches_analyze():
+    analysis_cache.clear()
+    ruleset = RuleSet(RULES)
+    cached = cached_analysis(_tree(), ruleset)
+    plain = analyze(_tree(), ruleset)
+    assert cached.recommendations == plain.recommendations
+    assert cached.recommendations
+    assert cached.metrics == plain.metrics and cached.summary == plain.summary
+
+
+def test_critical_path_forest_is_opt_in():
+    ruleset = RuleSet(RULES)
+    assert analyze(_tree(), ruleset).critical_forest is None
+    result = analyze(_tree(), ruleset, forest=True)
+    assert result.critical_paths and result.critical_forest
+    analysis_cache.clear()
+    tree = _tree()
+    assert cached_analysis(tree, ruleset).critical_forest is None
+    assert cached_analysis(tree, ruleset, forest=True).critical_forest
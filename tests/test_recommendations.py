@@ -0,0 +1,14 @@
+from project_assessment.helper.recommendations import RuleSet
+
+
+def test_backreference_rule_is_not_lost_in_combined_prefilter():
+    rules = RuleSet([
+        {"match": r"(risk|delay) ahead", "action": "plan"},
+        {"match": r"\b(\w+) \1\b", "action": "duplicate word"},
+        {"match": r"(?P<w>late) (?P=w)", "action": "named"},
+        {"match": "budget", "action": "check budget"},
+    ])
+    assert rules.match("the the plan") == [1]
+    assert rules.match("late late delivery") == [1, 2]
+    assert rules.match("Delay ahead, budget tight") == [0, 3]
+    assert rules.match("nothing here") == []
@@ -0,0 +1,53 @@
+from project_assessment.helper.data_model import GoalTree, Node
+from project_assessment.helper.search import SearchIndex, index_for, tokenize
+
+
+def _node(nid, name, parent=None, status="yellow"):
+    return Node(id=nid, name=name, parent=parent, status=status, comment="")
+
+
+def _tree():
+    return GoalTree([
+        _node("g1", "CRM rollout"),
+        _node("a1", "Stakeholder analysis", "g1", "red"),
+        _node("q1", "Who are the key stakeholders?", "a1"),
+        _node("g2", "Data migration"),
+        _node("a2", "Migration testing", "g2", "green"),
+    ])
+
+
+def _ids(hits):
+    return [h.node_id for h in hits]
+
+
+def test_exact_prefix_and_fuzzy_matches():
+    tree = _tree()          # der Index hält den Baum nur schwach
+    index = SearchIndex(tree)
+    assert set(_ids(index.search("migration"))) == {"g2", "a2"}
+    assert "a1" in _ids(index.search("stakeh"))
+    assert "g2" in _ids(index.search("migartion"))           # ein Tippfehler
+    assert _ids(index.search("migartion", fuzzy=False)) == []
+    assert _ids(index.search("data migration")) == ["g2"]
+
+
+def test_filters():
+    tree = _tree()
+    index = SearchIndex(tree)
+    assert _ids(index.search("migration", statuses=["green"])) == ["a2"]
+    assert set(_ids(index.search("stakeholder", within="a1"))) == {"a1", "q1"}
+    assert _ids(index.search("stakeholder", within="g2")) == []
+    assert _ids(index.search("stakeholder", depth=2)) == ["q1"]
+
+
+def test_sync_matches_a_fresh_index():
+    tree = _tree()
+    index = index_for(tree)
+    index.search("crm")
+    tree.update("g1", name="ERP rollout")
+    tree.add(_node("a3", "ERP licences", "g1"))
+    tree.remove("g2")
+    fresh = SearchIndex(tree)
+    for query in ("erp", "crm", "migration", "licence", "rollout"):
+        assert sorted(_ids(index_for(tree).search(query))) == sorted(_ids(fresh.search(query)))
+    assert index_for(tree) is index
+    assert tokenize("Who's the Key-User?") == tokenize("who s the key user")
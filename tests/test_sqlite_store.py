@@ -0,0 +1,77 @@
+import pytest
+
+from project_assessment.helper.data_model import GoalTree, Node
+from project_assessment.helper.sqlite_store import ProjectStore
+
+
+def _node(nid, parent=None):
+    return Node(id=nid, name=nid, parent=parent, status="yellow", comment="")
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ProjectStore(tmp_path / "projects.sqlite3")
+    yield s
+    s.close()
+
+
+def _tree():
+    # R ─ A, B, C ; A ─ A1
+    return GoalTree([_node("R"), _node("A", "R"), _node("B", "R"), _node("C", "R"), _node("A1", "A")])
+
+
+def _order(tree, parent="R"):
+    return [n.id for n in tree.children(parent)]
+
+
+def test_reorder_survives_autosave(store):
+    tree = _tree()
+    store.save("p", tree)
+    tree.update("A", status="red")
+    tree.reorder("R", ["C", "A"])
+    assert store.autosave("p", tree) == 3
+    assert _order(store.load("p")) == ["C", "A", "B"]
+    assert _order(store.open("p", depth=1)) == ["C", "A", "B"]
+
+
+def test_updates_keep_the_sibling_order(store):
+    tree = _tree()
+    store.save("p", tree)
+    tree.update("A", status="green")
+    tree.add(_node("D", "R"))
+    store.autosave("p", tree)
+    loaded = store.load("p")
+    assert _order(loaded) == ["A", "B", "C", "D"]
+    assert loaded["A"].status == "green"
+
+
+def test_autosave_writes_only_changes(store):
+    tree = _tree()
+    store.save("p", tree)
+    assert store.autosave("p", tree) == 0
+    tree.remove("A")
+    assert store.autosave("p", tree) == 2          # A und A1
+    assert sorted(n.id for n in store.load("p")) == ["B", "C", "R"]
+    assert store.status_counts("p")["yellow"] == 3
+
+
+def test_open_and_expand(store):
+    store.save("p", _tree())
+    tree = store.open("p", depth=1)
+    assert "A1" not in tree and store.is_partial(tree)
+    with pytest.raises(ValueError):
+        store.save("p", tree)
+    assert store.expand("p", tree, None, depth=None) == 1
+    assert "A1" in tree and not store.is_partial(tree)
+    # Nachladen ist keine Änderung
+    assert store.autosave("p", tree) == 0
+
+
+def test_partial_tree_saved_under_new_name_is_complete(store):
+    store.save("p", _tree())
+    tree = store.open("p", depth=0)
+    tree.update("R", name="renamed")
+    store.autosave("copy", tree)
+    copy = store.load("copy")
+    assert sorted(n.id for n in copy) == ["A", "A1", "B", "C", "R"]
+    assert copy["R"].name == "renamed" and store.load("p")["R"].name == "R"
@@ -0,0 +1,60 @@
+from project_assessment.helper.tree_builder import build_tree, load_questions, project_tree
+
+
+def _shape(nodes, roots):
+    return sorted((n.name, n.parent in roots) for n in nodes)
+
+
+def test_project_tree_matches_build_tree():
+    goals = ["Alpha", " Beta ", ""]
+    built = build_tree(goals)
+    tree = project_tree(goals)
+    assert [r.name for r in tree.roots()] == ["Alpha", "Beta"]
+    assert _shape(tree, {r.id for r in tree.roots()}) == _shape(built, {n.id for n in built if n.parent is None})
+
+
+def test_project_trees_share_the_catalogue():
+    a, b = project_tree(["One", "Two"]), project_tree(["Uno", "Dos"])
+    assert a._base is b._base
+    assert {r.id for r in a.roots()}.isdisjoint(r.id for r in b.roots())
+    leaf = next(n for n in a if not a.child_ids(n.id))
+    a.update(leaf.id, status="red")
+    assert b[leaf.id].status != "red"
+    # Nur Ziele, verschobene Achsen und die geänderte Frage sind eigene Kopien
+    axes = sum(len(a.child_ids(r.id)) for r in a.roots())
+    assert a.shared_nodes == len(a) - len(a.roots()) - axes - 1
+
+
+def test_load_questions_returns_fresh_nodes():
+    first, second = load_questions(), load_questions()
+    assert isinstance(first, list) and len(first) == len(second)
+    assert {n.id for n in first}.isdisjoint(n.id for n in second)
+
+
+def test_template_cache_is_thread_safe(tmp_path):
+    import os
+    import threading
+
+    from project_assessment.helper import tree_builder
+
+    path = tmp_path / "questions.yaml"
+    results, errors = [], []
+
+    def worker(i):
+        try:
+            results.append(tree_builder.load_question_template(path))
+        except Exception as e:
+            errors.append(e)
+
+    for version in range(5):
+        path.write_text(f"- Axis {version}:\n  - Question?\n", encoding="utf-8")
+        os.utime(path, (version, version))
+        results.clear()
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not errors
+        assert all(r is results[0] for r in results)
+    assert [k for k in tree_builder._TEMPLATE_CACHE if k[0] == str(path)] == [(str(path), 4.0)]
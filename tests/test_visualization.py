@@ -0,0 +1,60 @@
+from project_assessment.helper.data_model import GoalTree, Node
+from visualization.layout import LayoutCache, get_layout, tree_layout
+from visualization.lod import COLLAPSED_SUFFIX, build_lod_view
+from visualization.visualizer import build_network
+from visualization.visualizer3d import build_plotly_3d
+
+
+def _node(nid, parent=None):
+    return Node(id=nid, name=nid, parent=parent, status="yellow", comment="")
+
+
+def test_3d_view_skips_edges_to_missing_parents():
+    tree = GoalTree([_node("r"), _node("a", "r"), _node("c", "missing")])
+    g = build_network(tree)
+    pos = get_layout(tree, dim=3, algorithm="radial")
+    fig = build_plotly_3d(g, tree.parent_ids(), pos=pos)
+    edge_trace, parent_trace, leaf_trace = fig.data
+    # Eine Kante r→a: Start, Ende, NaN-Trenner
+    assert len(edge_trace.x) == 3
+    assert len(parent_trace.x) + len(leaf_trace.x) == 3
+
+
+def test_lod_counts_hidden_subtrees():
+    nodes = [_node("r")] + [_node(f"a{i}", "r") for i in range(4)]
+    nodes += [Node(id=f"q{i}{j}", name="q", parent=f"a{i}", status=("red", "green")[j % 2], comment="")
+              for i in range(4) for j in range(3)]
+    view = build_lod_view(GoalTree(nodes), budget=3, open_depth=1)
+    shown = [n.id for n in view.nodes if "::" not in n.id]
+    assert shown == ["r", "a0", "a1"]
+    # r: a2, a3 mit je zwei roten und einem grünen Kind; a0/a1: alle Kinder verborgen
+    assert view.counts["r"] == {"red": 4, "yellow": 2, "green": 2}
+    assert view.counts["a0"] == {"red": 2, "yellow": 0, "green": 1}
+    assert view.collapsed["r" + COLLAPSED_SUFFIX] == "r"
+
+
+def test_lod_treats_orphans_as_roots():
+    tree = GoalTree([_node("r"), _node("c", "missing"), _node("c1", "c")])
+    view = build_lod_view(tree, budget=10)
+    assert [n.id for n in view.nodes] == ["r", "c", "c1"]
+
+
+def test_tree_layouts_place_every_node():
+    tree = GoalTree([_node("r"), _node("a", "r"), _node("b", "r"), _node("a1", "a"), _node("c", "missing")])
+    for algorithm in ("radial", "hierarchical"):
+        for dim in (2, 3):
+            pos = tree_layout(tree, dim=dim, algorithm=algorithm)
+            assert set(pos) == {n.id for n in tree}
+            assert all(len(p) == dim for p in pos.values())
+            assert len(set(pos.values())) == len(pos)
+            assert pos == tree_layout(GoalTree(list(tree)), dim=dim, algorithm=algorithm)
+
+
+def test_layout_cache_depends_on_topology_only():
+    cache = LayoutCache()
+    tree = GoalTree([_node("r"), _node("a", "r"), _node("b", "r")])
+    first = cache.get(tree)
+    tree.update("a", status="red", name="renamed")
+    assert cache.get(tree) is first and cache.hits == 1
+    tree.move("b", "a")
+    assert cache.get(tree) is not first and cache.misses == 2
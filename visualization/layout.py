@@ -0,0 +1,141 @@
+"""
+layout.py
+---------
+Node positions for the 2-D (pyvis) and 3-D (Plotly) views.
+
+• Positions depend only on the tree topology (ids and parents), never on
+  labels or statuses. They are cached per topology key, so a status or
+  comment change re-uses the previous layout instead of recomputing it.
+
+• ``tree_layout`` is a deterministic O(n) radial / hierarchical layout:
+  every subtree gets a wedge (or column range) proportional to its number
+  of leaves, depth determines the radius (or row).
+
+• ``spring`` keeps the former force-directed layout (networkx) as option.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
+
+from project_assessment.helper.data_model import GoalTree, Node, as_tree
+from project_assessment.helper.profiler import profiled
+
+Position = Tuple[float, ...]
+LAYOUT_ALGORITHMS = ("radial", "hierarchical", "spring")
+
+
+def topology_key(tree: GoalTree) -> str:
+    """Hash over (id, parent) of all nodes – labels and statuses are not part of it."""
+    h = hashlib.sha1()
+    for n in tree:
+        h.update(f"{n.id}\t{n.parent}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def tree_layout(nodes: Iterable[Node], dim: int = 2, algorithm: str = "radial",
+                level_gap: float = 1.0) -> Dict[str, Position]:
+    """
+    Deterministic tree layout in O(n).
+
+    ``radial``: main goals in the centre (or on the first ring if there
+    are several), each level one ring further out, subtrees occupy
+    angular wedges sized by their leaf count.
+    ``hierarchical``: leaves spread along x, depth along -y.
+    For ``dim=3`` the depth is mapped onto -z (radial: a cone, hierarchical:
+    a vertical plane).
+    """
+    tree = as_tree(nodes)
+    order = list(tree.walk())
+    if not order:
+        return {}
+
+    # 1) Blätter je Teilbaum (Kinder vor Eltern → umgekehrte Pre-Order)
+    leaves: Dict[str, int] = {}
+    for n in reversed(order):
+        leaves[n.id] = sum(leaves[c] for c in tree.child_ids(n.id)) or 1
+
+    # 2) Bereiche [start, start + Blätter) top-down verteilen
+    start: Dict[str, float] = {}
+    cursor = 0.0
+    for n in order:
+        if n.id not in start:
+            # Haupt-/Waisenknoten: fortlaufend nebeneinander
+            start[n.id] = cursor
+            cursor += leaves[n.id]
+        offset = start[n.id]
+        for c in tree.child_ids(n.id):
+            start[c] = offset
+            offset += leaves[c]
+    total = cursor
+    # Ein einzelnes Hauptziel sitzt im Zentrum, mehrere auf dem ersten Ring
+    ring = 0 if sum(1 for n in order if tree.get(n.parent) is None) == 1 else 1
+
+    pos: Dict[str, Position] = {}
+    for n in order:
+        depth = tree.depth(n.id)
+        centre = start[n.id] + leaves[n.id] / 2
+        if algorithm == "radial":
+            angle = 2 * math.pi * centre / total
+            radius = (depth + ring) * level_gap
+            x, y = radius * math.cos(angle), radius * math.sin(angle)
+        else:
+            x, y = centre - total / 2, (0.0 if dim == 3 else -depth * level_gap)
+        pos[n.id] = (x, y, -depth * level_gap) if dim == 3 else (x, y)
+    return pos
+
+
+def spring_layout(nodes: Iterable[Node], dim: int = 2, seed: int = 42) -> Dict[str, Position]:
+    """Force-directed layout (networkx); noticeably slower than :func:`tree_layout`."""
+    import networkx as nx
+
+    tree = as_tree(nodes)
+    g = nx.DiGraph()
+    g.add_nodes_from(n.id for n in tree)
+    g.add_edges_from((n.parent, n.id) for n in tree if n.parent in tree)
+    return {k: tuple(float(c) for c in v) for k, v in nx.spring_layout(g, dim=dim, seed=seed).items()}
+
+
+class LayoutCache:
+    """Small LRU cache: (topology key, dim, algorithm) → positions."""
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[tuple, Dict[str, Position]]" = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, nodes: Iterable[Node], dim: int = 2, algorithm: str = "radial") -> Dict[str, Position]:
+        if algorithm not in LAYOUT_ALGORITHMS:
+            raise ValueError(f"Unknown layout {algorithm!r}, expected one of {LAYOUT_ALGORITHMS}")
+        tree = as_tree(nodes)
+        key = (tree.memo("topology_key", topology_key), dim, algorithm)
+        pos = self._data.get(key)
+        if pos is not None:
+            self.hits += 1
+            self._data.move_to_end(key)
+            return pos
+        self.misses += 1
+        if algorithm == "spring":
+            pos = spring_layout(tree, dim=dim)
+        else:
+            pos = tree_layout(tree, dim=dim, algorithm=algorithm)
+        self._data[key] = pos
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return pos
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+# Prozessweiter Cache – Layouts sind reine Funktionen der Topologie
+layout_cache = LayoutCache()
+
+
+@profiled()
+def get_layout(nodes: Iterable[Node], dim: int = 2, algorithm: str = "radial") -> Dict[str, Position]:
+    """Cached positions for ``nodes`` (see :class:`LayoutCache`)."""
+    return layout_cache.get(nodes, dim=dim, algorithm=algorithm)
@@ -0,0 +1,113 @@
+"""
+lod.py
+------
+Level-of-detail view for large goal networks.
+
+• Main goals and their axes are shown first; deeper levels stay collapsed
+  until they are expanded explicitly.
+
+• A collapsed subtree is represented by one aggregate node labelled with
+  its red/yellow/green counts.
+
+• A node budget caps the number of nodes per view, so the amount of HTML
+  sent to the browser is bounded regardless of the tree size.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Collection, Dict, Iterable, List
+
+from project_assessment.helper.data_model import Node, STATUS_CHOICES, as_tree
+from project_assessment.helper.subtree_index import subtree_index
+from project_assessment.helper.profiler import profiled
+
+# Standard-Budget an Knoten pro Ansicht
+DEFAULT_NODE_BUDGET = 300
+# Bis zu dieser Tiefe sind Knoten ohne Zutun aufgeklappt (0 = Ziele, 1 = Achsen)
+DEFAULT_OPEN_DEPTH = 1
+COLLAPSED_SUFFIX = "::collapsed"
+MORE_ROOTS_ID = "::more-goals"
+
+
+@dataclass
+class LodView:
+    nodes: List[Node] = field(default_factory=list)
+    # Aggregat-Knoten-ID → ID des eingeklappten Knotens
+    collapsed: Dict[str, str] = field(default_factory=dict)
+    # Eingeklappter Knoten → Status-Zählung der unsichtbaren Teilbäume
+    counts: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+def aggregate_label(counts: Dict[str, int]) -> str:
+    total = sum(counts.values())
+    return f"+{total}  🔴{counts['red']} 🟡{counts['yellow']} 🟢{counts['green']}"
+
+
+def _worst(counts: Dict[str, int]) -> str:
+    return next((s for s in STATUS_CHOICES if counts[s]), "green")
+
+
+def _hidden_counts(index, node: Node, shown: Iterable[Node]) -> Dict[str, int]:
+    """
+    Status counts below ``node`` without the subtrees of its ``shown``
+    children: O(shown) via the subtree index, however many children are hidden.
+    """
+    counts = index.counts(node.id)
+    counts[node.status] -= 1
+    for c in shown:
+        for s, k in index.counts(c.id).items():
+            counts[s] -= k
+    return counts
+
+
+@profiled()
+def build_lod_view(nodes: Iterable[Node], expanded: Collection[str] = (),
+                   budget: int = DEFAULT_NODE_BUDGET,
+                   open_depth: int = DEFAULT_OPEN_DEPTH) -> LodView:
+    """
+    Selects the visible part of the tree breadth-first.
+
+    A node's children are shown if the node lies above ``open_depth`` or is
+    in ``expanded``, as far as they fit into ``budget``. Whatever stays
+    hidden below a visible node is summarised by one aggregate child.
+    """
+    tree = as_tree(nodes)
+    index = subtree_index(tree)
+    view = LodView()
+    budget = max(1, budget)
+
+    # Knoten, deren Parent fehlt (z. B. teilweise geladen), gelten als Ziele
+    roots = tree.top_nodes()
+    shown_roots = roots[:budget]
+    view.nodes.extend(shown_roots)
+    if len(roots) > len(shown_roots):
+        counts = dict.fromkeys(STATUS_CHOICES, 0)
+        for r in roots[len(shown_roots):]:
+            counts[r.status] += 1
+        view.nodes.append(Node(id=MORE_ROOTS_ID, name=f"{aggregate_label(counts)} more goals",
+                               status=_worst(counts)))
+
+    # Nur echte Knoten zählen gegen das Budget; da jeder sichtbare Knoten
+    # höchstens ein Aggregat bekommt, bleibt die Ansicht unter 2 × budget.
+    real = len(shown_roots)
+    queue = deque(shown_roots)
+    while queue:
+        n = queue.popleft()
+        children = tree.children(n.id)
+        if not children:
+            continue
+        is_open = tree.depth(n.id) < open_depth or n.id in expanded
+        shown = children[:max(0, budget - real)] if is_open else []
+        view.nodes.extend(shown)
+        queue.extend(shown)
+        real += len(shown)
+        if len(shown) < len(children):
+            counts = _hidden_counts(index, n, shown)
+            agg_id = n.id + COLLAPSED_SUFFIX
+            view.nodes.append(Node(id=agg_id, name=aggregate_label(counts), parent=n.id,
+                                   status=_worst(counts)))
+            view.collapsed[agg_id] = n.id
+            view.counts[n.id] = counts
+    return view
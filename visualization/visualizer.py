@@ -15,10 +15,10 @@ visualizer.py
 
 import networkx as nx
 from pyvis.network import Network
-from collections import Counter
-from typing import List, Union, Dict
+from typing import Dict, Iterable, Optional, Tuple, Union
 
-from project_assessment.helper.data_model import Node
+from project_assessment.helper.data_model import Node, GoalTree, as_tree, dict_to_node
+from project_assessment.helper.profiler import profiled
 
 # Status colors (traffic light style)
 STATUS_COLORS = {
@@ -27,29 +27,19 @@ STATUS_COLORS = {
     "green": "#2ecc71",
 }
 
-def dict_to_node(node_dict: Union[Dict, Node]) -> Node:
-    """Convert dictionary or Node to Node object"""
-    if isinstance(node_dict, Node):
-        return node_dict
-    return Node(
-        id=node_dict["id"],
-        name=node_dict["name"],
-        parent=node_dict.get("parent"),
-        status=node_dict.get("status", "yellow"),
-        comment=node_dict.get("comment", "")
-    )
-
-def build_network(nodes: List[Union[Node, Dict]]) -> nx.DiGraph:
+@profiled()
+def build_network(nodes: Union[GoalTree, Iterable[Union[Node, Dict]]]) -> nx.DiGraph:
     """Builds a NetworkX graph with visualization attributes."""
     # Convert dictionaries to Node objects if needed
-    node_objects = [n if isinstance(n, Node) else dict_to_node(n) for n in nodes]
-    
+    if isinstance(nodes, GoalTree):
+        tree = nodes
+    else:
+        tree = as_tree(dict_to_node(n) for n in nodes)
+
     g = nx.DiGraph()
-    # Count which nodes have at least one child
-    child_cnt = Counter(n.parent for n in node_objects if n.parent)
 
-    for n in node_objects:
-        is_parent = child_cnt.get(n.id, 0) > 0
+    for n in tree:
+        is_parent = tree.has_children(n.id)
 
         if is_parent:
             # Parents: ellipse with border and bold label
@@ -80,15 +70,33 @@ def build_network(nodes: List[Union[Node, Dict]]) -> nx.DiGraph:
             )
 
     # Add edges
-    for n in node_objects:
+    for n in tree:
         if n.parent:
             g.add_edge(n.parent, n.id)
 
     return g
 
-def render_network(g: nx.DiGraph, height: str = "650px", width: str = "100%") -> Network:
-    """Converts the NetworkX graph to a pyvis.Network."""
+@profiled()
+def render_network(g: nx.DiGraph, height: str = "650px", width: str = "100%",
+                   pos: Optional[Dict[str, Tuple[float, ...]]] = None, scale: float = 250.0) -> Network:
+    """
+    Converts the NetworkX graph to a pyvis.Network.
+
+    With ``pos`` (e.g. from ``visualization.layout``) the positions are
+    precomputed and the browser-side physics simulation is switched off;
+    without it pyvis falls back to the repulsion physics.
+    """
     net = Network(height=height, width=width, directed=True)
+    if pos:
+        g = g.copy()
+        for node_id, attrs in g.nodes(data=True):
+            xy = pos.get(node_id)
+            if xy is not None:
+                attrs["x"], attrs["y"] = xy[0] * scale, -xy[1] * scale
+                attrs["physics"] = False
     net.from_nx(g)
-    net.repulsion(node_distance=150, spring_length=200)
+    if pos:
+        net.toggle_physics(False)
+    else:
+        net.repulsion(node_distance=150, spring_length=200)
     return net
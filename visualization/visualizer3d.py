@@ -6,13 +6,15 @@ visualizer3d.py
 • Parent nodes as larger, colored markers based on traffic light status.
 • Child nodes as smaller, gray markers.
 • Edges as lines.
+• Traces are built from NumPy arrays; large graphs are decimated.
 """
 
 import networkx as nx
+import numpy as np
 import plotly.graph_objects as go
-from typing import List, Union, Dict
+from typing import Collection, Dict, Optional, Tuple
 
-from project_assessment.helper.data_model import Node
+from project_assessment.helper.profiler import profiled
 
 # Status colors (traffic light style in HEX)
 STATUS_COLORS = {
@@ -21,17 +23,33 @@ STATUS_COLORS = {
     "green": "#2ecc71",
 }
 
-def dict_to_node(node_dict: Dict) -> Node:
-    """Convert dictionary to Node object"""
-    return Node(
-        id=node_dict["id"],
-        name=node_dict["name"],
-        parent=node_dict.get("parent"),
-        status=node_dict.get("status", "yellow"),
-        comment=node_dict.get("comment", "")
-    )
+# Ab dieser Knotenzahl wird die Figur dezimiert (siehe build_plotly_3d)
+LOD_NODE_THRESHOLD = 5_000
+# Obergrenze für gezeichnete Blatt-Marker im dezimierten Modus
+MAX_LEAF_MARKERS = 20_000
+
+def _base_color(attrs: dict) -> str:
+    raw_color = attrs.get("color", "#888888")
+    # If a dict is used (e.g. pyvis fallback), take .border
+    if isinstance(raw_color, dict):
+        return raw_color.get("border", "#888888")
+    return raw_color
 
-def build_plotly_3d(g: nx.DiGraph, parent_ids: List[str]) -> go.Figure:
+def _edge_arrays(coords: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Line coordinates for all edges in one preallocated array:
+    (start, end, NaN) per edge, NaN separates the segments.
+    """
+    seg = np.full((len(edges), 3, 3), np.nan)
+    if len(edges):
+        seg[:, 0] = coords[edges[:, 0]]
+        seg[:, 1] = coords[edges[:, 1]]
+    return seg.reshape(-1, 3)
+
+@profiled()
+def build_plotly_3d(g: nx.DiGraph, parent_ids: Collection[str],
+                    pos: Optional[Dict[str, Tuple[float, ...]]] = None,
+                    lod_threshold: int = LOD_NODE_THRESHOLD) -> go.Figure:
     """
     Creates a 3-D Plotly figure from the NetworkX graph.
 
@@ -40,69 +58,76 @@ def build_plotly_3d(g: nx.DiGraph, parent_ids: List[str]) -> go.Figure:
     g : nx.DiGraph
         The graph with node attributes 'label' and 'color'.
         'color' can be a HEX string or a dict like {'border': ...}.
-    parent_ids : List[str]
+    parent_ids : Collection[str]
         IDs of parent nodes.
+    pos : Dict[str, Tuple[float, float, float]], optional
+        Precomputed 3-D positions (see ``visualization.layout``). Without
+        them a force-directed layout is computed on the fly.
+    lod_threshold : int
+        Above this node count the figure is decimated: leaves lose their
+        text labels and edges, and at most ``MAX_LEAF_MARKERS`` of them are
+        drawn as plain markers (hover text is kept).
 
     Returns
     -------
     go.Figure
     """
     # 1) Position layout in 3D
-    pos = nx.spring_layout(g, dim=3, seed=42)
-
-    # 2) Edges as lines
-    edge_x, edge_y, edge_z = [], [], []
-    for u, v in g.edges():
-        x0, y0, z0 = pos[u]
-        x1, y1, z1 = pos[v]
-        edge_x += [x0, x1, None]
-        edge_y += [y0, y1, None]
-        edge_z += [z0, z1, None]
-
+    if pos is None:
+        pos = nx.spring_layout(g, dim=3, seed=42)
+
+    # Knoten ohne Position (z. B. Platzhalter für einen fehlenden Parent,
+    # den build_network aus einer Kante anlegt) werden samt Kanten ausgelassen
+    ids = [node_id for node_id in g.nodes() if node_id in pos]
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    parent_set = parent_ids if isinstance(parent_ids, (set, frozenset)) else set(parent_ids)
+    coords = np.array([pos[node_id] for node_id in ids], dtype=float).reshape(-1, 3)
+    is_parent = np.fromiter((node_id in parent_set for node_id in ids), dtype=bool, count=len(ids))
+    edges = np.array([(index[u], index[v]) for u, v in g.edges() if u in index and v in index],
+                     dtype=np.intp).reshape(-1, 2)
+    labels = np.array([g.nodes[node_id].get("label", "") for node_id in ids], dtype=object)
+    decimate = len(ids) > lod_threshold
+
+    # 2) Edges as lines (bei Dezimierung nur Kanten zwischen Parents)
+    if decimate:
+        edges = edges[is_parent[edges[:, 1]]]
+    edge_xyz = _edge_arrays(coords, edges)
     edge_trace = go.Scatter3d(
-        x=edge_x, y=edge_y, z=edge_z,
+        x=edge_xyz[:, 0], y=edge_xyz[:, 1], z=edge_xyz[:, 2],
         mode="lines",
         line=dict(width=2, color="#888"),
         hoverinfo="none"
     )
 
-    # 3) Nodes with text and color
-    node_x, node_y, node_z = [], [], []
-    node_text, node_color, node_size = [], [], []
-
-    for node_id in g.nodes():
-        x, y, z = pos[node_id]
-        node_x.append(x); node_y.append(y); node_z.append(z)
-        node_text.append(g.nodes[node_id].get("label", ""))
-
-        # Extract base color
-        raw_color = g.nodes[node_id].get("color", "#888888")
-        # If a dict is used (e.g. pyvis fallback), take .border
-        if isinstance(raw_color, dict):
-            col = raw_color.get("border", "#888888")
-        else:
-            col = raw_color
-
-        if node_id in parent_ids:
-            node_color.append(col)
-            node_size.append(12)
-        else:
-            node_color.append("#888888")
-            node_size.append(6)
-
-    node_trace = go.Scatter3d(
-        x=node_x, y=node_y, z=node_z,
+    # 3) Parents: farbig, groß, beschriftet
+    parents = np.flatnonzero(is_parent)
+    parent_trace = go.Scatter3d(
+        x=coords[parents, 0], y=coords[parents, 1], z=coords[parents, 2],
         mode="markers+text",
-        marker=dict(size=node_size, color=node_color),
-        text=node_text,
+        marker=dict(size=12, color=[_base_color(g.nodes[ids[i]]) for i in parents]),
+        text=labels[parents],
+        textposition="bottom center",
+        hoverinfo="text"
+    )
+
+    # 4) Kinder: klein und grau; bei Dezimierung ohne Text und ausgedünnt
+    leaves = np.flatnonzero(~is_parent)
+    if decimate and len(leaves) > MAX_LEAF_MARKERS:
+        leaves = leaves[np.linspace(0, len(leaves) - 1, MAX_LEAF_MARKERS).astype(np.intp)]
+    leaf_trace = go.Scatter3d(
+        x=coords[leaves, 0], y=coords[leaves, 1], z=coords[leaves, 2],
+        mode="markers" if decimate else "markers+text",
+        marker=dict(size=3 if decimate else 6, color="#888888"),
+        text=labels[leaves],
         textposition="bottom center",
         hoverinfo="text"
     )
 
     # Final layout
-    fig = go.Figure(data=[edge_trace, node_trace])
+    fig = go.Figure(data=[edge_trace, parent_trace, leaf_trace])
     fig.update_layout(
         margin=dict(l=0, r=0, b=0, t=0),
+        showlegend=False,
         scene=dict(
             xaxis=dict(visible=False),
             yaxis=dict(visible=False),